@@ -28,3 +28,14 @@ R2_REFERENCE = "reference"
 
 # Gap threshold (minimum % to qualify as a gap)
 GAP_THRESHOLD_PERCENT = 10.0
+
+# Batch endpoints: max tickers per request and concurrent R2 loads
+BATCH_MAX_TICKERS = int(os.getenv("BATCH_MAX_TICKERS", "200"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+
+# Cache warmup: request counts per ticker are persisted here and the most
+# requested tickers are preloaded in the background after each deploy
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+WARMUP_STATS_FILE = Path(os.getenv("WARMUP_STATS_FILE", ".cache/ticker_access.json"))
+WARMUP_TOP_N = int(os.getenv("WARMUP_TOP_N", "25"))
+WARMUP_CONCURRENCY = int(os.getenv("WARMUP_CONCURRENCY", "4"))
@@ -1,11 +1,26 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import gaps, tickers
+from app.config import WARMUP_ENABLED
+from app.routers import gaps, tickers, batch
+from app.services.warmup_service import warm_caches, flush_access_counts, get_warmup_status
+
+
+# Warm caches in the background so startup (and /health) isn't delayed
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warmup_task = asyncio.create_task(warm_caches()) if WARMUP_ENABLED else None
+    yield
+    if warmup_task and not warmup_task.done():
+        warmup_task.cancel()
+    flush_access_counts()
 
 app = FastAPI(
     title="TSIS Analytics API",
     description="API for serving stock analytics data from Parquet files",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -29,6 +44,7 @@ app.add_middleware(
 # Include routers
 app.include_router(gaps.router, prefix="/api/gaps", tags=["gaps"])
 app.include_router(tickers.router, prefix="/api/tickers", tags=["tickers"])
+app.include_router(batch.router, prefix="/api/batch", tags=["batch"])
 
 
 @app.get("/")
@@ -38,4 +54,4 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    return {"status": "healthy", "warmup": get_warmup_status()["state"]}
@@ -0,0 +1,15 @@
+from typing import List, Literal
+from pydantic import BaseModel, Field
+
+from app.config import GAP_THRESHOLD_PERCENT
+
+
+class BatchRequest(BaseModel):
+    """Tickers to load in one request, e.g. a watchlist or screener page."""
+    tickers: List[str] = Field(..., min_length=1, description="Ticker symbols")
+    include: List[Literal["quotes", "stats"]] = Field(
+        default=["quotes", "stats"], description="Sections to return per ticker"
+    )
+    limit: int = Field(default=100, ge=1, description="Maximum number of quotes per ticker")
+    min_gap: float = Field(default=GAP_THRESHOLD_PERCENT, description="Minimum gap percentage for stats")
+    stream: bool = Field(default=False, description="Stream results as NDJSON as each ticker completes")
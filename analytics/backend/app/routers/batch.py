@@ -0,0 +1,105 @@
+import asyncio
+import json
+from typing import Any, Dict, List
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.config import BATCH_MAX_TICKERS, BATCH_CONCURRENCY
+from app.models.batch import BatchRequest
+from app.routers.tickers import quotes_to_records
+from app.services.gap_service import get_cached_gap_statistics
+from app.services.parquet_service import load_ticker_quotes
+from app.services.ticker_index import ticker_exists
+from app.services.warmup_service import record_ticker_access
+
+router = APIRouter()
+
+
+def _load_ticker(ticker: str, request: BatchRequest) -> Dict[str, Any]:
+    """Load the requested sections for one ticker (runs in a worker thread)."""
+    if not ticker_exists(ticker):
+        raise LookupError(f"Ticker {ticker} not found")
+
+    result: Dict[str, Any] = {"ticker": ticker}
+
+    if "quotes" in request.include:
+        df = load_ticker_quotes(ticker, limit=request.limit)
+        if df.empty:
+            raise LookupError(f"No quotes found for {ticker}")
+        quotes = quotes_to_records(df)
+        result["quotes"] = quotes
+        result["count"] = len(quotes)
+
+    if "stats" in request.include:
+        stats, _ = get_cached_gap_statistics(ticker, request.min_gap)
+        result["stats"] = stats
+
+    return result
+
+
+async def _load_bounded(ticker: str, request: BatchRequest, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    """Load one ticker under the shared concurrency limit, reporting errors inline."""
+    async with semaphore:
+        try:
+            data = await asyncio.to_thread(_load_ticker, ticker, request)
+            return {"ticker": ticker, "status": "ok", **data}
+        except LookupError as e:
+            return {"ticker": ticker, "status": "not_found", "error": str(e)}
+        except Exception as e:
+            return {"ticker": ticker, "status": "error", "error": str(e)}
+
+
+def _normalize_tickers(tickers: List[str]) -> List[str]:
+    """Uppercase and de-duplicate tickers, keeping request order."""
+    seen = []
+    for ticker in tickers:
+        ticker = ticker.strip().upper()
+        if ticker and ticker not in seen:
+            seen.append(ticker)
+
+    if len(seen) > BATCH_MAX_TICKERS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_TICKERS} tickers per batch")
+    return seen
+
+
+async def _run_batch(request: BatchRequest):
+    tickers = _normalize_tickers(request.tickers)
+    for ticker in tickers:
+        record_ticker_access(ticker)
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    tasks = [_load_bounded(ticker, request, semaphore) for ticker in tickers]
+
+    if request.stream:
+        async def stream_results():
+            # One JSON object per line, in completion order
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                yield json.dumps(result) + "\n"
+
+        return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+    results = await asyncio.gather(*tasks)
+    return JSONResponse(content={
+        "results": results,
+        "count": len(results),
+        "errors": sum(1 for r in results if r["status"] != "ok"),
+    })
+
+
+@router.post("/")
+async def batch_load(request: BatchRequest):
+    """Load quotes and/or gap stats for many tickers in one round trip."""
+    return await _run_batch(request)
+
+
+@router.post("/quotes")
+async def batch_quotes(request: BatchRequest):
+    """Load historical quotes for many tickers in one round trip."""
+    return await _run_batch(request.model_copy(update={"include": ["quotes"]}))
+
+
+@router.post("/stats")
+async def batch_gap_stats(request: BatchRequest):
+    """Load gap statistics for many tickers in one round trip."""
+    return await _run_batch(request.model_copy(update={"include": ["stats"]}))
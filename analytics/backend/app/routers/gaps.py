@@ -1,26 +1,33 @@
-from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from fastapi.responses import JSONResponse
 from typing import Optional
-from app.services.gap_service import calculate_gaps, calculate_gap_statistics
+from app.services.gap_service import calculate_gaps, get_cached_gap_statistics
+from app.services.parquet_service import get_ticker_daily_etags
+from app.services.http_cache import make_etag, etag_matches, not_modified, set_cache_headers
+from app.services.warmup_service import record_ticker_access
 from app.config import GAP_THRESHOLD_PERCENT
 
 router = APIRouter()
 
-# In-memory cache for gap stats (ticker -> (data, timestamp))
-_gap_stats_cache: dict = {}
-_GAP_CACHE_TTL = 3600  # 1 hour
-
 
 @router.get("/{ticker}")
 async def get_gap_history(
+    request: Request,
     ticker: str,
     min_gap: float = Query(default=GAP_THRESHOLD_PERCENT, description="Minimum gap percentage"),
     limit: int = Query(default=50, description="Maximum number of gaps to return")
 ):
     """Get gap history for a ticker."""
     ticker = ticker.upper()
+    record_ticker_access(ticker)
 
     try:
+        # Answer revalidations before touching any data
+        source_etags = get_ticker_daily_etags(ticker)
+        etag = make_etag("gaps", ticker, min_gap, limit, *source_etags) if source_etags else None
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
         gaps = calculate_gaps(ticker, min_gap)
         response = JSONResponse(content={
             "ticker": ticker,
@@ -28,41 +35,33 @@ async def get_gap_history(
             "total": len(gaps)
         })
         # Cache for 1 hour
-        response.headers["Cache-Control"] = "public, max-age=3600"
-        return response
+        return set_cache_headers(response, etag)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/{ticker}/stats")
 async def get_gap_statistics(
+    request: Request,
     ticker: str,
     min_gap: float = Query(default=GAP_THRESHOLD_PERCENT, description="Minimum gap percentage")
 ):
     """Get gap statistics for a ticker."""
     ticker = ticker.upper()
-    cache_key = f"{ticker}_{min_gap}"
+    record_ticker_access(ticker)
 
     try:
-        # Check in-memory cache first
-        import time
-        if cache_key in _gap_stats_cache:
-            cached_data, cached_time = _gap_stats_cache[cache_key]
-            if time.time() - cached_time < _GAP_CACHE_TTL:
-                response = JSONResponse(content=cached_data)
-                response.headers["Cache-Control"] = "public, max-age=3600"
-                response.headers["X-Cache"] = "HIT"
-                return response
-
-        # Calculate fresh data
-        stats = calculate_gap_statistics(ticker, min_gap)
+        # Answer revalidations before touching any data
+        source_etags = get_ticker_daily_etags(ticker)
+        etag = make_etag("gap-stats", ticker, min_gap, *source_etags) if source_etags else None
+        if etag_matches(request, etag):
+            return not_modified(etag)
 
-        # Store in cache
-        _gap_stats_cache[cache_key] = (stats, time.time())
+        # In-memory cache first, fresh calculation otherwise
+        stats, cache_hit = get_cached_gap_statistics(ticker, min_gap)
 
         response = JSONResponse(content=stats)
-        response.headers["Cache-Control"] = "public, max-age=3600"
-        response.headers["X-Cache"] = "MISS"
-        return response
+        response.headers["X-Cache"] = "HIT" if cache_hit else "MISS"
+        return set_cache_headers(response, etag)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,14 +1,33 @@
-from fastapi import APIRouter, HTTPException, Query
+from datetime import date as date_type
+from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import JSONResponse
 from typing import Optional
 import json
-from app.services.parquet_service import get_available_tickers, load_ticker_quotes, load_ohlcv_intraday, list_ticker_intraday_files
+from app.services.parquet_service import (
+    get_available_tickers, load_ticker_quotes, list_ticker_intraday_files,
+    get_ticker_daily_etags, get_intraday_etag,
+)
+from app.services.indicator_service import get_intraday_candles, SUPPORTED_INDICATORS, SUPPORTED_TIMEFRAMES
+from app.services.http_cache import (
+    make_etag, etag_matches, not_modified, set_cache_headers,
+    DEFAULT_CACHE_CONTROL, IMMUTABLE_CACHE_CONTROL,
+)
+from app.services.ticker_index import get_ticker_metadata, ticker_exists
+from app.services.warmup_service import record_ticker_access
 
 router = APIRouter()
 
 
+def quotes_to_records(df):
+    """Convert a daily quotes DataFrame to JSON-serializable records."""
+    df_copy = df.copy()
+    df_copy['date'] = df_copy['date'].dt.strftime('%Y-%m-%d')
+    return df_copy.to_dict(orient='records')
+
+
 @router.get("/")
 async def list_tickers(
+    request: Request,
     search: Optional[str] = Query(default=None, description="Search term for ticker symbol"),
     limit: int = Query(default=100, description="Maximum number of tickers to return")
 ):
@@ -19,31 +38,37 @@ async def list_tickers(
         search = search.upper()
         tickers = [t for t in tickers if search in t]
 
-    return {
+    # The ticker list comes from a cached R2 listing, so hash the result itself
+    etag = make_etag("tickers", search, limit, len(tickers), *tickers[:limit])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    response = JSONResponse(content={
         "tickers": tickers[:limit],
         "total": len(tickers)
-    }
+    })
+    return set_cache_headers(response, etag)
 
 
 @router.get("/{ticker}")
-async def get_ticker_info(ticker: str):
+async def get_ticker_info(request: Request, ticker: str):
     """Get basic info for a ticker."""
     ticker = ticker.upper()
+    record_ticker_access(ticker)
 
     try:
-        df = load_ticker_quotes(ticker, limit=1)
+        # Footer statistics and listings only - no data reads
+        metadata = get_ticker_metadata(ticker)
 
-        if df.empty:
+        if metadata is None:
             raise HTTPException(status_code=404, detail=f"Ticker {ticker} not found")
 
-        # Get latest data
-        latest = df.iloc[-1]
+        etag = make_etag("info", json.dumps(metadata, sort_keys=True))
+        if etag_matches(request, etag):
+            return not_modified(etag)
 
-        return {
-            "ticker": ticker,
-            "latest_date": latest.get('date', None),
-            "has_data": True,
-        }
+        response = JSONResponse(content=metadata)
+        return set_cache_headers(response, etag)
     except HTTPException:
         raise
     except Exception as e:
@@ -52,30 +77,36 @@ async def get_ticker_info(ticker: str):
 
 @router.get("/{ticker}/quotes")
 async def get_ticker_quotes(
+    request: Request,
     ticker: str,
     limit: int = Query(default=100, description="Maximum number of quotes to return")
 ):
     """Get historical quotes for a ticker."""
     ticker = ticker.upper()
+    record_ticker_access(ticker)
+
+    if not ticker_exists(ticker):
+        raise HTTPException(status_code=404, detail=f"No quotes found for {ticker}")
 
     try:
+        source_etags = get_ticker_daily_etags(ticker)
+        etag = make_etag("quotes", ticker, limit, *source_etags) if source_etags else None
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
         df = load_ticker_quotes(ticker, limit=limit)
 
         if df.empty:
             raise HTTPException(status_code=404, detail=f"No quotes found for {ticker}")
 
-        # Convert DataFrame to JSON-serializable format
-        # Use pandas json_normalize to handle this properly
-        df_copy = df.copy()
-        df_copy['date'] = df_copy['date'].dt.strftime('%Y-%m-%d')
-        quotes = df_copy.to_dict(orient='records')
+        quotes = quotes_to_records(df)
 
         result = {
             "ticker": ticker,
             "quotes": quotes,
             "count": len(quotes)
         }
-        return JSONResponse(content=result)
+        return set_cache_headers(JSONResponse(content=result), etag)
     except HTTPException:
         raise
     except Exception as e:
@@ -99,67 +130,66 @@ async def list_ticker_intraday(ticker: str):
 
 @router.get("/{ticker}/intraday/{date}")
 async def get_ticker_intraday(
+    request: Request,
     ticker: str,
     date: str,
+    timeframe: int = Query(default=1, description=f"Candle size in minutes: {', '.join(map(str, SUPPORTED_TIMEFRAMES))}"),
+    indicators: Optional[str] = Query(default=None, description=f"Comma-separated indicators: {','.join(SUPPORTED_INDICATORS)}"),
 ):
-    """Get intraday 1-minute OHLCV data for a ticker on a specific date."""
+    """Get intraday OHLCV candles (1-minute by default) for a ticker on a specific date, with optional indicators."""
     ticker = ticker.upper()
+    record_ticker_access(ticker)
 
-    try:
-        df = load_ohlcv_intraday(ticker, date)
-
-        if df.empty:
-            raise HTTPException(status_code=404, detail=f"No intraday data found for {ticker} on {date}")
-
-        # Convert DataFrame to JSON-serializable format
-        df_copy = df.copy()
+    if timeframe not in SUPPORTED_TIMEFRAMES:
+        raise HTTPException(status_code=400, detail=f"Unsupported timeframe {timeframe}. Use one of {list(SUPPORTED_TIMEFRAMES)}")
 
-        print(f"DEBUG: Columns for {ticker} on {date}: {df_copy.columns.tolist()}")
+    indicator_list = []
+    for name in (indicators or "").split(","):
+        name = name.strip().lower()
+        if not name or name in indicator_list:
+            continue
+        if name not in SUPPORTED_INDICATORS:
+            raise HTTPException(status_code=400, detail=f"Unsupported indicator '{name}'. Use any of {list(SUPPORTED_INDICATORS)}")
+        indicator_list.append(name)
 
-        # Handle different possible time column names
-        time_col = None
-        for col in ['time', 'timestamp', 'datetime', 'minute']:
-            if col in df_copy.columns:
-                time_col = col
-                break
+    try:
+        # Past sessions never change; today's file may still be appended to
+        try:
+            is_past = date_type.fromisoformat(date) < date_type.today()
+        except ValueError:
+            is_past = False
+        cache_control = IMMUTABLE_CACHE_CONTROL if is_past else DEFAULT_CACHE_CONTROL
 
-        if time_col:
-            # Convert to time string (HH:MM:SS format)
-            time_values = df_copy[time_col]
+        source_etag = get_intraday_etag(ticker, date)
+        etag = make_etag("intraday", ticker, date, timeframe, *indicator_list, source_etag) if source_etag else None
+        if etag_matches(request, etag):
+            return not_modified(etag, cache_control)
 
-            # Check first value to determine format
-            first_val = time_values.iloc[0]
+        candles_df, columns = get_intraday_candles(ticker, date, timeframe, indicator_list)
 
-            if hasattr(first_val, 'strftime'):
-                # It's a datetime object
-                df_copy['time'] = time_values.apply(lambda x: x.strftime('%H:%M:%S'))
-            elif isinstance(first_val, str):
-                # It's a string - might be "2019-11-08 14:33" or just "14:33"
-                if ' ' in str(first_val):
-                    # Full datetime string - extract time part
-                    df_copy['time'] = time_values.apply(lambda x: str(x).split(' ')[-1] if ' ' in str(x) else str(x))
-                else:
-                    df_copy['time'] = time_values.astype(str)
-            else:
-                df_copy['time'] = time_values.astype(str)
+        if candles_df.empty and not columns:
+            raise HTTPException(status_code=404, detail=f"No intraday data found for {ticker} on {date}")
 
-        # Ensure we have the required columns
-        required_cols = ['time', 'open', 'high', 'low', 'close', 'volume']
-        available_cols = [c for c in required_cols if c in df_copy.columns]
+        if candles_df.columns.empty:
+            raise HTTPException(status_code=500, detail=f"No valid columns found. Available: {columns}")
 
-        if not available_cols:
-            raise HTTPException(status_code=500, detail=f"No valid columns found. Available: {df_copy.columns.tolist()}")
+        # Indicators are NaN until defined (e.g. no prior volume); send them as null
+        if indicator_list:
+            candles_df = candles_df.round({name: 4 for name in indicator_list})
+            candles_df = candles_df.astype(object).where(candles_df.notna(), None)
 
-        candles = df_copy[available_cols].to_dict(orient='records')
+        candles = candles_df.to_dict(orient='records')
 
         result = {
             "ticker": ticker,
             "date": date,
             "candles": candles,
             "count": len(candles),
-            "columns": df_copy.columns.tolist()
+            "timeframe": timeframe,
+            "indicators": indicator_list,
+            "columns": columns
         }
-        return JSONResponse(content=result)
+        return set_cache_headers(JSONResponse(content=result), etag, cache_control)
     except HTTPException:
         raise
     except Exception as e:
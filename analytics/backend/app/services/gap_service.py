@@ -1,9 +1,14 @@
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, Tuple
 import pandas as pd
 import numpy as np
 from app.services.parquet_service import load_ticker_quotes, load_ohlcv_intraday
 from app.config import GAP_THRESHOLD_PERCENT
 
+# In-memory cache for gap stats ("TICKER_min_gap" -> (data, timestamp))
+_gap_stats_cache: Dict[str, Tuple[Dict[str, Any], float]] = {}
+_GAP_CACHE_TTL = 3600  # 1 hour
+
 
 def calculate_gaps(ticker: str, min_gap_percent: float = GAP_THRESHOLD_PERCENT) -> List[Dict[str, Any]]:
     """
@@ -92,6 +97,20 @@ def calculate_gap_statistics(ticker: str, min_gap_percent: float = GAP_THRESHOLD
     return _calculate_gap_statistics_internal(df, gaps, ticker)
 
 
+def get_cached_gap_statistics(ticker: str, min_gap_percent: float = GAP_THRESHOLD_PERCENT) -> Tuple[Dict[str, Any], bool]:
+    """Gap statistics served from the in-memory cache when fresh. Returns (stats, cache_hit)."""
+    cache_key = f"{ticker}_{min_gap_percent}"
+
+    if cache_key in _gap_stats_cache:
+        cached_data, cached_time = _gap_stats_cache[cache_key]
+        if time.time() - cached_time < _GAP_CACHE_TTL:
+            return cached_data, True
+
+    stats = calculate_gap_statistics(ticker, min_gap_percent)
+    _gap_stats_cache[cache_key] = (stats, time.time())
+    return stats, False
+
+
 def _calculate_gaps_from_df(df: pd.DataFrame, min_gap_percent: float) -> List[Dict[str, Any]]:
     """Calculate gaps from an already loaded DataFrame."""
     if df.empty or len(df) < 2:
@@ -0,0 +1,64 @@
+"""
+HTTP Cache Helpers
+
+Builds strong ETags from R2 object ETags plus request parameters and answers
+conditional GETs (If-None-Match) with 304 before any DataFrame work is done.
+"""
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+# Bump when the response shape changes so clients drop stale validators
+ETAG_VERSION = "1"
+
+DEFAULT_CACHE_CONTROL = "public, max-age=3600"
+# Past trading days never change once written to R2
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a quoted strong ETag from source ETags and query parameters."""
+    digest = hashlib.sha1(ETAG_VERSION.encode())
+    for part in parts:
+        digest.update(b"\x00")
+        digest.update(str(part).encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: Optional[str]) -> bool:
+    """Check the request's If-None-Match header against an ETag (weak comparison)."""
+    if not etag:
+        return False
+
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    if header.strip() == "*":
+        return True
+
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+
+    return False
+
+
+def not_modified(etag: str, cache_control: str = DEFAULT_CACHE_CONTROL) -> Response:
+    """Empty 304 response carrying the same validators as a full response."""
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
+
+
+def set_cache_headers(response: Response, etag: Optional[str], cache_control: str = DEFAULT_CACHE_CONTROL) -> Response:
+    """Attach Cache-Control and (when known) ETag to a full response."""
+    response.headers["Cache-Control"] = cache_control
+    if etag:
+        response.headers["ETag"] = etag
+    return response
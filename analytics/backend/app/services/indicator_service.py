@@ -0,0 +1,217 @@
+"""
+Indicator Service - Intraday candles with indicators
+
+Normalizes a day's 1-minute frame, optionally resamples it to a larger
+timeframe and adds VWAP, EMA and relative volume columns computed with NumPy
+cumulative operations. Results are cached per (ticker, date, timeframe).
+"""
+import time
+from typing import Dict, List, Optional, Tuple, Any
+
+import numpy as np
+import pandas as pd
+
+from app.services.parquet_service import load_ohlcv_intraday, load_ticker_daily_ohlcv, CACHE_TTL_SECONDS
+
+SUPPORTED_INDICATORS = ("vwap", "ema9", "ema20", "rvol")
+SUPPORTED_TIMEFRAMES = (1, 2, 5, 10, 15, 30, 60)  # minutes
+
+RVOL_LOOKBACK_DAYS = 20
+_EMA_BLOCK_SIZE = 256  # Keeps the closed-form EMA weights well inside float64 range
+
+# ============ CACHING ============
+# (ticker, date, timeframe) -> {"candles": DataFrame, "columns": raw column names}
+_candle_cache: Dict[Tuple[str, str, int], Dict[str, Any]] = {}
+_candle_cache_timestamps: Dict[Tuple[str, str, int], float] = {}
+MAX_CANDLE_CACHE_ENTRIES = 256
+
+
+def _normalize_time_column(df: pd.DataFrame) -> pd.DataFrame:
+    """Add a 'time' column as HH:MM:SS strings from whichever time column the file has."""
+    # Handle different possible time column names
+    time_col = None
+    for col in ['time', 'timestamp', 'datetime', 'minute']:
+        if col in df.columns:
+            time_col = col
+            break
+
+    if time_col:
+        # Convert to time string (HH:MM:SS format)
+        time_values = df[time_col]
+
+        # Check first value to determine format
+        first_val = time_values.iloc[0]
+
+        if hasattr(first_val, 'strftime'):
+            # It's a datetime object
+            df['time'] = time_values.apply(lambda x: x.strftime('%H:%M:%S'))
+        elif isinstance(first_val, str):
+            # It's a string - might be "2019-11-08 14:33" or just "14:33"
+            if ' ' in str(first_val):
+                # Full datetime string - extract time part
+                df['time'] = time_values.apply(lambda x: str(x).split(' ')[-1] if ' ' in str(x) else str(x))
+            else:
+                df['time'] = time_values.astype(str)
+        else:
+            df['time'] = time_values.astype(str)
+
+    return df
+
+
+def _minutes_of_day(times: pd.Series) -> np.ndarray:
+    """Minutes since midnight for 'HH:MM' or 'HH:MM:SS' strings."""
+    parts = times.str.split(':', expand=True)
+    return parts[0].astype(int).to_numpy() * 60 + parts[1].astype(int).to_numpy()
+
+
+def resample_candles(df: pd.DataFrame, timeframe: int) -> pd.DataFrame:
+    """Aggregate time-sorted 1-minute candles into `timeframe`-minute candles."""
+    if timeframe == 1 or df.empty:
+        return df
+
+    minutes = _minutes_of_day(df['time'])
+    buckets = (minutes // timeframe) * timeframe
+
+    # Start index of each bucket in the sorted frame
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(df)] - 1
+
+    result = pd.DataFrame({
+        'time': [f"{m // 60:02d}:{m % 60:02d}:00" for m in buckets[starts]],
+        'open': df['open'].to_numpy()[starts],
+        'high': np.maximum.reduceat(df['high'].to_numpy(), starts),
+        'low': np.minimum.reduceat(df['low'].to_numpy(), starts),
+        'close': df['close'].to_numpy()[ends],
+    })
+    if 'volume' in df.columns:
+        result['volume'] = np.add.reduceat(df['volume'].to_numpy(), starts)
+    return result
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """
+    Exponential moving average (same as pandas ewm(span, adjust=False)).
+
+    Uses the closed form ema_k = d^(k+1) * prev + a * sum(d^(k-i) * x_i) with
+    cumulative sums, processed in blocks so the d^-i weights can't overflow.
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return values
+
+    alpha = 2.0 / (span + 1)
+    decay = 1.0 - alpha
+    result = np.empty_like(values)
+    prev = values[0]
+
+    for start in range(0, len(values), _EMA_BLOCK_SIZE):
+        block = values[start:start + _EMA_BLOCK_SIZE]
+        k = np.arange(len(block))
+        weights = decay ** -k
+        scale = decay ** k
+        result[start:start + len(block)] = (
+            decay * scale * prev + alpha * scale * np.cumsum(block * weights)
+        )
+        prev = result[start + len(block) - 1]
+
+    return result
+
+
+def vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """Session VWAP from typical price: cumsum(tp * volume) / cumsum(volume)."""
+    typical = (np.asarray(high, dtype=float) + np.asarray(low, dtype=float) + np.asarray(close, dtype=float)) / 3
+    cum_volume = np.cumsum(np.asarray(volume, dtype=float))
+    cum_pv = np.cumsum(typical * volume)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(cum_volume > 0, cum_pv / cum_volume, np.nan)
+
+
+def relative_volume(volume: np.ndarray, avg_daily_volume: Optional[float]) -> np.ndarray:
+    """Cumulative session volume as a multiple of the average daily volume."""
+    if not avg_daily_volume:
+        return np.full(len(volume), np.nan)
+    return np.cumsum(np.asarray(volume, dtype=float)) / avg_daily_volume
+
+
+def _average_daily_volume(ticker: str, date: str) -> Optional[float]:
+    """Average daily volume over the sessions before `date` (uses the cached daily frame)."""
+    daily = load_ticker_daily_ohlcv(ticker)
+    if daily.empty or 'volume' not in daily.columns:
+        return None
+
+    prior = daily[daily['date'] < pd.to_datetime(date)].tail(RVOL_LOOKBACK_DAYS)
+    if prior.empty:
+        return None
+    return float(prior['volume'].mean())
+
+
+def _add_indicators(ticker: str, date: str, candles: pd.DataFrame, indicators: List[str]) -> pd.DataFrame:
+    """Add any requested indicator columns that the cached frame doesn't have yet."""
+    missing = [name for name in indicators if name not in candles.columns]
+    if not missing or candles.empty:
+        return candles
+
+    high = candles['high'].to_numpy(dtype=float)
+    low = candles['low'].to_numpy(dtype=float)
+    close = candles['close'].to_numpy(dtype=float)
+    volume = candles['volume'].to_numpy(dtype=float) if 'volume' in candles.columns else np.zeros(len(candles))
+
+    for name in missing:
+        if name == 'vwap':
+            candles['vwap'] = vwap(high, low, close, volume)
+        elif name == 'ema9':
+            candles['ema9'] = ema(close, 9)
+        elif name == 'ema20':
+            candles['ema20'] = ema(close, 20)
+        elif name == 'rvol':
+            candles['rvol'] = relative_volume(volume, _average_daily_volume(ticker, date))
+
+    return candles
+
+
+def _evict_oldest():
+    while len(_candle_cache) > MAX_CANDLE_CACHE_ENTRIES:
+        oldest = min(_candle_cache_timestamps, key=_candle_cache_timestamps.get)
+        _candle_cache.pop(oldest, None)
+        _candle_cache_timestamps.pop(oldest, None)
+
+
+def get_intraday_candles(
+    ticker: str,
+    date: str,
+    timeframe: int = 1,
+    indicators: Optional[List[str]] = None,
+) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Get a day's candles at `timeframe` minutes with the requested indicator columns.
+    Returns (candles, raw file columns). Results are cached for 1 hour.
+    """
+    indicators = indicators or []
+    cache_key = (ticker, date, timeframe)
+
+    entry = _candle_cache.get(cache_key)
+    if entry is None or (time.time() - _candle_cache_timestamps[cache_key]) >= CACHE_TTL_SECONDS:
+        df = load_ohlcv_intraday(ticker, date)
+        if df.empty:
+            return pd.DataFrame(), []
+
+        df = _normalize_time_column(df.copy())
+        raw_columns = df.columns.tolist()
+
+        required_cols = ['time', 'open', 'high', 'low', 'close', 'volume']
+        candles = df[[c for c in required_cols if c in df.columns]]
+
+        if 'time' in candles.columns:
+            candles = candles.sort_values('time', kind='stable').reset_index(drop=True)
+            candles = resample_candles(candles, timeframe)
+
+        entry = {'candles': candles, 'columns': raw_columns}
+        _candle_cache[cache_key] = entry
+        _candle_cache_timestamps[cache_key] = time.time()
+        _evict_oldest()
+
+    if indicators and {'time', 'high', 'low', 'close'}.issubset(entry['candles'].columns):
+        entry['candles'] = _add_indicators(ticker, date, entry['candles'].copy(), indicators)
+
+    base_cols = [c for c in entry['candles'].columns if c not in SUPPORTED_INDICATORS]
+    return entry['candles'][base_cols + [c for c in indicators if c in entry['candles'].columns]], entry['columns']
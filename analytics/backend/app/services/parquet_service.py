@@ -6,7 +6,7 @@ Uses in-memory caching to avoid repeated R2 downloads.
 """
 import io
 import time
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, FrozenSet
 import pandas as pd
 import pyarrow.parquet as pq
 import boto3
@@ -36,8 +36,16 @@ _keys_cache_timestamps: Dict[str, float] = {}
 
 # Cache for available tickers
 _available_tickers_cache: Optional[List[str]] = None
+_available_tickers_set: FrozenSet[str] = frozenset()  # Same tickers, for membership checks
 _available_tickers_timestamp: float = 0
 
+# quotes_p95 objects seen while listing tickers (ticker -> [{key, year_range, etag, size}])
+_quotes_listing: Dict[str, List[Dict[str, Any]]] = {}
+
+# Cache for R2 ETags of the objects backing a response (cache key -> list of ETags)
+_etag_cache: Dict[str, List[str]] = {}
+_etag_cache_timestamps: Dict[str, float] = {}
+
 
 def _is_cache_valid(ticker: str, cache_timestamps: Dict[str, float]) -> bool:
     """Check if cache entry is still valid."""
@@ -54,11 +62,16 @@ def clear_cache(ticker: Optional[str] = None):
         _cache_timestamps.pop(ticker, None)
         _keys_cache.pop(ticker, None)
         _keys_cache_timestamps.pop(ticker, None)
+        for key in [k for k in _etag_cache if k.split(':')[1] == ticker]:
+            _etag_cache.pop(key, None)
+            _etag_cache_timestamps.pop(key, None)
     else:
         _ticker_cache.clear()
         _cache_timestamps.clear()
         _keys_cache.clear()
         _keys_cache_timestamps.clear()
+        _etag_cache.clear()
+        _etag_cache_timestamps.clear()
 
 
 def get_s3_client():
@@ -77,21 +90,151 @@ def get_s3_client():
 
 def read_parquet_from_r2(key: str) -> pd.DataFrame:
     """Read a Parquet file from R2 and return as DataFrame."""
+    df, _ = _read_parquet_with_etag(key)
+    return df
+
+
+def _read_parquet_with_etag(key: str) -> Tuple[pd.DataFrame, Optional[str]]:
+    """Read a Parquet file from R2, returning the DataFrame and the object's ETag."""
     s3 = get_s3_client()
     try:
         response = s3.get_object(Bucket=R2_BUCKET, Key=key)
         data = response['Body'].read()
         buffer = io.BytesIO(data)
         table = pq.read_table(buffer)
-        return table.to_pandas()
+        return table.to_pandas(), _strip_etag(response.get('ETag'))
     except Exception as e:
         print(f"Error reading {key} from R2: {e}")
-        return pd.DataFrame()
+        return pd.DataFrame(), None
+
+
+def _strip_etag(etag: Optional[str]) -> Optional[str]:
+    """R2 returns ETags wrapped in double quotes; keep only the opaque value."""
+    return etag.strip('"') if etag else None
+
+
+def head_object_etag(key: str) -> Optional[str]:
+    """Get the ETag of an object in R2 without downloading it. None if missing."""
+    s3 = get_s3_client()
+    try:
+        response = s3.head_object(Bucket=R2_BUCKET, Key=key)
+        return _strip_etag(response.get('ETag'))
+    except Exception:
+        return None
+
+
+def _get_cached_etags(cache_key: str) -> Optional[List[str]]:
+    if _is_cache_valid(cache_key, _etag_cache_timestamps) and cache_key in _etag_cache:
+        return _etag_cache[cache_key]
+    return None
+
+
+def _set_cached_etags(cache_key: str, etags: List[str]):
+    _etag_cache[cache_key] = etags
+    _etag_cache_timestamps[cache_key] = time.time()
+
+
+def _daily_candidate_keys(ticker: str) -> List[List[str]]:
+    """Possible quotes_p95 keys for a ticker, grouped by year range (first hit wins)."""
+    # Once the ticker listing is cached, only try keys that are known to exist
+    if _quotes_listing:
+        return [
+            [obj['key'] for obj in _quotes_listing.get(ticker, []) if obj['year_range'] == year_range]
+            for year_range in ['2019_2025', '2004_2018']
+        ]
+
+    return [
+        [
+            f"{R2_QUOTES_PREFIX}/{year_range}/{ticker}.parquet",
+            f"{R2_QUOTES_PREFIX}/{year_range}/{ticker}/data.parquet",
+        ]
+        for year_range in ['2019_2025', '2004_2018']
+    ]
+
+
+def _intraday_candidate_keys(ticker: str, date: str) -> List[str]:
+    """Possible intraday 1-minute keys for a ticker/date, in lookup order."""
+    year, month, day = date.split("-")
+    year_int = int(year)
+
+    # Ensure month is zero-padded
+    month_padded = month.zfill(2)
+
+    year_range = '2019_2025' if year_int >= 2019 else '2004_2018'
+
+    return [
+        # Format: ohlcv_intraday_1m/2019_2025/TICKER/year=2019/month=11/minute.parquet
+        f"{R2_OHLCV_PREFIX}/{year_range}/{ticker}/year={year}/month={month_padded}/minute.parquet",
+        # Format with day: ohlcv_intraday_1m/2019_2025/TICKER/year=2019/month=11/day=11/minute.parquet
+        f"{R2_OHLCV_PREFIX}/{year_range}/{ticker}/year={year}/month={month_padded}/day={day}/minute.parquet",
+        # Format: ohlcv_intraday_1m/2019_2025/TICKER/2019/11/minute.parquet
+        f"{R2_OHLCV_PREFIX}/{year_range}/{ticker}/{year}/{month_padded}/minute.parquet",
+        # Format: ohlcv_intraday_1m/2019_2025/TICKER/2019-11/data.parquet
+        f"{R2_OHLCV_PREFIX}/{year_range}/{ticker}/{year}-{month_padded}/data.parquet",
+        # Format: ohlcv_intraday_1m/2019_2025/TICKER/data.parquet (all data in one file)
+        f"{R2_OHLCV_PREFIX}/{year_range}/{ticker}/data.parquet",
+    ]
+
+
+def get_ticker_daily_etags(ticker: str) -> List[str]:
+    """
+    Get R2 ETags of the objects backing a ticker's daily frame. Cached for 1 hour.
+    Uses HEAD requests (or a listing for the minute-data fallback), never downloads data.
+    """
+    cache_key = f"daily:{ticker}"
+    cached = _get_cached_etags(cache_key)
+    if cached is not None:
+        return cached
+
+    # The ticker listing already carries the ETags; HEAD only when it doesn't
+    etags = [obj['etag'] for obj in _quotes_listing.get(ticker, []) if obj['etag']]
+
+    if not etags:
+        for keys in _daily_candidate_keys(ticker):
+            for key in keys:
+                etag = head_object_etag(key)
+                if etag:
+                    etags.append(etag)
+                    break
+
+    # Fallback: daily frame is aggregated from minute data
+    if not etags:
+        s3 = get_s3_client()
+        for year_range in ['2019_2025', '2004_2018']:
+            prefix = f"{R2_OHLCV_PREFIX}/{year_range}/{ticker}/"
+            try:
+                paginator = s3.get_paginator('list_objects_v2')
+                for page in paginator.paginate(Bucket=R2_BUCKET, Prefix=prefix):
+                    for obj in page.get('Contents', []):
+                        if obj['Key'].endswith('.parquet'):
+                            etags.append(_strip_etag(obj.get('ETag')) or obj['Key'])
+            except Exception as e:
+                print(f"Error listing ETags for {ticker}: {e}")
+
+    _set_cached_etags(cache_key, etags)
+    return etags
+
+
+def get_intraday_etag(ticker: str, date: str) -> Optional[str]:
+    """Get the R2 ETag of the intraday file that serves a ticker/date. Cached for 1 hour."""
+    cache_key = f"intraday:{ticker}:{date}"
+    cached = _get_cached_etags(cache_key)
+    if cached is not None:
+        return cached[0] if cached else None
+
+    etag = None
+    for key in _intraday_candidate_keys(ticker, date):
+        etag = head_object_etag(key)
+        if etag:
+            break
+
+    _set_cached_etags(cache_key, [etag] if etag else [])
+    return etag
 
 
 def get_available_tickers() -> List[str]:
     """Get list of all available tickers from quotes_p95 data in R2. Cached for 1 hour."""
-    global _available_tickers_cache, _available_tickers_timestamp
+    global _available_tickers_cache, _available_tickers_set, _available_tickers_timestamp
 
     # Check cache
     if _available_tickers_cache and (time.time() - _available_tickers_timestamp) < CACHE_TTL_SECONDS:
@@ -99,6 +242,7 @@ def get_available_tickers() -> List[str]:
 
     s3 = get_s3_client()
     tickers = set()
+    listing: Dict[str, List[Dict[str, Any]]] = {}
 
     # Check both year ranges in quotes_p95 (faster than ohlcv_intraday_1m)
     for year_range in ['2019_2025', '2004_2018']:
@@ -109,11 +253,19 @@ def get_available_tickers() -> List[str]:
             for page in paginator.paginate(Bucket=R2_BUCKET, Prefix=prefix):
                 for obj in page.get('Contents', []):
                     # Extract ticker from path like: quotes_p95/2019_2025/AAPL.parquet
+                    # or quotes_p95/2019_2025/AAPL/data.parquet
                     key = obj['Key']
                     if key.endswith('.parquet'):
-                        ticker = key.split('/')[-1].replace('.parquet', '')
+                        parts = key[len(prefix):].split('/')
+                        ticker = parts[0].replace('.parquet', '')
                         if ticker and not ticker.startswith('.'):
                             tickers.add(ticker)
+                            listing.setdefault(ticker, []).append({
+                                'key': key,
+                                'year_range': year_range,
+                                'etag': _strip_etag(obj.get('ETag')),
+                                'size': obj.get('Size'),
+                            })
         except Exception as e:
             print(f"Error listing tickers for {year_range}: {e}")
 
@@ -135,11 +287,49 @@ def get_available_tickers() -> List[str]:
 
     # Update cache
     _available_tickers_cache = result
+    _available_tickers_set = frozenset(result)
     _available_tickers_timestamp = time.time()
+    _quotes_listing.clear()
+    _quotes_listing.update(listing)
 
     return result
 
 
+def get_available_ticker_set() -> FrozenSet[str]:
+    """The available tickers as a set (same cache as get_available_tickers)."""
+    get_available_tickers()
+    return _available_tickers_set
+
+
+def get_ticker_quotes_objects(ticker: str) -> List[Dict[str, Any]]:
+    """quotes_p95 objects for a ticker, taken from the cached ticker listing (no extra R2 calls)."""
+    get_available_tickers()
+    return _quotes_listing.get(ticker, [])
+
+
+def read_parquet_metadata_from_r2(key: str):
+    """
+    Read only the Parquet footer of an object in R2 using ranged GETs.
+    Returns a pyarrow FileMetaData, or None if the object can't be read.
+    """
+    s3 = get_s3_client()
+    tail_bytes = 64 * 1024
+    try:
+        response = s3.get_object(Bucket=R2_BUCKET, Key=key, Range=f"bytes=-{tail_bytes}")
+        tail = response['Body'].read()
+
+        # Footer layout: <metadata><4-byte little-endian length>PAR1
+        footer_len = int.from_bytes(tail[-8:-4], 'little')
+        if footer_len + 8 > len(tail):
+            response = s3.get_object(Bucket=R2_BUCKET, Key=key, Range=f"bytes=-{footer_len + 8}")
+            tail = response['Body'].read()
+
+        return pq.read_metadata(io.BytesIO(tail))
+    except Exception as e:
+        print(f"Error reading footer of {key} from R2: {e}")
+        return None
+
+
 def get_ticker_ohlcv_keys(ticker: str) -> List[str]:
     """Get all OHLCV parquet file keys for a ticker in R2. Cached for 1 hour."""
     # Check cache
@@ -184,20 +374,18 @@ def load_ticker_daily_ohlcv(ticker: str, limit: Optional[int] = None) -> pd.Data
         return cached_df.copy()
 
     all_data = []
+    etags = []
 
     # Try loading from quotes_p95 (pre-aggregated daily data - FAST!)
-    for year_range in ['2019_2025', '2004_2018']:
+    for possible_keys in _daily_candidate_keys(ticker):
         # Try different possible file patterns
-        possible_keys = [
-            f"{R2_QUOTES_PREFIX}/{year_range}/{ticker}.parquet",
-            f"{R2_QUOTES_PREFIX}/{year_range}/{ticker}/data.parquet",
-        ]
-
         for key in possible_keys:
             try:
-                df = read_parquet_from_r2(key)
+                df, etag = _read_parquet_with_etag(key)
                 if not df.empty:
                     all_data.append(df)
+                    if etag:
+                        etags.append(etag)
                     break
             except Exception:
                 continue
@@ -223,6 +411,9 @@ def load_ticker_daily_ohlcv(ticker: str, limit: Optional[int] = None) -> pd.Data
         _ticker_cache[ticker] = result
         _cache_timestamps[ticker] = time.time()
 
+        # Keep validators in step with the cached data
+        _set_cached_etags(f"daily:{ticker}", etags)
+
         if limit:
             result = result.tail(limit).reset_index(drop=True)
 
@@ -312,27 +503,8 @@ def list_ticker_intraday_files(ticker: str) -> List[str]:
 
 def load_ohlcv_intraday(ticker: str, date: str) -> pd.DataFrame:
     """Load intraday 1-minute OHLCV data for a ticker on a specific date from R2."""
-    year, month, day = date.split("-")
-    year_int = int(year)
-
-    # Ensure month is zero-padded
-    month_padded = month.zfill(2)
-
-    year_range = '2019_2025' if year_int >= 2019 else '2004_2018'
-
     # Try multiple path formats
-    possible_keys = [
-        # Format: ohlcv_intraday_1m/2019_2025/TICKER/year=2019/month=11/minute.parquet
-        f"{R2_OHLCV_PREFIX}/{year_range}/{ticker}/year={year}/month={month_padded}/minute.parquet",
-        # Format with day: ohlcv_intraday_1m/2019_2025/TICKER/year=2019/month=11/day=11/minute.parquet
-        f"{R2_OHLCV_PREFIX}/{year_range}/{ticker}/year={year}/month={month_padded}/day={day}/minute.parquet",
-        # Format: ohlcv_intraday_1m/2019_2025/TICKER/2019/11/minute.parquet
-        f"{R2_OHLCV_PREFIX}/{year_range}/{ticker}/{year}/{month_padded}/minute.parquet",
-        # Format: ohlcv_intraday_1m/2019_2025/TICKER/2019-11/data.parquet
-        f"{R2_OHLCV_PREFIX}/{year_range}/{ticker}/{year}-{month_padded}/data.parquet",
-        # Format: ohlcv_intraday_1m/2019_2025/TICKER/data.parquet (all data in one file)
-        f"{R2_OHLCV_PREFIX}/{year_range}/{ticker}/data.parquet",
-    ]
+    possible_keys = _intraday_candidate_keys(ticker, date)
 
     df = pd.DataFrame()
     tried_keys = []
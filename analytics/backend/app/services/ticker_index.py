@@ -0,0 +1,106 @@
+"""
+Ticker Index - Per-ticker metadata without reading data
+
+Answers "does this ticker exist" and "what range does it cover" from the
+cached ticker listing, Parquet footers (ranged GETs of a few KB) and the
+intraday key listing. Footer metadata is cached per (key, ETag), so when the
+ticker list is refreshed only objects that actually changed are re-read.
+"""
+import re
+from typing import Dict, List, Optional, Tuple, Any
+
+from app.services.parquet_service import (
+    get_available_ticker_set, get_ticker_quotes_objects, get_ticker_ohlcv_keys,
+    read_parquet_metadata_from_r2,
+)
+
+# (key, etag) -> {"row_count", "first_date", "last_date"}
+_footer_cache: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+
+# Matches year=2019/month=11, 2019/11 and 2019-11 in intraday keys
+_MONTH_PATTERN = re.compile(r'/(?:year=)?(\d{4})[/-](?:month=)?(\d{1,2})(?:/|$)')
+
+
+def ticker_exists(ticker: str) -> bool:
+    """Check a ticker against the cached listing. Unknown (True) if the listing is unavailable."""
+    tickers = get_available_ticker_set()
+    if not tickers:
+        return True
+    return ticker in tickers
+
+
+def _date_str(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if hasattr(value, 'strftime'):
+        return value.strftime('%Y-%m-%d')
+    return str(value)[:10]
+
+
+def _read_footer_summary(key: str, etag: Optional[str]) -> Dict[str, Any]:
+    """Row count and date range of one Parquet object, from its footer statistics."""
+    cache_key = (key, etag)
+    if cache_key in _footer_cache:
+        return _footer_cache[cache_key]
+
+    summary: Dict[str, Any] = {"row_count": None, "first_date": None, "last_date": None}
+    metadata = read_parquet_metadata_from_r2(key)
+
+    if metadata is not None:
+        summary["row_count"] = metadata.num_rows
+
+        names = [name.lower() for name in metadata.schema.names]
+        if 'date' in names:
+            col_idx = names.index('date')
+            mins, maxs = [], []
+            for rg in range(metadata.num_row_groups):
+                stats = metadata.row_group(rg).column(col_idx).statistics
+                if stats is None or not stats.has_min_max:
+                    mins, maxs = [], []
+                    break
+                mins.append(stats.min)
+                maxs.append(stats.max)
+            if mins:
+                summary["first_date"] = _date_str(min(mins))
+                summary["last_date"] = _date_str(max(maxs))
+
+    # Only cache successful reads so transient errors are retried
+    if metadata is not None:
+        _footer_cache[cache_key] = summary
+    return summary
+
+
+def get_intraday_months(ticker: str) -> List[str]:
+    """Months ("YYYY-MM") with intraday files for a ticker, from the cached key listing."""
+    months = set()
+    for key in get_ticker_ohlcv_keys(ticker):
+        match = _MONTH_PATTERN.search(key)
+        if match:
+            months.add(f"{match.group(1)}-{int(match.group(2)):02d}")
+    return sorted(months)
+
+
+def get_ticker_metadata(ticker: str, include_intraday: bool = True) -> Optional[Dict[str, Any]]:
+    """
+    Metadata for a ticker: first/last date, row count, quotes partitions and
+    intraday months. None if the ticker isn't in the listing.
+    """
+    if not ticker_exists(ticker):
+        return None
+
+    objects = get_ticker_quotes_objects(ticker)
+    summaries = [_read_footer_summary(obj['key'], obj['etag']) for obj in objects]
+
+    first_dates = [s["first_date"] for s in summaries if s["first_date"]]
+    last_dates = [s["last_date"] for s in summaries if s["last_date"]]
+    row_counts = [s["row_count"] for s in summaries if s["row_count"] is not None]
+
+    return {
+        "ticker": ticker,
+        "has_data": True,
+        "first_date": min(first_dates) if first_dates else None,
+        "latest_date": max(last_dates) if last_dates else None,
+        "row_count": sum(row_counts) if row_counts else None,
+        "partitions": sorted({obj['year_range'] for obj in objects}),
+        "intraday_months": get_intraday_months(ticker) if include_intraday else None,
+    }
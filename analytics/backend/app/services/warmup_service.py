@@ -0,0 +1,119 @@
+"""
+Warmup Service - Preloads caches after a deploy
+
+Records how often each ticker is requested to a small local JSON file and,
+on startup, loads the ticker list plus the most requested tickers' daily data
+and gap stats in the background so the first users don't pay R2 latency.
+"""
+import asyncio
+import json
+import threading
+import time
+from typing import Dict, List, Any
+
+from app.config import (
+    WARMUP_STATS_FILE, WARMUP_TOP_N, WARMUP_CONCURRENCY, GAP_THRESHOLD_PERCENT
+)
+from app.services.parquet_service import get_available_tickers, load_ticker_quotes
+from app.services.gap_service import get_cached_gap_statistics
+from app.services.ticker_index import get_ticker_metadata
+
+FLUSH_INTERVAL_SECONDS = 60
+MAX_TRACKED_TICKERS = 1000  # Keep the stats file small
+
+_access_counts: Dict[str, int] = {}
+_counts_loaded = False
+_last_flush: float = 0
+_lock = threading.Lock()
+
+_status: Dict[str, Any] = {"state": "idle", "tickers_warmed": 0, "duration_seconds": None}
+
+
+def _load_access_counts():
+    """Load persisted counts once per process."""
+    global _counts_loaded
+    if _counts_loaded:
+        return
+    _counts_loaded = True
+
+    try:
+        if WARMUP_STATS_FILE.exists():
+            data = json.loads(WARMUP_STATS_FILE.read_text())
+            for ticker, count in data.items():
+                _access_counts[ticker] = _access_counts.get(ticker, 0) + int(count)
+    except Exception as e:
+        print(f"Error loading warmup stats from {WARMUP_STATS_FILE}: {e}")
+
+
+def flush_access_counts():
+    """Persist request counts (most requested tickers only) to the stats file."""
+    global _last_flush
+    with _lock:
+        _load_access_counts()
+        top = sorted(_access_counts.items(), key=lambda x: x[1], reverse=True)[:MAX_TRACKED_TICKERS]
+        _last_flush = time.time()
+
+    try:
+        WARMUP_STATS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = WARMUP_STATS_FILE.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(dict(top)))
+        tmp_path.replace(WARMUP_STATS_FILE)
+    except Exception as e:
+        print(f"Error writing warmup stats to {WARMUP_STATS_FILE}: {e}")
+
+
+def record_ticker_access(ticker: str):
+    """Count a request for a ticker. Flushed to disk at most once a minute."""
+    with _lock:
+        _load_access_counts()
+        _access_counts[ticker] = _access_counts.get(ticker, 0) + 1
+        should_flush = time.time() - _last_flush >= FLUSH_INTERVAL_SECONDS
+
+    if should_flush:
+        flush_access_counts()
+
+
+def get_top_tickers(n: int = WARMUP_TOP_N) -> List[str]:
+    """Most requested tickers, most popular first."""
+    with _lock:
+        _load_access_counts()
+        return [t for t, _ in sorted(_access_counts.items(), key=lambda x: x[1], reverse=True)[:n]]
+
+
+def get_warmup_status() -> Dict[str, Any]:
+    return dict(_status)
+
+
+def _warm_ticker(ticker: str):
+    """Load metadata, daily data and gap stats for one ticker into the in-memory caches."""
+    get_ticker_metadata(ticker)
+    load_ticker_quotes(ticker)
+    get_cached_gap_statistics(ticker, GAP_THRESHOLD_PERCENT)
+
+
+async def warm_caches(top_n: int = WARMUP_TOP_N, concurrency: int = WARMUP_CONCURRENCY):
+    """Preload the ticker list and the top-N tickers. Meant to run as a background task."""
+    start = time.time()
+    _status.update(state="running", tickers_warmed=0, duration_seconds=None)
+
+    try:
+        available = set(await asyncio.to_thread(get_available_tickers))
+        tickers = [t for t in get_top_tickers(top_n) if t in available]
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def warm_one(ticker: str):
+            async with semaphore:
+                try:
+                    await asyncio.to_thread(_warm_ticker, ticker)
+                    _status["tickers_warmed"] += 1
+                except Exception as e:
+                    print(f"Error warming {ticker}: {e}")
+
+        await asyncio.gather(*(warm_one(t) for t in tickers))
+        _status["state"] = "done"
+    except Exception as e:
+        print(f"Error during cache warmup: {e}")
+        _status["state"] = "failed"
+    finally:
+        _status["duration_seconds"] = round(time.time() - start, 2)
@@ -211,6 +211,11 @@ export interface IntradayCandle {
   low: number;
   close: number;
   volume: number;
+  // Present when requested via ?indicators=
+  vwap?: number | null;
+  ema9?: number | null;
+  ema20?: number | null;
+  rvol?: number | null;
 }
 
 export interface IntradayData {
@@ -1,34 +1,142 @@
 from datetime import date, timedelta
 from fastapi import APIRouter, Query
-from sqlalchemy import select, func, case, and_
-from collections import defaultdict
+from sqlalchemy import select, func
 
 from app.api.deps import DbSession, CurrentUser
+from app.core import timescale
+from app.core.cache import cached_endpoint
 from app.models.trade import Trade, TradeSide
+from app.models.trade_rollup import TradeDailyRollup
+from app.services.trade_rollup import NO_ENTRY_HOUR
 from app.schemas.dashboard import DashboardMetrics, CalendarDay, MonthlyStats, TickerStats, TimingStats
 
 router = APIRouter()
 
 
+def _metric_filters(model, user_id: int, start_date: date | None, end_date: date | None) -> list:
+    """User and date range filters for trades, the rollup or a P&L aggregate (anything with user_id and date)."""
+    filters = [model.user_id == user_id]
+    if start_date:
+        filters.append(model.date >= start_date)
+    if end_date:
+        filters.append(model.date <= end_date)
+    return filters
+
+
+def _daily_pnl_source():
+    """Daily P&L by side: the continuous aggregate on TimescaleDB, otherwise the rollup table."""
+    return timescale.trade_pnl_daily if timescale.enabled else TradeDailyRollup.__table__
+
+
+def _summary_query(source, filters: list):
+    """Totals, side splits, period P&L and best/worst day in one row, from daily P&L rows."""
+    today = date.today()
+    week_start = today - timedelta(days=today.weekday())
+    month_start = today.replace(day=1)
+
+    r = source.c
+    is_long = r.side == TradeSide.LONG
+    is_short = r.side == TradeSide.SHORT
+
+    daily = (
+        select(func.sum(r.pnl).label("pnl"))
+        .where(*filters)
+        .group_by(r.date)
+        .subquery()
+    )
+
+    def total(column, condition=None):
+        aggregate = func.sum(column) if condition is None else func.sum(column).filter(condition)
+        return func.coalesce(aggregate, 0)
+
+    return select(
+        total(r.trade_count).label("total_trades"),
+        total(r.pnl).label("total_pnl"),
+        total(r.win_count).label("winning_trades"),
+        total(r.loss_count).label("losing_trades"),
+        total(r.gross_profit).label("gross_profit"),
+        total(r.gross_loss).label("gross_loss"),
+        func.coalesce(func.max(r.max_pnl), 0).label("best_trade"),
+        func.coalesce(func.min(r.min_pnl), 0).label("worst_trade"),
+        total(r.pnl, is_long).label("long_pnl"),
+        total(r.trade_count, is_long).label("long_trades"),
+        total(r.win_count, is_long).label("long_winners"),
+        total(r.pnl, is_short).label("short_pnl"),
+        total(r.trade_count, is_short).label("short_trades"),
+        total(r.win_count, is_short).label("short_winners"),
+        total(r.pnl, r.date == today).label("today_pnl"),
+        total(r.pnl, r.date >= week_start).label("week_pnl"),
+        total(r.pnl, r.date >= month_start).label("month_pnl"),
+        select(func.coalesce(func.max(daily.c.pnl), 0)).scalar_subquery().label("best_day"),
+        select(func.coalesce(func.min(daily.c.pnl), 0)).scalar_subquery().label("worst_day"),
+    ).where(*filters)
+
+
+def _streak_query(filters: list):
+    """
+    Longest win/loss streaks and the current streak (gaps and islands over trades in
+    date/entry order). Break-even trades don't end a streak, but a break-even last
+    trade makes the current streak 0.
+    """
+    ordered = (
+        select(
+            Trade.pnl,
+            func.row_number().over(
+                order_by=(Trade.date, Trade.entry_time.asc().nulls_last(), Trade.id)
+            ).label("seq"),
+        )
+        .where(*filters)
+        .subquery()
+    )
+    outcome = func.sign(ordered.c.pnl)
+    decided = (
+        select(
+            outcome.label("outcome"),
+            ordered.c.seq,
+            (
+                func.row_number().over(order_by=ordered.c.seq)
+                - func.row_number().over(partition_by=outcome, order_by=ordered.c.seq)
+            ).label("island"),
+        )
+        .where(ordered.c.pnl != 0)
+        .subquery()
+    )
+    islands = (
+        select(
+            decided.c.outcome,
+            func.count().label("length"),
+            func.max(decided.c.seq).label("last_seq"),
+        )
+        .group_by(decided.c.outcome, decided.c.island)
+        .subquery()
+    )
+    last_seq = select(func.max(ordered.c.seq)).scalar_subquery()
+
+    return select(
+        func.coalesce(func.max(islands.c.length).filter(islands.c.outcome > 0), 0).label("max_win_streak"),
+        func.coalesce(func.max(islands.c.length).filter(islands.c.outcome < 0), 0).label("max_loss_streak"),
+        func.coalesce(
+            func.max(islands.c.outcome * islands.c.length).filter(islands.c.last_seq == last_seq), 0
+        ).label("current_streak"),
+    )
+
+
 @router.get("/metrics", response_model=DashboardMetrics)
+@cached_endpoint("dashboard.metrics", depends_on_today=True)
 async def get_dashboard_metrics(
     db: DbSession,
     current_user: CurrentUser,
     start_date: date | None = None,
     end_date: date | None = None,
 ):
-    """Get overall dashboard metrics"""
-    query = select(Trade).where(Trade.user_id == current_user.id)
-
-    if start_date:
-        query = query.where(Trade.date >= start_date)
-    if end_date:
-        query = query.where(Trade.date <= end_date)
-
-    result = await db.execute(query)
-    trades = result.scalars().all()
-
-    if not trades:
+    """Get overall dashboard metrics (totals from daily aggregates; streaks need per-trade order)"""
+    source = _daily_pnl_source()
+    m = (await db.execute(
+        _summary_query(source, _metric_filters(source.c, current_user.id, start_date, end_date))
+    )).one()
+    total_trades = m.total_trades
+
+    if not total_trades:
         return DashboardMetrics(
             total_pnl=0, total_trades=0, winning_trades=0, losing_trades=0,
             win_rate=0, avg_win=0, avg_loss=0, avg_pnl_per_trade=0,
@@ -39,109 +147,52 @@ async def get_dashboard_metrics(
             current_streak=0, max_win_streak=0, max_loss_streak=0
         )
 
-    # Calculate metrics
-    total_pnl = sum(t.pnl for t in trades)
-    total_trades = len(trades)
-    winning_trades = [t for t in trades if t.pnl > 0]
-    losing_trades = [t for t in trades if t.pnl < 0]
-
-    win_rate = len(winning_trades) / total_trades * 100 if total_trades > 0 else 0
-    avg_win = sum(t.pnl for t in winning_trades) / len(winning_trades) if winning_trades else 0
-    avg_loss = sum(t.pnl for t in losing_trades) / len(losing_trades) if losing_trades else 0
-    avg_pnl_per_trade = total_pnl / total_trades if total_trades > 0 else 0
-
-    gross_profit = sum(t.pnl for t in winning_trades)
-    gross_loss = abs(sum(t.pnl for t in losing_trades))
-    profit_factor = gross_profit / gross_loss if gross_loss > 0 else gross_profit
-
-    best_trade = max(t.pnl for t in trades) if trades else 0
-    worst_trade = min(t.pnl for t in trades) if trades else 0
-
-    # Daily P&L
-    daily_pnl = defaultdict(float)
-    for t in trades:
-        daily_pnl[t.date] += t.pnl
-    best_day = max(daily_pnl.values()) if daily_pnl else 0
-    worst_day = min(daily_pnl.values()) if daily_pnl else 0
-
-    # By side
-    long_trades_list = [t for t in trades if t.side == TradeSide.LONG]
-    short_trades_list = [t for t in trades if t.side == TradeSide.SHORT]
-
-    long_pnl = sum(t.pnl for t in long_trades_list)
-    long_trades_count = len(long_trades_list)
-    long_winners = len([t for t in long_trades_list if t.pnl > 0])
-    long_win_rate = long_winners / long_trades_count * 100 if long_trades_count > 0 else 0
-
-    short_pnl = sum(t.pnl for t in short_trades_list)
-    short_trades_count = len(short_trades_list)
-    short_winners = len([t for t in short_trades_list if t.pnl > 0])
-    short_win_rate = short_winners / short_trades_count * 100 if short_trades_count > 0 else 0
-
-    # Period P&L
-    today = date.today()
-    week_start = today - timedelta(days=today.weekday())
-    month_start = today.replace(day=1)
+    streaks = (await db.execute(
+        _streak_query(_metric_filters(Trade, current_user.id, start_date, end_date))
+    )).one()
 
-    today_pnl = sum(t.pnl for t in trades if t.date == today)
-    week_pnl = sum(t.pnl for t in trades if t.date >= week_start)
-    month_pnl = sum(t.pnl for t in trades if t.date >= month_start)
-
-    # Streaks
-    sorted_trades = sorted(trades, key=lambda t: (t.date, t.entry_time or "00:00"))
-    current_streak = 0
-    max_win_streak = 0
-    max_loss_streak = 0
-    temp_win_streak = 0
-    temp_loss_streak = 0
-
-    for t in sorted_trades:
-        if t.pnl > 0:
-            temp_win_streak += 1
-            temp_loss_streak = 0
-            max_win_streak = max(max_win_streak, temp_win_streak)
-        elif t.pnl < 0:
-            temp_loss_streak += 1
-            temp_win_streak = 0
-            max_loss_streak = max(max_loss_streak, temp_loss_streak)
-
-    if sorted_trades:
-        last_trade = sorted_trades[-1]
-        if last_trade.pnl > 0:
-            current_streak = temp_win_streak
-        elif last_trade.pnl < 0:
-            current_streak = -temp_loss_streak
+    win_rate = m.winning_trades / total_trades * 100
+    avg_win = m.gross_profit / m.winning_trades if m.winning_trades else 0
+    avg_loss = m.gross_loss / m.losing_trades if m.losing_trades else 0
+    avg_pnl_per_trade = m.total_pnl / total_trades
+
+    gross_loss = abs(m.gross_loss)
+    profit_factor = m.gross_profit / gross_loss if gross_loss > 0 else m.gross_profit
+
+    long_win_rate = m.long_winners / m.long_trades * 100 if m.long_trades > 0 else 0
+    short_win_rate = m.short_winners / m.short_trades * 100 if m.short_trades > 0 else 0
 
     return DashboardMetrics(
-        total_pnl=round(total_pnl, 2),
+        total_pnl=round(m.total_pnl, 2),
         total_trades=total_trades,
-        winning_trades=len(winning_trades),
-        losing_trades=len(losing_trades),
+        winning_trades=m.winning_trades,
+        losing_trades=m.losing_trades,
         win_rate=round(win_rate, 2),
         avg_win=round(avg_win, 2),
         avg_loss=round(avg_loss, 2),
         avg_pnl_per_trade=round(avg_pnl_per_trade, 2),
         profit_factor=round(profit_factor, 2),
-        best_trade=round(best_trade, 2),
-        worst_trade=round(worst_trade, 2),
-        best_day=round(best_day, 2),
-        worst_day=round(worst_day, 2),
-        long_pnl=round(long_pnl, 2),
-        long_trades=long_trades_count,
+        best_trade=round(m.best_trade, 2),
+        worst_trade=round(m.worst_trade, 2),
+        best_day=round(m.best_day, 2),
+        worst_day=round(m.worst_day, 2),
+        long_pnl=round(m.long_pnl, 2),
+        long_trades=m.long_trades,
         long_win_rate=round(long_win_rate, 2),
-        short_pnl=round(short_pnl, 2),
-        short_trades=short_trades_count,
+        short_pnl=round(m.short_pnl, 2),
+        short_trades=m.short_trades,
         short_win_rate=round(short_win_rate, 2),
-        today_pnl=round(today_pnl, 2),
-        week_pnl=round(week_pnl, 2),
-        month_pnl=round(month_pnl, 2),
-        current_streak=current_streak,
-        max_win_streak=max_win_streak,
-        max_loss_streak=max_loss_streak
+        today_pnl=round(m.today_pnl, 2),
+        week_pnl=round(m.week_pnl, 2),
+        month_pnl=round(m.month_pnl, 2),
+        current_streak=int(streaks.current_streak),
+        max_win_streak=int(streaks.max_win_streak),
+        max_loss_streak=int(streaks.max_loss_streak)
     )
 
 
 @router.get("/calendar/{year}/{month}", response_model=MonthlyStats)
+@cached_endpoint("dashboard.calendar")
 async def get_monthly_calendar(
     year: int,
     month: int,
@@ -155,26 +206,24 @@ async def get_monthly_calendar(
     first_day = date(year, month, 1)
     last_day = date(year, month, monthrange(year, month)[1])
 
-    query = select(Trade).where(
-        Trade.user_id == current_user.id,
-        Trade.date >= first_day,
-        Trade.date <= last_day
+    r = _daily_pnl_source().c
+    query = (
+        select(
+            r.date,
+            func.sum(r.pnl).label("pnl"),
+            func.sum(r.trade_count).label("trades"),
+            func.sum(r.win_count).label("wins"),
+        )
+        .where(r.user_id == current_user.id, r.date >= first_day, r.date <= last_day)
+        .group_by(r.date)
+        .order_by(r.date)
     )
-
     result = await db.execute(query)
-    trades = result.scalars().all()
-
-    # Group by date
-    daily_data = defaultdict(lambda: {"pnl": 0, "trades": 0, "wins": 0})
-    for t in trades:
-        daily_data[t.date]["pnl"] += t.pnl
-        daily_data[t.date]["trades"] += 1
-        if t.pnl > 0:
-            daily_data[t.date]["wins"] += 1
+    daily_data = {row.date: {"pnl": row.pnl, "trades": row.trades, "wins": row.wins} for row in result}
 
     # Build calendar
     calendar = []
-    for day_date, data in sorted(daily_data.items()):
+    for day_date, data in daily_data.items():
         win_rate = data["wins"] / data["trades"] * 100 if data["trades"] > 0 else 0
         calendar.append(CalendarDay(
             date=day_date,
@@ -185,9 +234,20 @@ async def get_monthly_calendar(
         ))
 
     # Monthly stats
-    total_pnl = sum(d["pnl"] for d in daily_data.values())
-    total_trades = sum(d["trades"] for d in daily_data.values())
-    total_wins = sum(d["wins"] for d in daily_data.values())
+    if timescale.enabled:
+        monthly = timescale.trade_pnl_monthly.c
+        totals = (await db.execute(
+            select(
+                func.coalesce(func.sum(monthly.pnl), 0),
+                func.coalesce(func.sum(monthly.trade_count), 0),
+                func.coalesce(func.sum(monthly.win_count), 0),
+            ).where(monthly.user_id == current_user.id, monthly.date == first_day)
+        )).one()
+        total_pnl, total_trades, total_wins = totals
+    else:
+        total_pnl = sum(d["pnl"] for d in daily_data.values())
+        total_trades = sum(d["trades"] for d in daily_data.values())
+        total_wins = sum(d["wins"] for d in daily_data.values())
     trading_days = len(daily_data)
 
     return MonthlyStats(
@@ -205,6 +265,7 @@ async def get_monthly_calendar(
 
 
 @router.get("/tickers", response_model=list[TickerStats])
+@cached_endpoint("dashboard.tickers")
 async def get_ticker_stats(
     db: DbSession,
     current_user: CurrentUser,
@@ -213,26 +274,17 @@ async def get_ticker_stats(
     end_date: date | None = None,
 ):
     """Get top tickers by P&L"""
-    query = select(Trade).where(Trade.user_id == current_user.id)
-
-    if start_date:
-        query = query.where(Trade.date >= start_date)
-    if end_date:
-        query = query.where(Trade.date <= end_date)
-
+    r = TradeDailyRollup
+    pnl = func.sum(r.pnl)
+    query = (
+        select(r.ticker, pnl.label("pnl"), func.sum(r.trade_count).label("trades"), func.sum(r.win_count).label("wins"))
+        .where(*_metric_filters(r, current_user.id, start_date, end_date))
+        .group_by(r.ticker)
+        .order_by(func.abs(pnl).desc())
+        .limit(limit)
+    )
     result = await db.execute(query)
-    trades = result.scalars().all()
-
-    # Group by ticker
-    ticker_data = defaultdict(lambda: {"pnl": 0, "trades": 0, "wins": 0})
-    for t in trades:
-        ticker_data[t.ticker]["pnl"] += t.pnl
-        ticker_data[t.ticker]["trades"] += 1
-        if t.pnl > 0:
-            ticker_data[t.ticker]["wins"] += 1
-
-    # Sort by absolute P&L and limit
-    sorted_tickers = sorted(ticker_data.items(), key=lambda x: abs(x[1]["pnl"]), reverse=True)[:limit]
+    sorted_tickers = [(row.ticker, {"pnl": row.pnl, "trades": row.trades, "wins": row.wins}) for row in result]
 
     return [
         TickerStats(
@@ -247,6 +299,7 @@ async def get_ticker_stats(
 
 
 @router.get("/timing", response_model=list[TimingStats])
+@cached_endpoint("dashboard.timing")
 async def get_timing_stats(
     db: DbSession,
     current_user: CurrentUser,
@@ -254,30 +307,23 @@ async def get_timing_stats(
     end_date: date | None = None,
 ):
     """Get trading performance by hour of day"""
-    query = select(Trade).where(
-        Trade.user_id == current_user.id,
-        Trade.entry_time.isnot(None)
+    r = TradeDailyRollup
+    query = (
+        select(
+            r.entry_hour,
+            func.sum(r.pnl).label("pnl"),
+            func.sum(r.trade_count).label("trades"),
+            func.sum(r.win_count).label("wins"),
+            func.sum(r.duration_seconds).label("duration"),
+        )
+        .where(*_metric_filters(r, current_user.id, start_date, end_date), r.entry_hour != NO_ENTRY_HOUR)
+        .group_by(r.entry_hour)
     )
-
-    if start_date:
-        query = query.where(Trade.date >= start_date)
-    if end_date:
-        query = query.where(Trade.date <= end_date)
-
     result = await db.execute(query)
-    trades = result.scalars().all()
-
-    # Group by hour
-    hour_data = defaultdict(lambda: {"pnl": 0, "trades": 0, "wins": 0, "duration": 0})
-    for t in trades:
-        if t.entry_time:
-            hour = t.entry_time.hour
-            hour_data[hour]["pnl"] += t.pnl
-            hour_data[hour]["trades"] += 1
-            if t.pnl > 0:
-                hour_data[hour]["wins"] += 1
-            if t.duration_seconds:
-                hour_data[hour]["duration"] += t.duration_seconds
+    hour_data = {
+        row.entry_hour: {"pnl": row.pnl, "trades": row.trades, "wins": row.wins, "duration": row.duration}
+        for row in result
+    }
 
     return [
         TimingStats(
@@ -1,38 +1,85 @@
 from __future__ import annotations
 
-from datetime import date
-from math import sqrt
-from typing import Optional
+from dataclasses import asdict
+from datetime import date, time
+from typing import Literal, Optional
 
-from fastapi import APIRouter
-from sqlalchemy import select
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query
 
 from app.api.deps import DbSession, CurrentUser
+from app.core.cache import cached_call, cached_endpoint
 from app.models.trade import Trade, TradeSide
+from app.models.user import User
 from app.schemas.reports import (
-    DetailedStatsResponse,
-    DaysTimesResponse, DayStats, HourStats, MonthStats, DurationStats,
-    PriceVolumeResponse, PriceRangeStats, VolumeRangeStats,
+    DetailedStatsResponse, DaysTimesResponse, PriceVolumeResponse, DetailedReportsResponse,
+    BucketStats, BucketsResponse, EquityPoint, EquityCurveResponse,
 )
+from app.services import equity_curve, reports_engine, significance, trade_buckets
 
 router = APIRouter()
 
 
-def _safe_div(num: float, den: float) -> float:
-    return num / den if den else 0.0
+def _report_filters(
+    user_id: int,
+    ticker: Optional[str],
+    side: Optional[TradeSide],
+    start_date: Optional[date],
+    end_date: Optional[date],
+) -> list:
+    filters = [Trade.user_id == user_id]
+    if ticker:
+        filters.append(Trade.ticker == ticker.upper())
+    if side:
+        filters.append(Trade.side == side)
+    if start_date:
+        filters.append(Trade.date >= start_date)
+    if end_date:
+        filters.append(Trade.date <= end_date)
+    return filters
+
+
+async def _significance(
+    user: User,
+    trades: reports_engine.TradeArrays,
+    ticker: Optional[str],
+    side: Optional[TradeSide],
+    start_date: Optional[date],
+    end_date: Optional[date],
+) -> significance.SignificanceStats:
+    """Monte Carlo stats for the filtered trades, shared by every endpoint that reports them."""
+    async def compute():
+        return asdict(significance.significance_stats(trades.pnl))
+
+    params = {"ticker": ticker, "side": side, "start_date": start_date, "end_date": end_date}
+    return significance.SignificanceStats(**await cached_call("reports.significance", user, params, compute))
 
 
-def _stddev(values: list[float]) -> float:
-    # population stddev (stable enough for UI)
-    n = len(values)
-    if n < 2:
-        return 0.0
-    mean = sum(values) / n
-    var = sum((x - mean) ** 2 for x in values) / (n - 1)
-    return sqrt(var)
+@router.get("/detailed/all", response_model=DetailedReportsResponse)
+@cached_endpoint("reports.detailed_all")
+async def detailed_all(
+    db: DbSession,
+    current_user: CurrentUser,
+    ticker: Optional[str] = None,
+    side: Optional[TradeSide] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    timeframe: int = 60,  # 60 = 1 hour, 30 = 30 min, 15 = 15 min
+):
+    """Detailed stats, days/times and price/volume breakdowns from a single load of the trades."""
+    trades = await reports_engine.load_trade_arrays(
+        db, _report_filters(current_user.id, ticker, side, start_date, end_date)
+    )
+    monte_carlo = await _significance(current_user, trades, ticker, side, start_date, end_date)
+    return DetailedReportsResponse(
+        stats=reports_engine.detailed_stats(trades, monte_carlo),
+        days_times=reports_engine.days_times(trades, timeframe),
+        price_volume=reports_engine.price_volume(trades),
+    )
 
 
 @router.get("/detailed/stats", response_model=DetailedStatsResponse)
+@cached_endpoint("reports.detailed_stats")
 async def detailed_stats(
     db: DbSession,
     current_user: CurrentUser,
@@ -43,172 +90,17 @@ async def detailed_stats(
 ):
     """Aggregated stats for Reports > Detailed.
 
-    Note: Some fields (MAE/MFE, Probability of Random Chance, K-Ratio) require extra data
-    not present in the current Trade model, so they are returned as null.
+    MAE/MFE average the trades enriched by POST /trades/enrich-excursions (null until any are).
     """
-
-    q = select(Trade).where(Trade.user_id == current_user.id)
-    if ticker:
-        q = q.where(Trade.ticker == ticker.upper())
-    if side:
-        q = q.where(Trade.side == side)
-    if start_date:
-        q = q.where(Trade.date >= start_date)
-    if end_date:
-        q = q.where(Trade.date <= end_date)
-
-    q = q.order_by(Trade.date.asc(), Trade.entry_time.asc())
-
-    res = await db.execute(q)
-    trades = res.scalars().all()
-
-    if not trades:
-        return DetailedStatsResponse()
-
-    pnls = [float(t.pnl) for t in trades]
-    winners = [t for t in trades if t.pnl > 0]
-    losers = [t for t in trades if t.pnl < 0]
-    scratches = [t for t in trades if t.pnl == 0]
-
-    total_gain_loss = sum(pnls)
-    largest_gain = max(pnls) if pnls else 0.0
-    largest_loss = min(pnls) if pnls else 0.0
-
-    # daily
-    by_day: dict[date, list[Trade]] = {}
-    for t in trades:
-        by_day.setdefault(t.date, []).append(t)
-    daily_pnls = [sum(float(x.pnl) for x in day_trades) for day_trades in by_day.values()]
-    avg_daily_gain_loss = sum(daily_pnls) / len(daily_pnls) if daily_pnls else 0.0
-    avg_daily_volume = sum(len(v) for v in by_day.values()) / len(by_day) if by_day else 0.0
-
-    avg_trade_gain_loss = total_gain_loss / len(trades) if trades else 0.0
-    avg_winning_trade = sum(float(t.pnl) for t in winners) / len(winners) if winners else 0.0
-    avg_losing_trade = sum(float(t.pnl) for t in losers) / len(losers) if losers else 0.0
-
-    # per-share gain/loss (avg of pnl/shares)
-    per_share = [float(t.pnl) / float(t.shares) for t in trades if t.shares]
-    avg_per_share_gain_loss = sum(per_share) / len(per_share) if per_share else 0.0
-
-    # hold times
-    def avg_hold(trs: list[Trade]) -> float:
-        vals = [float(t.duration_seconds) for t in trs if t.duration_seconds is not None]
-        return (sum(vals) / len(vals)) if vals else 0.0
-
-    avg_hold_time_scratch = avg_hold(scratches)
-    avg_hold_time_winning = avg_hold(winners)
-    avg_hold_time_losing = avg_hold(losers)
-
-    # streaks
-    max_consecutive_wins = 0
-    max_consecutive_losses = 0
-    cur_w = 0
-    cur_l = 0
-    for t in trades:
-        if t.pnl > 0:
-            cur_w += 1
-            cur_l = 0
-        elif t.pnl < 0:
-            cur_l += 1
-            cur_w = 0
-        else:
-            # scratch resets both
-            cur_w = 0
-            cur_l = 0
-        max_consecutive_wins = max(max_consecutive_wins, cur_w)
-        max_consecutive_losses = max(max_consecutive_losses, cur_l)
-
-    gross_profit = sum(float(t.pnl) for t in winners)
-    gross_loss = abs(sum(float(t.pnl) for t in losers))
-    profit_factor = _safe_div(gross_profit, gross_loss) if gross_loss > 0 else gross_profit
-
-    trade_pnl_std_dev = _stddev(pnls)
-
-    # SQN: mean(R) / std(R) * sqrt(n). Use pnl as a proxy for R until risk is modeled.
-    mean_r = sum(pnls) / len(pnls) if pnls else 0.0
-    std_r = trade_pnl_std_dev
-    sqn = (mean_r / std_r) * sqrt(len(pnls)) if std_r > 0 else 0.0
-
-    # Kelly
-    p = len(winners) / len(trades) if trades else 0.0
-    b = _safe_div(avg_winning_trade, abs(avg_losing_trade)) if avg_losing_trade else 0.0
-    kelly = (p - (1 - p) / b) if b > 0 else 0.0
-
-    total_commissions = sum(float(getattr(t, "commissions", 0.0) or 0.0) for t in trades)
-
-    return DetailedStatsResponse(
-        total_gain_loss=round(total_gain_loss, 2),
-        largest_gain=None if pnls is None else (round(largest_gain, 2) if pnls else 0.0),
-        largest_loss=None if pnls is None else (round(largest_loss, 2) if pnls else 0.0),
-        average_daily_gain_loss=round(avg_daily_gain_loss, 2),
-        average_daily_volume=round(avg_daily_volume, 2),
-        average_per_share_gain_loss=round(avg_per_share_gain_loss, 4),
-        average_trade_gain_loss=round(avg_trade_gain_loss, 2),
-        average_winning_trade=round(avg_winning_trade, 2),
-        average_losing_trade=round(avg_losing_trade, 2),
-        total_number_of_trades=len(trades),
-        number_of_winning_trades=len(winners),
-        number_of_losing_trades=len(losers),
-        average_hold_time_scratch_trades_seconds=round(avg_hold_time_scratch, 2),
-        average_hold_time_winning_trades_seconds=round(avg_hold_time_winning, 2),
-        average_hold_time_losing_trades_seconds=round(avg_hold_time_losing, 2),
-        number_of_scratch_trades=len(scratches),
-        max_consecutive_wins=max_consecutive_wins,
-        max_consecutive_losses=max_consecutive_losses,
-        trade_pnl_standard_deviation=round(trade_pnl_std_dev, 2),
-        system_quality_number_sqn=round(sqn, 2),
-        kelly_percentage=round(kelly * 100, 2),
-        profit_factor=round(profit_factor, 2),
-        total_commissions=round(total_commissions, 2),
-        total_fees=round(total_commissions, 2),
-        # Not available with current data model
-        probability_of_random_chance=None,
-        k_ratio=None,
-        average_position_mae=None,
-        average_position_mfe=None,
+    trades = await reports_engine.load_trade_arrays(
+        db, _report_filters(current_user.id, ticker, side, start_date, end_date)
     )
-
-
-DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-
-# Duration ranges - Intraday vs Multiday (like Tradervue)
-DURATION_RANGES = [
-    (0, 86400, "Intraday"),      # < 1 day (24 hours in seconds)
-    (86400, float("inf"), "Multiday"),  # >= 1 day
-]
-
-# Intraday duration ranges (like Tradervue)
-INTRADAY_DURATION_RANGES = [
-    (0, 60, "< 1:00"),           # < 1 minute
-    (60, 120, "1:00 - 1:59"),    # 1-2 minutes
-    (120, 300, "2:00 - 4:59"),   # 2-5 minutes
-    (300, 600, "5:00 - 9:59"),   # 5-10 minutes
-    (600, 1200, "10:00 - 19:59"),  # 10-20 minutes
-    (1200, 2400, "20:00 - 39:59"),  # 20-40 minutes
-    (2400, 3600, "40:00 - 59:59"),  # 40-60 minutes
-    (3600, 7200, "1:00:00 - 1:59:59"),  # 1-2 hours
-    (7200, 14400, "2:00:00 - 3:59:59"),  # 2-4 hours
-    (14400, float("inf"), "4:00:00 >"),  # 4+ hours
-]
-
-
-def _hour_label(hour: int, minute: int = 0) -> str:
-    """Convert 24h hour and minute to label format like Tradervue (e.g., '6:00', '14:30')."""
-    return f"{hour}:{minute:02d}"
-
-
-def _get_time_slot(hour: int, minute: int, timeframe: int) -> str:
-    """Get the time slot label for a given hour/minute and timeframe (in minutes)."""
-    if timeframe == 60:
-        return f"{hour}:00"
-    else:
-        # Round down to nearest timeframe interval
-        slot_minute = (minute // timeframe) * timeframe
-        return f"{hour}:{slot_minute:02d}"
+    monte_carlo = await _significance(current_user, trades, ticker, side, start_date, end_date)
+    return reports_engine.detailed_stats(trades, monte_carlo)
 
 
 @router.get("/detailed/days-times", response_model=DaysTimesResponse)
+@cached_endpoint("reports.days_times")
 async def days_times_stats(
     db: DbSession,
     current_user: CurrentUser,
@@ -219,203 +111,14 @@ async def days_times_stats(
     timeframe: int = 60,  # 60 = 1 hour, 30 = 30 min, 15 = 15 min
 ):
     """Aggregated stats by day of week and hour of day for charts."""
-
-    # Validate timeframe
-    if timeframe not in (15, 30, 60):
-        timeframe = 60
-
-    q = select(Trade).where(Trade.user_id == current_user.id)
-    if ticker:
-        q = q.where(Trade.ticker == ticker.upper())
-    if side:
-        q = q.where(Trade.side == side)
-    if start_date:
-        q = q.where(Trade.date >= start_date)
-    if end_date:
-        q = q.where(Trade.date <= end_date)
-
-    res = await db.execute(q)
-    trades = res.scalars().all()
-
-    if not trades:
-        return DaysTimesResponse(by_day=[], by_hour=[], by_month=[], by_duration=[], by_intraday_duration=[])
-
-    # Aggregate by day of week (0=Monday, 6=Sunday)
-    day_data: dict[int, dict] = {i: {"pnl": 0.0, "trades": 0, "winners": 0, "losers": 0} for i in range(7)}
-    # Aggregate by time slot (based on timeframe)
-    hour_data: dict[str, dict] = {}  # key is time slot label like "9:00", "9:15", etc.
-    # Aggregate by month (1-12)
-    month_data: dict[int, dict] = {i: {"pnl": 0.0, "trades": 0, "winners": 0, "losers": 0} for i in range(1, 13)}
-    # Aggregate by duration ranges
-    duration_data = {r[2]: {"pnl": 0.0, "trades": 0, "winners": 0, "losers": 0, "min": r[0], "max": r[1]} for r in DURATION_RANGES}
-    intraday_duration_data = {r[2]: {"pnl": 0.0, "trades": 0, "winners": 0, "losers": 0, "min": r[0], "max": r[1]} for r in INTRADAY_DURATION_RANGES}
-
-    for t in trades:
-        pnl = float(t.pnl)
-        is_winner = pnl > 0
-        is_loser = pnl < 0
-
-        # Day of week from trade date
-        dow = t.date.weekday()  # 0=Monday
-        day_data[dow]["pnl"] += pnl
-        day_data[dow]["trades"] += 1
-        if is_winner:
-            day_data[dow]["winners"] += 1
-        elif is_loser:
-            day_data[dow]["losers"] += 1
-
-        # Month from trade date
-        month = t.date.month  # 1-12
-        month_data[month]["pnl"] += pnl
-        month_data[month]["trades"] += 1
-        if is_winner:
-            month_data[month]["winners"] += 1
-        elif is_loser:
-            month_data[month]["losers"] += 1
-
-        # Time slot from entry_time (based on timeframe)
-        if t.entry_time:
-            slot_label = _get_time_slot(t.entry_time.hour, t.entry_time.minute, timeframe)
-            if slot_label not in hour_data:
-                hour_data[slot_label] = {"pnl": 0.0, "trades": 0, "winners": 0, "losers": 0, "hour": t.entry_time.hour, "minute": (t.entry_time.minute // timeframe) * timeframe}
-            hour_data[slot_label]["pnl"] += pnl
-            hour_data[slot_label]["trades"] += 1
-            if is_winner:
-                hour_data[slot_label]["winners"] += 1
-            elif is_loser:
-                hour_data[slot_label]["losers"] += 1
-
-        # Duration
-        if t.duration_seconds is not None:
-            dur = float(t.duration_seconds)
-            # Find duration bucket
-            for min_d, max_d, label in DURATION_RANGES:
-                if min_d <= dur < max_d:
-                    duration_data[label]["pnl"] += pnl
-                    duration_data[label]["trades"] += 1
-                    if is_winner:
-                        duration_data[label]["winners"] += 1
-                    elif is_loser:
-                        duration_data[label]["losers"] += 1
-                    break
-            # Intraday duration bucket
-            for min_d, max_d, label in INTRADAY_DURATION_RANGES:
-                if min_d <= dur < max_d:
-                    intraday_duration_data[label]["pnl"] += pnl
-                    intraday_duration_data[label]["trades"] += 1
-                    if is_winner:
-                        intraday_duration_data[label]["winners"] += 1
-                    elif is_loser:
-                        intraday_duration_data[label]["losers"] += 1
-                    break
-
-    # Build response
-    by_day = []
-    for i in range(7):
-        d = day_data[i]
-        win_rate = _safe_div(d["winners"], d["trades"]) * 100 if d["trades"] > 0 else 0.0
-        by_day.append(DayStats(
-            day_index=i,
-            day_name=DAY_NAMES[i],
-            total_pnl=round(d["pnl"], 2),
-            trades=d["trades"],
-            winners=d["winners"],
-            losers=d["losers"],
-            win_rate=round(win_rate, 1),
-        ))
-
-    by_hour = []
-    # Sort time slots by hour and minute
-    sorted_slots = sorted(hour_data.items(), key=lambda x: (x[1]["hour"], x[1]["minute"]))
-    for slot_label, h in sorted_slots:
-        if h["trades"] > 0:  # Only include slots with trades
-            win_rate = _safe_div(h["winners"], h["trades"]) * 100
-            by_hour.append(HourStats(
-                hour=h["hour"],
-                hour_label=slot_label,
-                total_pnl=round(h["pnl"], 2),
-                trades=h["trades"],
-                winners=h["winners"],
-                losers=h["losers"],
-                win_rate=round(win_rate, 1),
-            ))
-
-    by_month = []
-    for i in range(1, 13):
-        m = month_data[i]
-        win_rate = _safe_div(m["winners"], m["trades"]) * 100 if m["trades"] > 0 else 0.0
-        by_month.append(MonthStats(
-            month=i,
-            month_name=MONTH_NAMES[i - 1],
-            total_pnl=round(m["pnl"], 2),
-            trades=m["trades"],
-            winners=m["winners"],
-            losers=m["losers"],
-            win_rate=round(win_rate, 1),
-        ))
-
-    by_duration = []
-    for min_d, max_d, label in DURATION_RANGES:
-        d = duration_data[label]
-        if d["trades"] > 0:
-            win_rate = _safe_div(d["winners"], d["trades"]) * 100
-            by_duration.append(DurationStats(
-                range_label=label,
-                min_seconds=int(min_d),
-                max_seconds=int(max_d) if max_d != float("inf") else 999999999,
-                total_pnl=round(d["pnl"], 2),
-                trades=d["trades"],
-                winners=d["winners"],
-                losers=d["losers"],
-                win_rate=round(win_rate, 1),
-            ))
-
-    by_intraday_duration = []
-    for min_d, max_d, label in INTRADAY_DURATION_RANGES:
-        d = intraday_duration_data[label]
-        if d["trades"] > 0:
-            win_rate = _safe_div(d["winners"], d["trades"]) * 100
-            by_intraday_duration.append(DurationStats(
-                range_label=label,
-                min_seconds=int(min_d),
-                max_seconds=int(max_d) if max_d != float("inf") else 999999999,
-                total_pnl=round(d["pnl"], 2),
-                trades=d["trades"],
-                winners=d["winners"],
-                losers=d["losers"],
-                win_rate=round(win_rate, 1),
-            ))
-
-    return DaysTimesResponse(
-        by_day=by_day,
-        by_hour=by_hour,
-        by_month=by_month,
-        by_duration=by_duration,
-        by_intraday_duration=by_intraday_duration,
+    trades = await reports_engine.load_trade_arrays(
+        db, _report_filters(current_user.id, ticker, side, start_date, end_date)
     )
-
-
-# Price ranges for grouping
-PRICE_RANGES = [
-    (0, 10, "$0-10"),
-    (10, 25, "$10-25"),
-    (25, 50, "$25-50"),
-    (50, 100, "$50-100"),
-    (100, 250, "$100-250"),
-    (250, float("inf"), "$250+"),
-]
-
-# Volume/shares ranges for grouping
-VOLUME_RANGES = [
-    (1, 100, "1-100"),
-    (100, 500, "100-500"),
-    (500, 1000, "500-1K"),
-    (1000, 5000, "1K-5K"),
-    (5000, float("inf"), "5K+"),
-]
+    return reports_engine.days_times(trades, timeframe)
 
 
 @router.get("/detailed/price-volume", response_model=PriceVolumeResponse)
+@cached_endpoint("reports.price_volume")
 async def price_volume_stats(
     db: DbSession,
     current_user: CurrentUser,
@@ -425,89 +128,107 @@ async def price_volume_stats(
     end_date: Optional[date] = None,
 ):
     """Aggregated stats by entry price and volume/shares for charts."""
+    trades = await reports_engine.load_trade_arrays(
+        db, _report_filters(current_user.id, ticker, side, start_date, end_date)
+    )
+    return reports_engine.price_volume(trades)
 
-    q = select(Trade).where(Trade.user_id == current_user.id)
-    if ticker:
-        q = q.where(Trade.ticker == ticker.upper())
-    if side:
-        q = q.where(Trade.side == side)
-    if start_date:
-        q = q.where(Trade.date >= start_date)
-    if end_date:
-        q = q.where(Trade.date <= end_date)
-
-    res = await db.execute(q)
-    trades = res.scalars().all()
-
-    if not trades:
-        return PriceVolumeResponse(by_price=[], by_volume=[])
-
-    # Initialize price range buckets
-    price_data = {r[2]: {"pnl": 0.0, "trades": 0, "winners": 0, "losers": 0, "min": r[0], "max": r[1]}
-                  for r in PRICE_RANGES}
-
-    # Initialize volume range buckets
-    volume_data = {r[2]: {"pnl": 0.0, "trades": 0, "winners": 0, "losers": 0, "min": r[0], "max": r[1]}
-                   for r in VOLUME_RANGES}
-
-    for t in trades:
-        entry_price = float(t.entry_price)
-        shares = int(t.shares)
-        pnl = float(t.pnl)
 
-        # Find price range
-        for min_p, max_p, label in PRICE_RANGES:
-            if min_p <= entry_price < max_p:
-                price_data[label]["pnl"] += pnl
-                price_data[label]["trades"] += 1
-                if pnl > 0:
-                    price_data[label]["winners"] += 1
-                elif pnl < 0:
-                    price_data[label]["losers"] += 1
-                break
+@router.get("/buckets", response_model=BucketsResponse)
+@cached_endpoint("reports.buckets")
+async def bucket_stats(
+    db: DbSession,
+    current_user: CurrentUser,
+    dimension: Literal["price", "volume", "duration", "time"],
+    edges: Optional[str] = Query(None, description="Comma-separated bucket edges for price/volume/duration"),
+    slot_minutes: int = Query(trade_buckets.DEFAULT_SLOT_MINUTES, description="Slot width for time"),
+    start_time: Optional[time] = None,
+    end_time: Optional[time] = None,
+    ticker: Optional[str] = None,
+    side: Optional[TradeSide] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    """Stats grouped by custom edges (e.g. edges=0,1,2,5 for price) or time-of-day slots (e.g. slot_minutes=5)."""
+    filters = _report_filters(current_user.id, ticker, side, start_date, end_date)
+    try:
+        if dimension == "time":
+            buckets = await trade_buckets.time_slot_buckets(db, filters, slot_minutes, start_time, end_time)
+        else:
+            parsed = trade_buckets.parse_edges(edges, dimension)
+            buckets = await trade_buckets.edge_buckets(db, filters, dimension, parsed)
+    except trade_buckets.InvalidBucketsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return BucketsResponse(
+        dimension=dimension,
+        buckets=[
+            BucketStats(
+                range_label=b.label,
+                lower=b.lower,
+                upper=b.upper,
+                total_pnl=round(b.total_pnl, 2),
+                trades=b.trades,
+                winners=b.winners,
+                losers=b.losers,
+                win_rate=round(b.winners / b.trades * 100, 1),
+            )
+            for b in buckets
+        ],
+    )
 
-        # Find volume range
-        for min_v, max_v, label in VOLUME_RANGES:
-            if min_v <= shares < max_v:
-                volume_data[label]["pnl"] += pnl
-                volume_data[label]["trades"] += 1
-                if pnl > 0:
-                    volume_data[label]["winners"] += 1
-                elif pnl < 0:
-                    volume_data[label]["losers"] += 1
-                break
 
-    # Build response - only include ranges with trades
-    by_price = []
-    for min_p, max_p, label in PRICE_RANGES:
-        d = price_data[label]
-        if d["trades"] > 0:
-            win_rate = _safe_div(d["winners"], d["trades"]) * 100
-            by_price.append(PriceRangeStats(
-                range_label=label,
-                min_price=min_p,
-                max_price=max_p if max_p != float("inf") else 999999,
-                total_pnl=round(d["pnl"], 2),
-                trades=d["trades"],
-                winners=d["winners"],
-                losers=d["losers"],
-                win_rate=round(win_rate, 1),
-            ))
+@router.get("/equity-curve", response_model=EquityCurveResponse)
+@cached_endpoint("reports.equity_curve")
+async def get_equity_curve(
+    db: DbSession,
+    current_user: CurrentUser,
+    granularity: Literal["trade", "day"] = "trade",
+    points: Optional[int] = Query(None, ge=3, le=10000, description="Downsample the series to this many points (LTTB)"),
+    ticker: Optional[str] = None,
+    side: Optional[TradeSide] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    """Cumulative P&L and drawdown series with max drawdown stats (computed on the full series)."""
+    series = await equity_curve.load_equity_series(
+        db, _report_filters(current_user.id, ticker, side, start_date, end_date), granularity
+    )
+    if not len(series):
+        return EquityCurveResponse(granularity=granularity, total_points=0)
 
-    by_volume = []
-    for min_v, max_v, label in VOLUME_RANGES:
-        d = volume_data[label]
-        if d["trades"] > 0:
-            win_rate = _safe_div(d["winners"], d["trades"]) * 100
-            by_volume.append(VolumeRangeStats(
-                range_label=label,
-                min_shares=min_v,
-                max_shares=int(max_v) if max_v != float("inf") else 999999,
-                total_pnl=round(d["pnl"], 2),
-                trades=d["trades"],
-                winners=d["winners"],
-                losers=d["losers"],
-                win_rate=round(win_rate, 1),
-            ))
+    stats = equity_curve.drawdown_stats(series)
 
-    return PriceVolumeResponse(by_price=by_price, by_volume=by_volume)
+    if points and points < len(series):
+        x = (
+            np.array([d.toordinal() for d in series.date], dtype=np.float64)
+            if granularity == "day" else np.arange(len(series), dtype=np.float64)
+        )
+        kept = equity_curve.lttb(x, series.equity, points)
+    else:
+        kept = range(len(series))
+
+    return EquityCurveResponse(
+        granularity=granularity,
+        total_points=len(series),
+        points=[
+            EquityPoint(
+                date=series.date[i],
+                entry_time=series.entry_time[i],
+                trade_id=series.trade_id[i],
+                pnl=round(float(series.pnl[i]), 2),
+                equity=round(float(series.equity[i]), 2),
+                drawdown=round(float(series.drawdown[i]), 2),
+            )
+            for i in kept
+        ],
+        final_equity=round(float(series.equity[-1]), 2),
+        peak_equity=round(float(series.peak.max()), 2),
+        max_drawdown=stats.max_drawdown,
+        max_drawdown_pct=stats.max_drawdown_pct,
+        max_drawdown_peak_date=stats.max_drawdown_peak_date,
+        max_drawdown_trough_date=stats.max_drawdown_trough_date,
+        max_drawdown_recovery_date=stats.max_drawdown_recovery_date,
+        longest_drawdown_days=stats.longest_drawdown_days,
+        current_drawdown=stats.current_drawdown,
+    )
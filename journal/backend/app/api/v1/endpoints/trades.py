@@ -1,50 +1,146 @@
-from datetime import date, datetime, time
-from fastapi import APIRouter, HTTPException, status, UploadFile, File, Query
-from sqlalchemy import select, delete
+import os
+from datetime import date
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Response, status, UploadFile, File, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, delete, func
 from sqlalchemy.orm import selectinload
-import pandas as pd
-import io
 
 from app.api.deps import DbSession, CurrentUser
+from app.core.cache import bump_data_version
+from app.core.config import get_settings
+from app.core.pagination import encode_trade_cursor, trades_after
 from app.models.trade import Trade, TradeSide
 from app.models.tag import Tag
-from app.schemas.trade import TradeCreate, TradeUpdate, TradeResponse
+from app.models.import_job import ImportJob
+from app.schemas.trade import (
+    TradeCreate, TradeUpdate, TradeResponse, TradeSelection, TradeBulkUpdate, TradeBulkTags, TradeBulkDelete,
+)
+from app.schemas.import_job import ImportJobResponse
+from app.services.trade_import import (
+    DAS_DATE_REQUIRED, read_header, read_trades_file, is_das_format, resolve_trade_date, prepare_trades,
+    frame_to_rows, bulk_insert_trades,
+)
+from app.services.import_jobs import spool_upload, run_import_job, rows_per_second
+from app.services import trade_bulk, trade_excursions, trade_maintenance, trade_rollup
+from app.services.trade_export import EXPORT_FORMATS, stream_trades
 
 router = APIRouter()
+settings = get_settings()
+
+
+def _trade_filters(
+    user_id: int,
+    ticker: str | None,
+    side: TradeSide | None,
+    start_date: date | None,
+    end_date: date | None,
+) -> list:
+    """WHERE clauses shared by the trade listing and export endpoints."""
+    filters = [Trade.user_id == user_id]
+
+    if ticker:
+        filters.append(Trade.ticker == ticker.upper())
+    if side:
+        filters.append(Trade.side == side)
+    if start_date:
+        filters.append(Trade.date >= start_date)
+    if end_date:
+        filters.append(Trade.date <= end_date)
+
+    return filters
+
+
+def _selection_filters(user_id: int, selection: TradeSelection) -> list:
+    """WHERE clauses for a bulk operation's selection. Refuses an empty selection."""
+    if selection.ids is None and not any(
+        (selection.ticker, selection.side, selection.start_date, selection.end_date)
+    ):
+        raise HTTPException(status_code=400, detail="Select trades by ids or at least one filter")
+
+    filters = _trade_filters(user_id, selection.ticker, selection.side, selection.start_date, selection.end_date)
+    if selection.ids is not None:
+        filters.append(Trade.id.in_(selection.ids))
+    return filters
+
+
+async def _validated_tag_ids(db, user_id: int, tag_ids: list[int]) -> list[int]:
+    try:
+        return await trade_bulk.validate_tag_ids(db, user_id, tag_ids)
+    except trade_bulk.UnknownTagsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/", response_model=list[TradeResponse])
 async def get_trades(
     db: DbSession,
     current_user: CurrentUser,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    after: str | None = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     ticker: str | None = None,
     side: TradeSide | None = None,
     start_date: date | None = None,
     end_date: date | None = None,
 ):
-    """Get all trades for current user with optional filters"""
-    query = select(Trade).where(Trade.user_id == current_user.id)
+    """
+    Get all trades for current user with optional filters.
 
-    if ticker:
-        query = query.where(Trade.ticker == ticker.upper())
-    if side:
-        query = query.where(Trade.side == side)
-    if start_date:
-        query = query.where(Trade.date >= start_date)
-    if end_date:
-        query = query.where(Trade.date <= end_date)
+    Pages with `after` instead of `skip` stay index-backed at any depth. The cursor for the
+    next page is returned in X-Next-Cursor (absent on the last page), and the first page
+    (no `after`) carries the filtered total in X-Total-Count.
+    """
+    filters = _trade_filters(current_user.id, ticker, side, start_date, end_date)
 
-    query = query.order_by(Trade.date.desc(), Trade.entry_time.desc())
-    query = query.offset(skip).limit(limit)
+    query = select(Trade).where(*filters)
+    if after:
+        try:
+            query = query.where(trades_after(after))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # Matches ix_trades_user_date_time_id
+    query = query.order_by(Trade.date.desc(), Trade.entry_time.desc(), Trade.id.desc())
+    query = query.offset(skip).limit(limit + 1)
 
     result = await db.execute(query)
     trades = result.scalars().all()
 
+    if len(trades) > limit:
+        trades = trades[:limit]
+        response.headers["X-Next-Cursor"] = encode_trade_cursor(trades[-1])
+
+    # Count once per listing rather than on every page
+    if not after:
+        total = await db.scalar(select(func.count()).select_from(Trade).where(*filters))
+        response.headers["X-Total-Count"] = str(total)
+
     return trades
 
 
+@router.get("/export")
+async def export_trades(
+    current_user: CurrentUser,
+    format: str = Query("csv", description="csv, ndjson or parquet"),
+    ticker: str | None = None,
+    side: TradeSide | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+):
+    """Export all trades matching the filters, streamed in batches"""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format. Use one of: {', '.join(EXPORT_FORMATS)}")
+
+    media_type, extension = EXPORT_FORMATS[format]
+    filters = _trade_filters(current_user.id, ticker, side, start_date, end_date)
+
+    return StreamingResponse(
+        stream_trades(filters, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="trades.{extension}"'},
+    )
+
+
 @router.post("/", response_model=TradeResponse, status_code=status.HTTP_201_CREATED)
 async def create_trade(trade_data: TradeCreate, db: DbSession, current_user: CurrentUser):
     """Create a new trade"""
@@ -70,7 +166,12 @@ async def create_trade(trade_data: TradeCreate, db: DbSession, current_user: Cur
         setup=trade_data.setup,
     )
 
+    tag_ids = await _validated_tag_ids(db, current_user.id, trade_data.tag_ids)
+
     db.add(trade)
+    await db.flush()
+    await trade_bulk.add_tags(db, [Trade.id == trade.id], tag_ids)
+    await trade_rollup.refresh_rollup(db, current_user.id, [trade.date])
     await db.commit()
     await db.refresh(trade)
 
@@ -108,10 +209,14 @@ async def update_trade(
         raise HTTPException(status_code=404, detail="Trade not found")
 
     update_data = trade_data.model_dump(exclude_unset=True)
+    old_date = trade.date
+
+    tag_ids = update_data.pop("tag_ids", None)
+    if tag_ids is not None:
+        tag_ids = await _validated_tag_ids(db, current_user.id, tag_ids)
+        await trade_bulk.set_tags(db, [Trade.id == trade.id, Trade.user_id == current_user.id], tag_ids)
 
     for field, value in update_data.items():
-        if field == "tag_ids":
-            continue
         if field == "ticker" and value:
             value = value.upper()
         setattr(trade, field, value)
@@ -120,6 +225,12 @@ async def update_trade(
     if "pnl" in update_data or "commissions" in update_data:
         trade.net_pnl = trade.pnl - trade.commissions
 
+    # Price path changed: enrich again on the next MAE/MFE run
+    if trade_excursions.PRICE_PATH_FIELDS & update_data.keys():
+        trade.excursions_at = None
+
+    await db.flush()
+    await trade_rollup.refresh_rollup(db, current_user.id, {old_date, trade.date})
     await db.commit()
     await db.refresh(trade)
 
@@ -138,109 +249,78 @@ async def delete_trade(trade_id: int, db: DbSession, current_user: CurrentUser):
         raise HTTPException(status_code=404, detail="Trade not found")
 
     await db.delete(trade)
+    await db.flush()
+    await trade_rollup.refresh_rollup(db, current_user.id, [trade.date])
     await db.commit()
 
 
-def _is_tradervue_format(df: pd.DataFrame) -> bool:
-    """Check if the dataframe is in Tradervue execution format."""
-    cols = set(df.columns)
-    # Tradervue has: Date, Time, Symbol, Quantity, Price, Side
-    # But NOT entry_price/exit_price (those are complete trade formats)
-    has_tradervue_cols = {"symbol", "price", "quantity", "side"}.issubset(cols)
-    has_trade_cols = "entry_price" in cols or "exit_price" in cols
-    return has_tradervue_cols and not has_trade_cols
+@router.post("/bulk/update", response_model=dict)
+async def bulk_update_trades(data: TradeBulkUpdate, db: DbSession, current_user: CurrentUser):
+    """Set the same fields on many trades at once"""
+    changes = data.changes.model_dump(exclude_unset=True)
+    if not changes:
+        raise HTTPException(status_code=400, detail="No changes given")
 
+    filters = _selection_filters(current_user.id, data.selection)
+    dates = await trade_rollup.trade_dates(db, filters)
+    if trade_excursions.PRICE_PATH_FIELDS & changes.keys():
+        changes["excursions_at"] = None
+    updated_count = await trade_bulk.update_trades(db, filters, changes)
+    await trade_rollup.refresh_rollup(db, current_user.id, dates)
+    await db.commit()
 
-def _process_tradervue_executions(df: pd.DataFrame) -> list[dict]:
-    """
-    Convert Tradervue executions into complete trades.
-    Tradervue format: Date, Time, Symbol, Quantity, Price, Side
-    Side values: B (buy), S (sell), SS (sell short), BC (buy to cover)
-    """
-    trades = []
-
-    # Group by Symbol and Date to find matching entries/exits
-    for (symbol, trade_date), group in df.groupby(["symbol", "date"]):
-        # Separate entries and exits
-        # Long entries: B (buy) | Long exits: S (sell)
-        # Short entries: SS (sell short) | Short exits: BC (buy to cover)
-        entries = []
-        exits = []
-
-        for _, row in group.iterrows():
-            side = str(row["side"]).upper().strip()
-            qty = abs(int(float(row.get("quantity", 0))))
-            price = float(row.get("price", 0))
-            exec_time = row.get("time")
-            # Handle NaN values for optional fee columns
-            comm = float(row.get("commission", 0)) if pd.notna(row.get("commission")) else 0
-            transfee = float(row.get("transfee", 0)) if pd.notna(row.get("transfee")) else 0
-            ecnfee = float(row.get("ecnfee", 0)) if pd.notna(row.get("ecnfee")) else 0
-            commission = comm + transfee + ecnfee
-
-            if side in ("B", "BUY"):  # Long entry
-                entries.append({"qty": qty, "price": price, "time": exec_time, "comm": commission, "type": "long"})
-            elif side in ("S", "SELL"):  # Long exit
-                exits.append({"qty": qty, "price": price, "time": exec_time, "comm": commission, "type": "long"})
-            elif side in ("SS", "SELLSHORT", "SHORT"):  # Short entry
-                entries.append({"qty": qty, "price": price, "time": exec_time, "comm": commission, "type": "short"})
-            elif side in ("BC", "BUYTOCOVER", "COVER"):  # Short exit
-                exits.append({"qty": qty, "price": price, "time": exec_time, "comm": commission, "type": "short"})
-
-        # Match entries with exits to create trades
-        # Simple FIFO matching by type
-        for trade_type in ["long", "short"]:
-            type_entries = [e for e in entries if e["type"] == trade_type]
-            type_exits = [e for e in exits if e["type"] == trade_type]
-
-            if not type_entries or not type_exits:
-                continue
-
-            # Calculate weighted average entry and exit prices
-            total_entry_qty = sum(e["qty"] for e in type_entries)
-            total_exit_qty = sum(e["qty"] for e in type_exits)
-            shares = min(total_entry_qty, total_exit_qty)
-
-            if shares <= 0:
-                continue
-
-            avg_entry = sum(e["qty"] * e["price"] for e in type_entries) / total_entry_qty
-            avg_exit = sum(e["qty"] * e["price"] for e in type_exits) / total_exit_qty
-            total_comm = sum(e["comm"] for e in type_entries) + sum(e["comm"] for e in type_exits)
-
-            # Calculate P&L
-            if trade_type == "long":
-                pnl = (avg_exit - avg_entry) * shares
-            else:
-                pnl = (avg_entry - avg_exit) * shares
-
-            # Get times
-            entry_time = type_entries[0]["time"] if type_entries else None
-            exit_time = type_exits[-1]["time"] if type_exits else None
-
-            trades.append({
-                "date": trade_date,
-                "ticker": symbol,
-                "side": trade_type,
-                "entry_price": avg_entry,
-                "exit_price": avg_exit,
-                "shares": shares,
-                "pnl": pnl,
-                "commissions": total_comm,
-                "entry_time": entry_time,
-                "exit_time": exit_time,
-            })
+    return {
+        "message": f"Successfully updated {updated_count} trades",
+        "trades_updated": updated_count
+    }
 
-    return trades
+
+@router.post("/bulk/tags", response_model=dict)
+async def bulk_tag_trades(data: TradeBulkTags, db: DbSession, current_user: CurrentUser):
+    """Assign and/or remove tags on many trades at once"""
+    filters = _selection_filters(current_user.id, data.selection)
+    add_ids = await _validated_tag_ids(db, current_user.id, data.add_tag_ids)
+    remove_ids = await _validated_tag_ids(db, current_user.id, data.remove_tag_ids)
+
+    removed = await trade_bulk.remove_tags(db, filters, remove_ids)
+    added = await trade_bulk.add_tags(db, filters, add_ids)
+    await bump_data_version(db, current_user.id)
+    await db.commit()
+
+    return {
+        "message": f"Added {added} and removed {removed} tag assignments",
+        "tags_added": added,
+        "tags_removed": removed
+    }
+
+
+@router.post("/bulk/delete", response_model=dict)
+async def bulk_delete_trades(data: TradeBulkDelete, db: DbSession, current_user: CurrentUser):
+    """Delete many trades at once, by ids or by filter"""
+    filters = _selection_filters(current_user.id, data.selection)
+    dates = await trade_rollup.trade_dates(db, filters)
+    deleted_count = await trade_bulk.delete_trades(db, filters)
+    await trade_rollup.refresh_rollup(db, current_user.id, dates)
+    await db.commit()
+
+    return {
+        "message": f"Successfully deleted {deleted_count} trades",
+        "trades_deleted": deleted_count
+    }
 
 
 @router.post("/import", response_model=dict)
 async def import_trades(
     db: DbSession,
     current_user: CurrentUser,
-    file: UploadFile = File(...)
+    file: UploadFile = File(...),
+    trade_date: date | None = Query(None, description="Trade date for DAS Trader files (defaults to a date in the filename)"),
+    update_existing: bool = Query(False, description="Refresh P&L and commissions of trades that were already imported")
 ):
-    """Import trades from CSV or Excel file. Supports both complete trades and Tradervue execution format."""
+    """
+    Import trades from CSV or Excel file. Supports complete trades and Tradervue/DAS Trader executions.
+    Trades that were already imported are skipped, so overlapping exports can be re-imported.
+    """
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
 
@@ -255,154 +335,21 @@ async def import_trades(
     try:
         contents = await file.read()
 
-        # Parse file
-        if filename.endswith(".csv"):
-            df = pd.read_csv(io.BytesIO(contents))
-        else:
-            df = pd.read_excel(io.BytesIO(contents))
-
-        # Normalize column names
-        df.columns = df.columns.str.strip().str.lower()
-
-        # Map common column names (keeping original for mapping)
-        column_mapping = {
-            "stock": "ticker",
-            "direction": "side",
-            "type": "side",
-            "entry": "entry_price",
-            "exit": "exit_price",
-            "qty": "shares",
-            "profit": "pnl",
-            "p&l": "pnl",
-            "profit/loss": "pnl",
-            "fees": "commissions",
-            "commission": "commissions",
-        }
+        # Parse file and normalize all rows in one vectorized pass
+        df = read_trades_file(contents, filename, current_user.id)
+        trades_df, errors = prepare_trades(df, trade_date, file.filename)
 
-        df = df.rename(columns=column_mapping)
-
-        trades_created = 0
-        errors = []
-
-        # Check if this is Tradervue execution format
-        if _is_tradervue_format(df):
-            # Parse dates first for grouping
-            if "date" in df.columns:
-                df["date"] = pd.to_datetime(df["date"]).dt.date
-
-            # Process executions into trades
-            trade_dicts = _process_tradervue_executions(df)
-
-            for trade_dict in trade_dicts:
-                try:
-                    entry_time = None
-                    exit_time = None
-                    if trade_dict.get("entry_time") and pd.notna(trade_dict["entry_time"]):
-                        entry_time = pd.to_datetime(str(trade_dict["entry_time"])).time()
-                    if trade_dict.get("exit_time") and pd.notna(trade_dict["exit_time"]):
-                        exit_time = pd.to_datetime(str(trade_dict["exit_time"])).time()
-
-                    # Calculate duration_seconds from entry and exit times
-                    duration_seconds = None
-                    if entry_time and exit_time:
-                        entry_dt = datetime.combine(trade_dict["date"], entry_time)
-                        exit_dt = datetime.combine(trade_dict["date"], exit_time)
-                        duration_seconds = int((exit_dt - entry_dt).total_seconds())
-                        if duration_seconds < 0:
-                            duration_seconds = None  # Handle overnight trades
-
-                    trade = Trade(
-                        user_id=current_user.id,
-                        date=trade_dict["date"],
-                        ticker=str(trade_dict["ticker"]).upper().strip(),
-                        side=TradeSide.SHORT if trade_dict["side"] == "short" else TradeSide.LONG,
-                        entry_time=entry_time,
-                        exit_time=exit_time,
-                        duration_seconds=duration_seconds,
-                        entry_price=trade_dict["entry_price"],
-                        exit_price=trade_dict["exit_price"],
-                        shares=trade_dict["shares"],
-                        pnl=trade_dict["pnl"],
-                        commissions=trade_dict["commissions"],
-                        net_pnl=trade_dict["pnl"] - trade_dict["commissions"],
-                    )
-
-                    db.add(trade)
-                    trades_created += 1
-                except Exception as e:
-                    errors.append(f"Trade {trade_dict.get('ticker', 'unknown')}: {str(e)}")
-        else:
-            # Original complete trade format
-            # Map symbol to ticker if present
-            if "symbol" in df.columns and "ticker" not in df.columns:
-                df = df.rename(columns={"symbol": "ticker"})
-            if "quantity" in df.columns and "shares" not in df.columns:
-                df = df.rename(columns={"quantity": "shares"})
-
-            for idx, row in df.iterrows():
-                try:
-                    # Parse date
-                    trade_date = pd.to_datetime(row.get("date")).date() if "date" in row else date.today()
-
-                    # Parse side
-                    side_str = str(row.get("side", "long")).lower()
-                    side = TradeSide.SHORT if "short" in side_str else TradeSide.LONG
-
-                    # Parse times
-                    entry_time = None
-                    exit_time = None
-                    if "entry_time" in row and pd.notna(row["entry_time"]):
-                        entry_time = pd.to_datetime(str(row["entry_time"])).time()
-                    if "exit_time" in row and pd.notna(row["exit_time"]):
-                        exit_time = pd.to_datetime(str(row["exit_time"])).time()
-
-                    # Calculate duration_seconds from entry and exit times
-                    duration_seconds = None
-                    if entry_time and exit_time:
-                        entry_dt = datetime.combine(trade_date, entry_time)
-                        exit_dt = datetime.combine(trade_date, exit_time)
-                        duration_seconds = int((exit_dt - entry_dt).total_seconds())
-                        if duration_seconds < 0:
-                            duration_seconds = None  # Handle overnight trades
-
-                    # Get numeric values
-                    entry_price = float(row.get("entry_price", 0))
-                    exit_price = float(row.get("exit_price", 0))
-                    shares = int(float(row.get("shares", 0)))
-                    pnl = float(row.get("pnl", 0))
-                    commissions = float(row.get("commissions", 0)) if "commissions" in row else 0
-
-                    # Skip invalid rows
-                    if not row.get("ticker") or shares <= 0:
-                        continue
-
-                    trade = Trade(
-                        user_id=current_user.id,
-                        date=trade_date,
-                        ticker=str(row["ticker"]).upper().strip(),
-                        side=side,
-                        entry_time=entry_time,
-                        exit_time=exit_time,
-                        duration_seconds=duration_seconds,
-                        entry_price=entry_price,
-                        exit_price=exit_price,
-                        shares=shares,
-                        pnl=pnl,
-                        commissions=commissions,
-                        net_pnl=pnl - commissions,
-                    )
-
-                    db.add(trade)
-                    trades_created += 1
-
-                except Exception as e:
-                    errors.append(f"Row {idx + 1}: {str(e)}")
+        # Single bulk write instead of one ORM object per row
+        rows = frame_to_rows(trades_df, current_user.id)
+        trades_created = await bulk_insert_trades(db, rows, update_existing)
+        await trade_rollup.refresh_rollup(db, current_user.id, {row["date"] for row in rows})
 
         await db.commit()
 
         return {
             "message": f"Successfully imported {trades_created} trades",
             "trades_created": trades_created,
+            "duplicates": len(rows) - trades_created,
             "errors": errors[:10] if errors else []  # Return first 10 errors
         }
 
@@ -410,34 +357,154 @@ async def import_trades(
         raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
 
 
+@router.post("/import/jobs", response_model=ImportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_import_job(
+    db: DbSession,
+    current_user: CurrentUser,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    trade_date: date | None = Query(None, description="Trade date for DAS Trader files (defaults to a date in the filename)")
+):
+    """Start a background import for a large file. Poll GET /trades/import/{job_id} for progress."""
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No file provided")
+
+    filename = file.filename.lower()
+    if not (filename.endswith(".csv") or filename.endswith(".xlsx") or filename.endswith(".xls")):
+        raise HTTPException(
+            status_code=400,
+            detail="File must be CSV or Excel format"
+        )
+
+    path = await spool_upload(file, filename)
+
+    # A DAS export without a date would only fail in the background job
+    if resolve_trade_date(trade_date, file.filename) is None:
+        try:
+            is_das = is_das_format(read_header(path, filename))
+        except Exception as e:
+            os.unlink(path)
+            raise HTTPException(status_code=400, detail=f"Error processing file: {str(e)}")
+        if is_das:
+            os.unlink(path)
+            raise HTTPException(status_code=400, detail=DAS_DATE_REQUIRED)
+
+    job = ImportJob(
+        user_id=current_user.id,
+        filename=file.filename,
+        chunk_size=settings.IMPORT_CHUNK_SIZE,
+        trade_date=trade_date,
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+
+    background_tasks.add_task(run_import_job, job.id, path)
+
+    return ImportJobResponse.model_validate(job)
+
+
+@router.get("/import/{job_id}", response_model=ImportJobResponse)
+async def get_import_job(job_id: int, db: DbSession, current_user: CurrentUser):
+    """Get the status and progress of an import job"""
+    result = await db.execute(
+        select(ImportJob).where(ImportJob.id == job_id, ImportJob.user_id == current_user.id)
+    )
+    job = result.scalar_one_or_none()
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+
+    response = ImportJobResponse.model_validate(job)
+    response.rows_per_second = rows_per_second(job)
+    return response
+
+
 @router.delete("/", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_all_trades(db: DbSession, current_user: CurrentUser):
     """Delete all trades for current user"""
     await db.execute(delete(Trade).where(Trade.user_id == current_user.id))
+    await trade_rollup.refresh_rollup(db, current_user.id)
     await db.commit()
 
 
 @router.post("/recalculate-durations", response_model=dict)
 async def recalculate_durations(db: DbSession, current_user: CurrentUser):
     """Recalculate duration_seconds for all trades that have entry_time and exit_time."""
-    result = await db.execute(
-        select(Trade).where(Trade.user_id == current_user.id)
-    )
-    trades = result.scalars().all()
+    updated_count = await trade_maintenance.recalculate_durations(db, current_user.id)
+    if updated_count:
+        await trade_rollup.refresh_rollup(db, current_user.id)
+    await db.commit()
 
-    updated_count = 0
-    for trade in trades:
-        if trade.entry_time and trade.exit_time and trade.duration_seconds is None:
-            entry_dt = datetime.combine(trade.date, trade.entry_time)
-            exit_dt = datetime.combine(trade.date, trade.exit_time)
-            duration = int((exit_dt - entry_dt).total_seconds())
-            if duration >= 0:
-                trade.duration_seconds = duration
-                updated_count += 1
+    return {
+        "message": f"Successfully recalculated durations for {updated_count} trades",
+        "trades_updated": updated_count
+    }
 
+
+@router.post("/recalculate-net-pnl", response_model=dict)
+async def recalculate_net_pnl(db: DbSession, current_user: CurrentUser):
+    """Recompute net_pnl as pnl minus commissions."""
+    updated_count = await trade_maintenance.recalculate_net_pnl(db, current_user.id)
+    if updated_count:
+        await trade_rollup.refresh_rollup(db, current_user.id)
     await db.commit()
 
     return {
-        "message": f"Successfully recalculated durations for {updated_count} trades",
+        "message": f"Successfully recalculated net P&L for {updated_count} trades",
         "trades_updated": updated_count
     }
+
+
+@router.post("/normalize-tickers", response_model=dict)
+async def normalize_tickers(db: DbSession, current_user: CurrentUser):
+    """Trim and uppercase all ticker symbols."""
+    updated_count = await trade_maintenance.normalize_tickers(db, current_user.id)
+    if updated_count:
+        await trade_rollup.refresh_rollup(db, current_user.id)
+    await db.commit()
+
+    return {
+        "message": f"Successfully normalized tickers for {updated_count} trades",
+        "trades_updated": updated_count
+    }
+
+
+@router.post("/enrich-excursions", response_model=dict)
+async def enrich_excursions(
+    db: DbSession,
+    current_user: CurrentUser,
+    max_days: int = Query(trade_excursions.DEFAULT_MAX_DAYS, ge=1, le=5000, description="Ticker-days of minute bars to load"),
+):
+    """
+    Fill MAE/MFE and in-trade high/low from 1-minute bars for trades that have entry and
+    exit times. Call again while days_remaining > 0.
+    """
+    try:
+        result = await trade_excursions.enrich_trades(db, current_user.id, max_days)
+    except trade_excursions.ExcursionsUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    await db.commit()
+
+    return {
+        "message": f"Enriched {result.trades_enriched} trades from {result.days_loaded} days of minute bars",
+        "trades_enriched": result.trades_enriched,
+        "trades_without_bars": result.trades_without_bars,
+        "days_loaded": result.days_loaded,
+        "days_remaining": result.days_remaining,
+    }
+
+
+@router.post("/maintenance", response_model=dict)
+async def run_maintenance(db: DbSession, current_user: CurrentUser):
+    """Run all maintenance updates in one transaction."""
+    counts = {
+        "durations_updated": await trade_maintenance.recalculate_durations(db, current_user.id),
+        "net_pnl_updated": await trade_maintenance.recalculate_net_pnl(db, current_user.id),
+        "tickers_normalized": await trade_maintenance.normalize_tickers(db, current_user.id),
+    }
+    if any(counts.values()):
+        await trade_rollup.refresh_rollup(db, current_user.id)
+    await db.commit()
+
+    return {"message": "Maintenance complete", **counts}
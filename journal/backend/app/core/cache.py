@@ -0,0 +1,179 @@
+"""
+Versioned per-user result cache.
+
+Read endpoints decorated with @cached_endpoint store their response under
+(user, endpoint, parameters, user's data version). Every trade write bumps
+users.data_version in the same transaction (see bump_data_version), so stale
+entries are never read again and simply age out; nothing is invalidated
+explicitly. Entries live in Redis when REDIS_URL is set, otherwise in a
+bounded in-process LRU.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import json
+import time
+from collections import OrderedDict, defaultdict
+from datetime import date
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.user import User
+
+KEY_PREFIX = "tsis:result"
+
+
+class LRUBackend:
+    """In-process LRU with a per-entry TTL, bounded to `max_entries`."""
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class RedisBackend:
+    """Shared cache across workers; entries expire after `ttl` seconds."""
+
+    def __init__(self, url: str, ttl: int):
+        import redis.asyncio as redis
+
+        self.ttl = ttl
+        self._client = redis.from_url(url)
+        self._errors = (redis.RedisError, OSError)
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            return await self._client.get(key)
+        except self._errors:
+            # Cache unavailable: serve uncached rather than fail the request
+            return None
+
+    async def set(self, key: str, value: bytes):
+        try:
+            await self._client.set(key, value, ex=self.ttl)
+        except self._errors:
+            pass
+
+
+class ResultCache:
+    def __init__(self, backend):
+        self.backend = backend
+        # endpoint -> [hits, misses], per process
+        self._counts: defaultdict[str, list[int]] = defaultdict(lambda: [0, 0])
+
+    async def get(self, endpoint: str, key: str) -> bytes | None:
+        value = await self.backend.get(key)
+        self._counts[endpoint][0 if value is not None else 1] += 1
+        return value
+
+    async def set(self, key: str, value: bytes):
+        await self.backend.set(key, value)
+
+    def stats(self) -> dict:
+        """Hit/miss counts and hit rate per endpoint since this process started."""
+        endpoints = {
+            endpoint: {"hits": hits, "misses": misses, "hit_rate": round(hits / (hits + misses), 4)}
+            for endpoint, (hits, misses) in sorted(self._counts.items())
+        }
+        hits = sum(e["hits"] for e in endpoints.values())
+        misses = sum(e["misses"] for e in endpoints.values())
+        return {
+            "backend": "redis" if isinstance(self.backend, RedisBackend) else "memory",
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+def _create_cache() -> ResultCache:
+    settings = get_settings()
+    if settings.REDIS_URL:
+        return ResultCache(RedisBackend(settings.REDIS_URL, settings.CACHE_TTL_SECONDS))
+    return ResultCache(LRUBackend(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL_SECONDS))
+
+
+result_cache = _create_cache()
+
+
+async def bump_data_version(db: AsyncSession, user_id: int):
+    """Invalidate the user's cached results (call in the transaction that changes their trades)."""
+    await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        # Keep updated_at for profile changes
+        .values(data_version=User.data_version + 1, updated_at=User.updated_at)
+    )
+
+
+def cache_key(endpoint: str, user: User, params: dict) -> str:
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+    return f"{KEY_PREFIX}:{user.id}:{user.data_version}:{endpoint}:{digest}"
+
+
+async def cached_call(endpoint: str, user: User, params: dict, compute):
+    """
+    Await `compute()` unless a result for (user, data version, endpoint, params) is
+    cached. Hits return the JSON-decoded value, so callers needing their own type
+    should have `compute` return plain data.
+    """
+    key = cache_key(endpoint, user, params)
+    cached = await result_cache.get(endpoint, key)
+    if cached is not None:
+        return json.loads(cached)
+
+    result = await compute()
+    await result_cache.set(key, json.dumps(jsonable_encoder(result)).encode())
+    return result
+
+
+def cached_endpoint(endpoint: str, *, depends_on_today: bool = False):
+    """
+    Cache an endpoint's response per user and data version. The key covers every
+    argument except `db` and `current_user`; set `depends_on_today` for results
+    that change with the calendar date (e.g. today's P&L).
+    """
+    def decorator(func):
+        # Evaluated here, against the endpoint's module: FastAPI would otherwise resolve
+        # postponed annotations against this module's globals
+        signature = inspect.signature(func, eval_str=True)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+            user = arguments["current_user"]
+            params = {name: value for name, value in arguments.items() if name not in ("db", "current_user")}
+            if depends_on_today:
+                params["today"] = date.today()
+
+            return await cached_call(endpoint, user, params, lambda: func(*args, **kwargs))
+
+        wrapper.__signature__ = signature
+        return wrapper
+
+    return decorator
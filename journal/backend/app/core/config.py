@@ -20,6 +20,26 @@ class Settings(BaseSettings):
     # Redis (optional)
     REDIS_URL: str = ""
 
+    # Dashboard/report result cache: Redis when REDIS_URL is set, else an in-process LRU
+    CACHE_MAX_ENTRIES: int = 2048
+    CACHE_TTL_SECONDS: int = 3600
+
+    # Monte Carlo significance stats on Reports > Detailed: samples are capped so that
+    # samples x trades stays under MONTE_CARLO_MAX_CELLS; when that leaves fewer than
+    # MONTE_CARLO_MIN_SAMPLES, the normal approximation is used instead
+    MONTE_CARLO_SAMPLES: int = 2000
+    MONTE_CARLO_MIN_SAMPLES: int = 1000
+    MONTE_CARLO_MAX_CELLS: int = 2_000_000
+    MONTE_CARLO_SEED: int = 42
+
+    # Analytics API serving 1-minute bars for MAE/MFE enrichment (disabled when empty)
+    ANALYTICS_API_URL: str = ""
+    ANALYTICS_TIMEOUT_SECONDS: float = 30.0
+
+    # Background imports: uploads are spooled here and processed in chunks
+    IMPORT_SPOOL_DIR: str = ""  # Defaults to <system temp>/tsis_imports
+    IMPORT_CHUNK_SIZE: int = 5000
+
     class Config:
         case_sensitive = True
         env_file = ".env"
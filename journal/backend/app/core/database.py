@@ -27,6 +27,20 @@ AsyncSessionLocal = async_sessionmaker(
 class Base(DeclarativeBase):
     pass
 
+# create_all only creates missing tables; columns and indexes added to existing
+# tables are applied here on startup (every statement must be idempotent)
+SCHEMA_UPGRADES = [
+    "ALTER TABLE trades ADD COLUMN IF NOT EXISTS fingerprint VARCHAR(40)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_trades_user_fingerprint ON trades (user_id, fingerprint)",
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS data_version INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE trades ADD COLUMN IF NOT EXISTS trade_high DOUBLE PRECISION",
+    "ALTER TABLE trades ADD COLUMN IF NOT EXISTS trade_low DOUBLE PRECISION",
+    "ALTER TABLE trades ADD COLUMN IF NOT EXISTS mae DOUBLE PRECISION",
+    "ALTER TABLE trades ADD COLUMN IF NOT EXISTS mfe DOUBLE PRECISION",
+    "ALTER TABLE trades ADD COLUMN IF NOT EXISTS excursions_at TIMESTAMP WITH TIME ZONE",
+    "CREATE INDEX IF NOT EXISTS ix_trades_user_date_time_id ON trades (user_id, date DESC, entry_time DESC, id DESC)",
+]
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         try:
@@ -0,0 +1,57 @@
+import base64
+import json
+from datetime import date, time
+
+from sqlalchemy import and_, or_
+
+from app.models.trade import Trade
+
+
+def encode_trade_cursor(trade: Trade) -> str:
+    """Opaque cursor pointing just past `trade` in (date DESC, entry_time DESC, id DESC) order."""
+    payload = {
+        "d": trade.date.isoformat(),
+        "t": trade.entry_time.isoformat() if trade.entry_time else None,
+        "i": trade.id,
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_trade_cursor(cursor: str) -> tuple[date, time | None, int]:
+    """Decode a cursor from encode_trade_cursor. Raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (
+            date.fromisoformat(payload["d"]),
+            time.fromisoformat(payload["t"]) if payload["t"] else None,
+            int(payload["i"]),
+        )
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def trades_after(cursor: str):
+    """
+    WHERE clause for the trades after a cursor in (date DESC, entry_time DESC, id DESC)
+    order. Postgres sorts NULL entry times first in DESC order, so they come before
+    any timed trade on the same date.
+    """
+    cursor_date, cursor_time, cursor_id = decode_trade_cursor(cursor)
+
+    if cursor_time is None:
+        same_date = or_(Trade.entry_time.is_not(None), and_(Trade.entry_time.is_(None), Trade.id < cursor_id))
+    else:
+        same_date = and_(
+            Trade.entry_time.is_not(None),
+            or_(
+                Trade.entry_time < cursor_time,
+                and_(Trade.entry_time == cursor_time, Trade.id < cursor_id),
+            ),
+        )
+
+    # The redundant date bound becomes an index condition, so the scan starts at the cursor
+    return and_(
+        Trade.date <= cursor_date,
+        or_(Trade.date < cursor_date, and_(Trade.date == cursor_date, same_date)),
+    )
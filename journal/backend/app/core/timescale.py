@@ -0,0 +1,100 @@
+"""
+TimescaleDB support.
+
+When the timescaledb extension is installed (docker-compose runs a Timescale
+image and sql/init.sql enables it), trade_daily_rollup becomes a hypertable on
+`date` and per-user daily, weekly and monthly P&L continuous aggregates are
+defined over it. The aggregates are real-time (unmaterialized rows are merged
+in at query time) and kept materialized by refresh policies. On plain Postgres
+none of this is created and readers use trade_daily_rollup directly.
+"""
+from sqlalchemy import BigInteger, Date, Float, Integer, Enum as SQLEnum, column, table, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.models.trade import TradeSide
+
+# Set on startup by setup_timescale
+enabled = False
+
+REFRESH_INTERVAL = "1 minute"
+
+_AGGREGATE_COLUMNS = """
+    user_id,
+    time_bucket(INTERVAL '{bucket}', date) AS date,
+    side,
+    sum(trade_count)::integer AS trade_count,
+    sum(win_count)::integer AS win_count,
+    sum(loss_count)::integer AS loss_count,
+    sum(pnl) AS pnl,
+    sum(gross_profit) AS gross_profit,
+    sum(gross_loss) AS gross_loss,
+    sum(net_pnl) AS net_pnl,
+    max(max_pnl) AS max_pnl,
+    min(min_pnl) AS min_pnl,
+    sum(shares) AS shares
+"""
+
+AGGREGATES = {
+    "trade_pnl_daily": "1 day",
+    "trade_pnl_weekly": "1 week",  # Buckets start on Monday
+    "trade_pnl_monthly": "1 month",
+}
+
+
+def _aggregate_table(name: str):
+    return table(
+        name,
+        column("user_id", Integer),
+        column("date", Date),
+        column("side", SQLEnum(TradeSide)),
+        column("trade_count", Integer),
+        column("win_count", Integer),
+        column("loss_count", Integer),
+        column("pnl", Float),
+        column("gross_profit", Float),
+        column("gross_loss", Float),
+        column("net_pnl", Float),
+        column("max_pnl", Float),
+        column("min_pnl", Float),
+        column("shares", BigInteger),
+    )
+
+
+# Same column names as trade_daily_rollup; `date` is the bucket start
+trade_pnl_daily = _aggregate_table("trade_pnl_daily")
+trade_pnl_weekly = _aggregate_table("trade_pnl_weekly")
+trade_pnl_monthly = _aggregate_table("trade_pnl_monthly")
+
+
+def _setup_statements() -> list[str]:
+    statements = [
+        "SELECT create_hypertable('trade_daily_rollup', 'date', chunk_time_interval => INTERVAL '1 month', "
+        "if_not_exists => TRUE, migrate_data => TRUE)",
+    ]
+    for name, bucket in AGGREGATES.items():
+        statements += [
+            f"CREATE MATERIALIZED VIEW IF NOT EXISTS {name} "
+            f"WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS "
+            f"SELECT {_AGGREGATE_COLUMNS.format(bucket=bucket)} "
+            f"FROM trade_daily_rollup GROUP BY user_id, time_bucket(INTERVAL '{bucket}', date), side "
+            f"WITH NO DATA",
+            # Unbounded window: each run only re-materializes invalidated buckets
+            f"SELECT add_continuous_aggregate_policy('{name}', start_offset => NULL, end_offset => NULL, "
+            f"schedule_interval => INTERVAL '{REFRESH_INTERVAL}', if_not_exists => TRUE)",
+            f"CALL refresh_continuous_aggregate('{name}', NULL, NULL)",
+        ]
+    return statements
+
+
+async def setup_timescale(engine: AsyncEngine) -> bool:
+    """Create the hypertable and continuous aggregates if TimescaleDB is installed (run at startup)."""
+    global enabled
+    # Continuous aggregates can't be refreshed inside a transaction block
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        installed = await conn.scalar(text("SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'"))
+        if installed:
+            for statement in _setup_statements():
+                await conn.execute(text(statement))
+    enabled = bool(installed)
+    return enabled
@@ -2,15 +2,24 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import get_settings
-from app.core.database import engine, Base
-from app.models import company, gap, user, trade, tag, risk_settings
+from sqlalchemy import text
+from app.core.database import engine, Base, SCHEMA_UPGRADES
+from app.core.timescale import setup_timescale
+from app.core.cache import result_cache
+from app.models import company, gap, user, trade, tag, risk_settings, import_job, trade_rollup
 from app.api.v1 import api_router
+from app.api.deps import CurrentUser
+from app.services.trade_rollup import backfill_rollups
 
 # Create tables on startup
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        for statement in SCHEMA_UPGRADES:
+            await conn.execute(text(statement))
+        await backfill_rollups(conn)
+    await setup_timescale(engine)
     yield
 
 settings = get_settings()
@@ -39,6 +48,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
 # Include API router
@@ -53,3 +63,9 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+@app.get("/health/cache")
+def cache_stats(current_user: CurrentUser):
+    """Result cache hit rates for this process (signed-in users only)"""
+    return result_cache.stats()
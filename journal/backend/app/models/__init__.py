@@ -4,3 +4,5 @@ from .user import User
 from .trade import Trade, TradeSide
 from .tag import Tag, trade_tags
 from .risk_settings import RiskSettings
+from .import_job import ImportJob
+from .trade_rollup import TradeDailyRollup
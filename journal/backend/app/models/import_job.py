@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, DateTime, JSON
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class ImportJob(Base):
+    """Background trade import of a spooled upload, processed in chunks."""
+    __tablename__ = "import_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    filename = Column(String(255), nullable=False)
+    status = Column(String(20), nullable=False, default="pending")  # pending, running, completed, failed
+    chunk_size = Column(Integer, nullable=False)
+    trade_date = Column(Date, nullable=True)  # For execution files without a date column
+
+    # Progress (updated in the same transaction as each chunk's trades)
+    rows_processed = Column(Integer, nullable=False, default=0)
+    trades_created = Column(Integer, nullable=False, default=0)
+    duplicates = Column(Integer, nullable=False, default=0)  # Already imported, skipped
+    chunks_committed = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON, nullable=True, default=list)  # First errors only
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, Time, Interval, ForeignKey, DateTime, Text, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Float, Date, Time, Interval, ForeignKey, DateTime, Text, Index, Enum as SQLEnum
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -12,6 +12,10 @@ class TradeSide(str, enum.Enum):
 
 class Trade(Base):
     __tablename__ = "trades"
+    __table_args__ = (
+        # Imports skip rows whose fingerprint the user already has
+        Index("ix_trades_user_fingerprint", "user_id", "fingerprint", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -43,11 +47,21 @@ class Trade(Base):
     high_of_day = Column(Float, nullable=True)  # HOD during trade
     low_of_day = Column(Float, nullable=True)  # LOD during trade
 
+    # Price path from 1-minute bars (filled by the MAE/MFE enrichment job)
+    trade_high = Column(Float, nullable=True)  # Highest price between entry and exit
+    trade_low = Column(Float, nullable=True)  # Lowest price between entry and exit
+    mae = Column(Float, nullable=True)  # Maximum adverse excursion in $ (<= 0)
+    mfe = Column(Float, nullable=True)  # Maximum favorable excursion in $ (>= 0)
+    excursions_at = Column(DateTime(timezone=True), nullable=True)  # NULL until enriched
+
     # Notes & metadata
     notes = Column(Text, nullable=True)
     setup = Column(String(100), nullable=True)  # Trading setup used
     screenshot_url = Column(String(500), nullable=True)
 
+    # Import identity: sha1 of user, date, ticker, side, times, prices and shares (NULL for manual trades)
+    fingerprint = Column(String(40), nullable=True)
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -68,3 +82,10 @@ class Trade(Base):
             if risk > 0:
                 return self.pnl / (risk * self.shares)
         return None
+
+
+# Keyset pagination for GET /trades: (date DESC, entry_time DESC, id DESC) per user
+Index(
+    "ix_trades_user_date_time_id",
+    Trade.user_id, Trade.date.desc(), Trade.entry_time.desc(), Trade.id.desc(),
+)
@@ -0,0 +1,29 @@
+from sqlalchemy import BigInteger, Column, Integer, SmallInteger, String, Float, Date, ForeignKey, Enum as SQLEnum
+from app.core.database import Base
+from app.models.trade import TradeSide
+
+
+class TradeDailyRollup(Base):
+    """
+    Per-user daily P&L aggregates by ticker, side and entry hour.
+    Rebuilt for the affected days in the same transaction as every trade write.
+    """
+    __tablename__ = "trade_daily_rollup"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    ticker = Column(String(20), primary_key=True)
+    side = Column(SQLEnum(TradeSide), primary_key=True)
+    entry_hour = Column(SmallInteger, primary_key=True)  # -1 when the trade has no entry time
+
+    trade_count = Column(Integer, nullable=False)
+    win_count = Column(Integer, nullable=False)
+    loss_count = Column(Integer, nullable=False)
+    pnl = Column(Float, nullable=False)
+    gross_profit = Column(Float, nullable=False)
+    gross_loss = Column(Float, nullable=False)
+    net_pnl = Column(Float, nullable=False)
+    max_pnl = Column(Float, nullable=False)
+    min_pnl = Column(Float, nullable=False)
+    duration_seconds = Column(Integer, nullable=False)  # Sum over trades with a duration
+    shares = Column(BigInteger, nullable=False)  # Volume
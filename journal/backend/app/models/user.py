@@ -13,6 +13,7 @@ class User(Base):
     name = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
     is_superuser = Column(Boolean, default=False)
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")  # Bumped on every trade write
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
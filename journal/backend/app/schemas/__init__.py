@@ -1,6 +1,10 @@
 from .user import UserCreate, UserLogin, UserResponse, Token, TokenPayload
-from .trade import TradeCreate, TradeUpdate, TradeResponse, TradeImport
+from .trade import (
+    TradeCreate, TradeUpdate, TradeResponse, TradeImport,
+    TradeSelection, TradeBulkChanges, TradeBulkUpdate, TradeBulkTags, TradeBulkDelete,
+)
 from .tag import TagCreate, TagResponse
 from .risk_settings import RiskSettingsCreate, RiskSettingsUpdate, RiskSettingsResponse
 from .dashboard import DashboardMetrics, CalendarDay, MonthlyStats
 from .reports import DetailedStatsResponse
+from .import_job import ImportJobResponse
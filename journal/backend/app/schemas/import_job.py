@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from datetime import date, datetime
+
+
+class ImportJobResponse(BaseModel):
+    id: int
+    filename: str
+    status: str
+    chunk_size: int
+    trade_date: date | None = None
+    rows_processed: int
+    trades_created: int
+    duplicates: int
+    chunks_committed: int
+    error_count: int
+    errors: list[str] = []
+    rows_per_second: float | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
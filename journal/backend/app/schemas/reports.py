@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import date, time
 from typing import Optional, List
 
 from pydantic import BaseModel
@@ -118,15 +119,73 @@ class DetailedStatsResponse(BaseModel):
     trade_pnl_standard_deviation: Optional[float] = None
     system_quality_number_sqn: Optional[float] = None
 
-    probability_of_random_chance: Optional[float] = None
+    probability_of_random_chance: Optional[float] = None  # Percent, Monte Carlo sign-flip test
 
     kelly_percentage: Optional[float] = None
     k_ratio: Optional[float] = None
 
     profit_factor: Optional[float] = None
 
+    # 95% bootstrap confidence intervals (win rate in percent)
+    expectancy_ci_low: Optional[float] = None
+    expectancy_ci_high: Optional[float] = None
+    win_rate_ci_low: Optional[float] = None
+    win_rate_ci_high: Optional[float] = None
+    monte_carlo_samples: int = 0
+
     total_commissions: Optional[float] = None
     total_fees: Optional[float] = None
 
     average_position_mae: Optional[float] = None
     average_position_mfe: Optional[float] = None
+
+
+class DetailedReportsResponse(BaseModel):
+    """Everything on Reports > Detailed in one response."""
+    stats: DetailedStatsResponse
+    days_times: DaysTimesResponse
+    price_volume: PriceVolumeResponse
+
+
+class BucketStats(BaseModel):
+    """Stats for one user-defined bucket; lower/upper are null for open-ended buckets."""
+    range_label: str  # e.g., "$1-2", "< $1", "9:30"
+    lower: Optional[float] = None
+    upper: Optional[float] = None
+    total_pnl: float = 0.0
+    trades: int = 0
+    winners: int = 0
+    losers: int = 0
+    win_rate: float = 0.0
+
+
+class BucketsResponse(BaseModel):
+    """Trades grouped by custom price/volume/duration edges or time-of-day slots."""
+    dimension: str
+    buckets: List[BucketStats] = []
+
+
+class EquityPoint(BaseModel):
+    """One point of the equity curve (a trade, or a day for the daily series)."""
+    date: date
+    entry_time: Optional[time] = None
+    trade_id: Optional[int] = None
+    pnl: float
+    equity: float  # Cumulative P&L
+    drawdown: float  # Below the running peak (<= 0)
+
+
+class EquityCurveResponse(BaseModel):
+    granularity: str  # "trade" or "day"
+    total_points: int  # Before downsampling
+    points: List[EquityPoint] = []
+
+    final_equity: float = 0.0
+    peak_equity: float = 0.0
+    max_drawdown: float = 0.0
+    max_drawdown_pct: Optional[float] = None
+    max_drawdown_peak_date: Optional[date] = None
+    max_drawdown_trough_date: Optional[date] = None
+    max_drawdown_recovery_date: Optional[date] = None
+    longest_drawdown_days: int = 0
+    current_drawdown: float = 0.0
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from datetime import date as DateType, time as TimeType, datetime
 from typing import Literal, Optional
 from app.models.trade import TradeSide
@@ -42,11 +42,58 @@ class TradeUpdate(BaseModel):
     tag_ids: Optional[list[int]] = None
 
 
+class TradeSelection(BaseModel):
+    """Trades targeted by a bulk operation: explicit ids and/or the GET /trades filters."""
+    ids: Optional[list[int]] = None
+    ticker: Optional[str] = None
+    side: Optional[TradeSide] = None
+    start_date: Optional[DateType] = None
+    end_date: Optional[DateType] = None
+
+
+class TradeBulkChanges(BaseModel):
+    ticker: Optional[str] = Field(None, max_length=20)
+    side: Optional[TradeSide] = None
+    commissions: Optional[float] = None
+    notes: Optional[str] = None
+    setup: Optional[str] = Field(None, max_length=100)
+
+    # Omit a field to leave it unchanged; only notes and setup can be cleared with null
+    @field_validator("ticker", "side", "commissions")
+    @classmethod
+    def _not_null(cls, value):
+        if value is None:
+            raise ValueError("cannot be null")
+        return value
+
+
+class TradeBulkUpdate(BaseModel):
+    selection: TradeSelection
+    changes: TradeBulkChanges
+
+
+class TradeBulkTags(BaseModel):
+    selection: TradeSelection
+    add_tag_ids: list[int] = []
+    remove_tag_ids: list[int] = []
+
+
+class TradeBulkDelete(BaseModel):
+    selection: TradeSelection
+
+
 class TradeResponse(TradeBase):
     id: int
     user_id: int
     created_at: datetime
     is_winner: bool
+    # From 1-minute bars once enriched
+    high_of_day: Optional[float] = None
+    low_of_day: Optional[float] = None
+    trade_high: Optional[float] = None
+    trade_low: Optional[float] = None
+    mae: Optional[float] = None
+    mfe: Optional[float] = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,181 @@
+"""
+Equity curve and drawdown.
+
+The cumulative P&L series, its running peak and the drawdown from that peak
+are computed in Postgres with window functions, per trade or per day.
+Drawdown statistics are derived from the full series; the series itself can
+be downsampled with Largest-Triangle-Three-Buckets (LTTB) so long histories
+stay small while keeping the curve's visible shape.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, time
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.trade import Trade
+
+GRANULARITIES = ("trade", "day")
+
+
+@dataclass
+class EquitySeries:
+    date: list[date]
+    entry_time: list[time | None]  # None for every point of a daily series
+    trade_id: list[int | None]
+    pnl: np.ndarray  # P&L of the trade/day
+    equity: np.ndarray  # Cumulative P&L
+    peak: np.ndarray  # Running max of equity, starting from 0
+    drawdown: np.ndarray  # equity - peak (<= 0)
+
+    def __len__(self) -> int:
+        return len(self.pnl)
+
+
+@dataclass
+class DrawdownStats:
+    max_drawdown: float = 0.0
+    max_drawdown_pct: float | None = None  # Of the peak equity; None when the peak was 0
+    max_drawdown_peak_date: date | None = None
+    max_drawdown_trough_date: date | None = None
+    max_drawdown_recovery_date: date | None = None  # None while not recovered
+    longest_drawdown_days: int = 0
+    current_drawdown: float = 0.0
+
+
+def _trade_series_query(filters: list):
+    ordered = (
+        select(
+            Trade.id,
+            Trade.date,
+            Trade.entry_time,
+            Trade.pnl,
+            func.row_number().over(
+                order_by=(Trade.date, Trade.entry_time.asc().nulls_last(), Trade.id)
+            ).label("seq"),
+        )
+        .where(*filters)
+        .subquery()
+    )
+    running = select(
+        ordered,
+        func.sum(ordered.c.pnl).over(order_by=ordered.c.seq, rows=(None, 0)).label("equity"),
+    ).subquery()
+    return select(
+        running.c.id,
+        running.c.date,
+        running.c.entry_time,
+        running.c.pnl,
+        running.c.equity,
+        func.greatest(func.max(running.c.equity).over(order_by=running.c.seq, rows=(None, 0)), 0).label("peak"),
+    ).order_by(running.c.seq)
+
+
+def _daily_series_query(filters: list):
+    daily = (
+        select(Trade.date, func.sum(Trade.pnl).label("pnl"))
+        .where(*filters)
+        .group_by(Trade.date)
+        .subquery()
+    )
+    running = select(
+        daily,
+        func.sum(daily.c.pnl).over(order_by=daily.c.date, rows=(None, 0)).label("equity"),
+    ).subquery()
+    return select(
+        running.c.date,
+        running.c.pnl,
+        running.c.equity,
+        func.greatest(func.max(running.c.equity).over(order_by=running.c.date, rows=(None, 0)), 0).label("peak"),
+    ).order_by(running.c.date)
+
+
+async def load_equity_series(db: AsyncSession, filters: list, granularity: str = "trade") -> EquitySeries:
+    """Cumulative P&L with running peak and drawdown, per trade or per day."""
+    if granularity == "day":
+        rows = (await db.execute(_daily_series_query(filters))).all()
+        dates = [row.date for row in rows]
+        entry_times = trade_ids = [None] * len(rows)
+    else:
+        rows = (await db.execute(_trade_series_query(filters))).all()
+        dates = [row.date for row in rows]
+        entry_times = [row.entry_time for row in rows]
+        trade_ids = [row.id for row in rows]
+
+    equity = np.array([row.equity for row in rows], dtype=np.float64)
+    peak = np.array([row.peak for row in rows], dtype=np.float64)
+    return EquitySeries(
+        date=dates,
+        entry_time=entry_times,
+        trade_id=trade_ids,
+        pnl=np.array([row.pnl for row in rows], dtype=np.float64),
+        equity=equity,
+        peak=peak,
+        drawdown=equity - peak,
+    )
+
+
+def drawdown_stats(series: EquitySeries) -> DrawdownStats:
+    """Deepest drawdown with its peak/trough/recovery dates, and the longest time under water."""
+    n = len(series)
+    if not n or not (series.drawdown < 0).any():
+        return DrawdownStats()
+
+    trough = int(np.argmin(series.drawdown))
+    peak_value = series.peak[trough]
+    # The peak is the last point at or above the running max before the trough
+    at_peak = np.flatnonzero(series.equity[:trough] >= peak_value)
+    peak_index = int(at_peak[-1]) if len(at_peak) else None  # None: the 0 before the first trade
+    recovered = np.flatnonzero(series.equity[trough:] >= peak_value)
+
+    # Under-water runs: from the point before the run (its peak) to the point that recovers
+    under = np.concatenate(([0], (series.drawdown < 0).astype(np.int8), [0]))
+    starts = np.flatnonzero(np.diff(under) == 1)
+    ends = np.flatnonzero(np.diff(under) == -1)  # First recovered index, or n if still under water
+    ordinals = np.array([d.toordinal() for d in series.date])
+    run_start = ordinals[np.maximum(starts - 1, 0)]
+    run_end = ordinals[np.minimum(ends, n - 1)]
+
+    return DrawdownStats(
+        max_drawdown=round(float(series.drawdown[trough]), 2),
+        max_drawdown_pct=round(float(series.drawdown[trough] / peak_value * 100), 2) if peak_value > 0 else None,
+        max_drawdown_peak_date=series.date[peak_index] if peak_index is not None else series.date[0],
+        max_drawdown_trough_date=series.date[trough],
+        max_drawdown_recovery_date=series.date[trough + int(recovered[0])] if len(recovered) else None,
+        longest_drawdown_days=int((run_end - run_start).max()),
+        current_drawdown=round(float(series.drawdown[-1]), 2),
+    )
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets downsampling to
+    `threshold` points. The first and last points are always kept.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Interior points split into threshold - 2 buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # Third vertex: the average of the next bucket (the last point for the final bucket)
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        areas = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        kept[i + 1] = previous
+    return kept
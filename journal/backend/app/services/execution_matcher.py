@@ -0,0 +1,167 @@
+"""
+Execution matcher.
+
+Turns broker executions (one row per fill) into round-trip trades by tracking
+the running position per group (symbol and day, plus account when present).
+A trade opens when the position leaves zero and closes when it returns to
+zero, so scale-ins and scale-outs stay inside one trade. A fill that takes the
+position through zero (long -> short) is split into a closing part and an
+opening part, with its fees shared pro rata.
+
+Everything runs on NumPy arrays over the sorted executions: cumulative sums
+for the position, and bincount/reduceat for the per-trade totals.
+"""
+import numpy as np
+import pandas as pd
+
+BUY_SIDES = ("B", "BUY", "BC", "BUYTOCOVER", "COVER")
+SELL_SIDES = ("S", "SELL", "SS", "SELLSHORT", "SHORT")
+FEE_COLUMNS = ("commissions", "commission", "transfee", "ecnfee")  # "commission" is renamed on import
+
+TRADE_COLUMNS = [
+    "date", "ticker", "side", "entry_price", "exit_price", "shares",
+    "pnl", "commissions", "entry_time", "exit_time",
+]
+
+
+def _group_start_index(starts: np.ndarray) -> np.ndarray:
+    """For every row, the index of the first row of its group."""
+    return np.maximum.accumulate(np.where(starts, np.arange(len(starts)), 0))
+
+
+def match_executions(
+    df: pd.DataFrame,
+    group_columns: tuple[str, ...] = ("symbol", "date"),
+) -> tuple[pd.DataFrame, list[str]]:
+    """
+    Match executions into round-trip trades.
+
+    Expects symbol, side, quantity and price columns, plus the group columns,
+    an optional "time" column (timedeltas since midnight) and optional fee
+    columns. Returns (trades, errors). Trades still open at the end of a group
+    are reported as errors; their closed shares are kept as a trade.
+    """
+    errors: list[str] = []
+    extra_columns = [c for c in group_columns if c not in ("symbol", "date")]
+    if df.empty:
+        return pd.DataFrame(columns=TRADE_COLUMNS + extra_columns), errors
+
+    side = df["side"].astype("string").str.upper().str.strip()
+    direction = np.select(
+        [side.isin(BUY_SIDES).fillna(False).to_numpy(bool), side.isin(SELL_SIDES).fillna(False).to_numpy(bool)],
+        [1, -1],
+        0,
+    )
+    quantity = pd.to_numeric(df["quantity"], errors="coerce").abs().fillna(0).to_numpy().astype(np.int64)
+    price = pd.to_numeric(df["price"], errors="coerce").to_numpy(dtype=float)
+
+    fees = np.zeros(len(df))
+    for column in FEE_COLUMNS:
+        if column in df.columns:
+            fees += pd.to_numeric(df[column], errors="coerce").fillna(0).to_numpy(dtype=float)
+
+    valid = (direction != 0) & (quantity > 0) & ~np.isnan(price)
+    skipped = int((~valid).sum())
+    if skipped:
+        errors.append(f"Skipped {skipped} executions with an unknown side, zero quantity or missing price")
+
+    group = df.groupby(list(group_columns), sort=False, dropna=False).ngroup().to_numpy()
+    if "time" in df.columns:
+        clock = df["time"].to_numpy(dtype="timedelta64[ns]").astype(np.int64).astype(float)
+        clock[pd.isna(df["time"]).to_numpy()] = np.inf  # Unknown times sort last
+    else:
+        clock = np.zeros(len(df))
+
+    # Sort by group, then time, keeping file order for ties
+    rows = np.flatnonzero(valid)
+    rows = rows[np.lexsort((rows, clock[rows], group[rows]))]
+    if len(rows) == 0:
+        return pd.DataFrame(columns=TRADE_COLUMNS + extra_columns), errors
+
+    signed = direction[rows] * quantity[rows]
+    group_starts = np.r_[True, group[rows][1:] != group[rows][:-1]]
+
+    # Running position within each group
+    cumulative = np.cumsum(signed)
+    position = cumulative - (cumulative - signed)[_group_start_index(group_starts)]
+    previous = position - signed
+
+    # Split fills that flip the position into a closing and an opening part
+    flips = previous * position < 0
+    if flips.any():
+        repeat = 1 + flips.astype(np.int64)
+        source = np.repeat(np.arange(len(rows)), repeat)
+        is_second = np.r_[False, source[1:] == source[:-1]]
+        is_first_of_flip = flips[source] & ~is_second
+
+        part = signed[source].copy()
+        part[is_first_of_flip] = -previous[source][is_first_of_flip]
+        part[is_second] = position[source][is_second]
+
+        fee_share = np.abs(part) / np.abs(signed[source])
+        rows, signed = rows[source], part
+        position = position[source]
+        position[is_first_of_flip] = 0
+        previous = position - signed
+        row_fees = fees[rows] * fee_share
+    else:
+        row_fees = fees[rows]
+
+    # A trade starts wherever the position leaves zero
+    trade_starts = previous == 0
+    trade_id = np.cumsum(trade_starts) - 1
+    first = np.flatnonzero(trade_starts)
+    last = np.r_[first[1:], len(rows)] - 1
+    n_trades = len(first)
+
+    trade_direction = np.sign(signed[first])
+    opening = np.sign(signed) == trade_direction[trade_id]
+    size = np.abs(signed).astype(float)
+    row_price = price[rows]
+
+    entry_qty = np.bincount(trade_id, weights=size * opening, minlength=n_trades)
+    entry_value = np.bincount(trade_id, weights=size * row_price * opening, minlength=n_trades)
+    exit_qty = np.bincount(trade_id, weights=size * ~opening, minlength=n_trades)
+    exit_value = np.bincount(trade_id, weights=size * row_price * ~opening, minlength=n_trades)
+    commissions = np.bincount(trade_id, weights=row_fees, minlength=n_trades)
+
+    entry_price = entry_value / entry_qty
+    with np.errstate(divide="ignore", invalid="ignore"):
+        exit_price = np.where(exit_qty > 0, exit_value / exit_qty, np.nan)
+
+    # Last closing fill of each trade
+    positions = np.arange(len(rows))
+    last_exit = np.maximum.reduceat(np.where(opening, -1, positions), first)
+
+    closed = position[last] == 0
+    pnl = trade_direction * (exit_value - entry_price * exit_qty)
+    shares = np.where(closed, entry_qty, exit_qty)
+
+    source_rows = df.index[rows]
+    first_rows = source_rows[first]
+    if not closed.all():
+        for i in np.flatnonzero(~closed)[:10]:
+            errors.append(
+                f"{df.at[first_rows[i], 'symbol']} on {df.at[first_rows[i], 'date']}: "
+                f"{int(abs(position[last[i]]))} shares still open at end of day"
+            )
+
+    trades = pd.DataFrame({
+        "date": df["date"].to_numpy()[rows[first]],
+        "ticker": df["symbol"].to_numpy()[rows[first]],
+        "side": np.where(trade_direction > 0, "long", "short"),
+        "entry_price": entry_price,
+        "exit_price": exit_price,
+        "shares": shares,
+        "pnl": pnl,
+        "commissions": commissions,
+    })
+    if "time" in df.columns:
+        times = df["time"].to_numpy(dtype="timedelta64[ns]")
+        trades["entry_time"] = times[rows[first]]
+        trades["exit_time"] = np.where(last_exit >= 0, times[rows[np.maximum(last_exit, 0)]], np.timedelta64("NaT"))
+    for column in extra_columns:
+        trades[column] = df[column].to_numpy()[rows[first]]
+
+    # Trades that never reduced the position have nothing to record
+    return trades[exit_qty > 0].reset_index(drop=True), errors
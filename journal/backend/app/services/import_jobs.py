@@ -0,0 +1,135 @@
+"""
+Background import jobs.
+
+Uploads are spooled to disk and processed in fixed-size chunks after the
+request returns. Each chunk's trades and the job's progress counters are
+committed together, so a bad row late in a file only affects its own chunk.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+from collections import Counter
+from datetime import datetime, timezone
+
+import pandas as pd
+from fastapi import UploadFile
+
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal
+from app.models.import_job import ImportJob
+from app.services.trade_rollup import refresh_rollup
+from app.services.trade_import import (
+    iter_trades_file, is_execution_format, prepare_trades, frame_to_rows, bulk_insert_trades,
+)
+
+settings = get_settings()
+
+MAX_STORED_ERRORS = 50
+_SPOOL_READ_SIZE = 1024 * 1024
+
+
+def _spool_dir() -> str:
+    path = settings.IMPORT_SPOOL_DIR or os.path.join(tempfile.gettempdir(), "tsis_imports")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+async def spool_upload(file: UploadFile, filename: str) -> str:
+    """Copy an upload to a spool file in 1 MB pieces and return its path."""
+    suffix = os.path.splitext(filename)[1]
+    fd, path = tempfile.mkstemp(dir=_spool_dir(), suffix=suffix)
+    with os.fdopen(fd, "wb") as out:
+        while chunk := await file.read(_SPOOL_READ_SIZE):
+            out.write(chunk)
+    return path
+
+
+def rows_per_second(job: ImportJob) -> float | None:
+    """Import throughput so far (or overall, once finished)."""
+    if not job.started_at:
+        return None
+    end = job.finished_at or datetime.now(timezone.utc)
+    elapsed = (end - job.started_at).total_seconds()
+    return round(job.rows_processed / elapsed, 1) if elapsed > 0 else None
+
+
+def _next_chunk(chunks):
+    return next(chunks, None)
+
+
+async def _commit_chunk(
+    db, job: ImportJob, trades_df: pd.DataFrame, errors: list[str], rows_read: int, seen: Counter
+):
+    """Insert one chunk of normalized trades and advance the job counters in one transaction."""
+    rows = frame_to_rows(trades_df, job.user_id, seen)
+    created = await bulk_insert_trades(db, rows)
+    await refresh_rollup(db, job.user_id, {row["date"] for row in rows})
+
+    job.rows_processed += rows_read
+    job.trades_created += created
+    job.duplicates += len(rows) - created
+    job.chunks_committed += 1
+    job.error_count += len(errors)
+    if errors and len(job.errors or []) < MAX_STORED_ERRORS:
+        job.errors = ((job.errors or []) + errors)[:MAX_STORED_ERRORS]
+
+    await db.commit()
+
+
+async def run_import_job(job_id: int, path: str):
+    """Process a spooled upload chunk by chunk. Runs as a background task."""
+    async with AsyncSessionLocal() as db:
+        job = await db.get(ImportJob, job_id)
+        if job is None:
+            return
+
+        job.status = "running"
+        job.started_at = datetime.now(timezone.utc)
+        job.errors = []
+        await db.commit()
+
+        try:
+            # Parsing is CPU-bound, keep it off the event loop
+            chunks = iter_trades_file(path, job.filename.lower(), job.chunk_size, job.user_id)
+            first = await asyncio.to_thread(_next_chunk, chunks)
+            # Fingerprint occurrences are counted across the whole file, not per chunk
+            seen = Counter()
+
+            if first is not None and is_execution_format(first):
+                # Executions are matched per symbol and day across the whole file
+                parts = [first]
+                while (chunk := await asyncio.to_thread(_next_chunk, chunks)) is not None:
+                    parts.append(chunk)
+                executions = pd.concat(parts, ignore_index=True)
+                trades_df, errors = await asyncio.to_thread(prepare_trades, executions, job.trade_date, job.filename)
+
+                for start in range(0, max(len(trades_df), 1), job.chunk_size):
+                    chunk_trades = trades_df.iloc[start:start + job.chunk_size]
+                    # Count executions once, with the first chunk of trades
+                    await _commit_chunk(db, job, chunk_trades, errors if start == 0 else [],
+                                        len(executions) if start == 0 else 0, seen)
+            else:
+                chunk = first
+                while chunk is not None:
+                    # Number rows from the start of the file in error messages
+                    chunk.index = pd.RangeIndex(job.rows_processed, job.rows_processed + len(chunk))
+                    trades_df, errors = await asyncio.to_thread(prepare_trades, chunk, job.trade_date, job.filename)
+                    await _commit_chunk(db, job, trades_df, errors, len(chunk), seen)
+                    chunk = await asyncio.to_thread(_next_chunk, chunks)
+
+            job.status = "completed"
+        except Exception as e:
+            await db.rollback()
+            job = await db.get(ImportJob, job_id)
+            job.status = "failed"
+            job.error_count += 1
+            job.errors = ((job.errors or []) + [f"Error processing file: {str(e)}"])[-MAX_STORED_ERRORS:]
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            await db.commit()
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,372 @@
+"""
+Reports engine.
+
+Loads the filtered trades once as NumPy column arrays with the shared columnar
+loader (only the columns the reports use, no ORM objects or rows) and computes
+the detailed stats, day/time and price/volume breakdowns from them. Buckets
+are assigned with np.digitize and aggregated with np.bincount, so each report
+is a handful of array passes instead of a Python loop over trades.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from math import sqrt
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.reports import (
+    DetailedStatsResponse,
+    DaysTimesResponse, DayStats, HourStats, MonthStats, DurationStats,
+    PriceVolumeResponse, PriceRangeStats, VolumeRangeStats,
+)
+from app.services.significance import SignificanceStats, significance_stats
+from app.services.trade_columns import MISSING_TIME, load_trade_columns
+
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# Duration ranges - Intraday vs Multiday (like Tradervue)
+DURATION_RANGES = [
+    (0, 86400, "Intraday"),      # < 1 day (24 hours in seconds)
+    (86400, float("inf"), "Multiday"),  # >= 1 day
+]
+
+# Intraday duration ranges (like Tradervue)
+INTRADAY_DURATION_RANGES = [
+    (0, 60, "< 1:00"),           # < 1 minute
+    (60, 120, "1:00 - 1:59"),    # 1-2 minutes
+    (120, 300, "2:00 - 4:59"),   # 2-5 minutes
+    (300, 600, "5:00 - 9:59"),   # 5-10 minutes
+    (600, 1200, "10:00 - 19:59"),  # 10-20 minutes
+    (1200, 2400, "20:00 - 39:59"),  # 20-40 minutes
+    (2400, 3600, "40:00 - 59:59"),  # 40-60 minutes
+    (3600, 7200, "1:00:00 - 1:59:59"),  # 1-2 hours
+    (7200, 14400, "2:00:00 - 3:59:59"),  # 2-4 hours
+    (14400, float("inf"), "4:00:00 >"),  # 4+ hours
+]
+
+# Price ranges for grouping
+PRICE_RANGES = [
+    (0, 10, "$0-10"),
+    (10, 25, "$10-25"),
+    (25, 50, "$25-50"),
+    (50, 100, "$50-100"),
+    (100, 250, "$100-250"),
+    (250, float("inf"), "$250+"),
+]
+
+# Volume/shares ranges for grouping
+VOLUME_RANGES = [
+    (1, 100, "1-100"),
+    (100, 500, "100-500"),
+    (500, 1000, "500-1K"),
+    (1000, 5000, "1K-5K"),
+    (5000, float("inf"), "5K+"),
+]
+
+TIMEFRAMES = (15, 30, 60)  # Time-of-day slot widths in minutes
+
+_EPOCH_WEEKDAY = 3  # 1970-01-01 was a Thursday
+
+
+@dataclass
+class TradeArrays:
+    """Filtered trades as parallel columns, in date/entry time order."""
+    date: np.ndarray  # datetime64[D]
+    entry_minute: np.ndarray  # Minute of day, -1 without entry time
+    duration: np.ndarray  # Seconds, NaN when unknown
+    entry_price: np.ndarray
+    shares: np.ndarray
+    pnl: np.ndarray
+    commissions: np.ndarray
+    mae: np.ndarray  # $, NaN until enriched from minute bars
+    mfe: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.pnl)
+
+
+REPORT_COLUMNS = ["duration", "entry_price", "shares", "pnl", "commissions", "mae", "mfe"]
+
+
+async def load_trade_arrays(db: AsyncSession, filters: list) -> TradeArrays:
+    """Load the columns the reports need for trades matching `filters`."""
+    columns = await load_trade_columns(db, filters, REPORT_COLUMNS)
+    entry_time = columns["entry_time"]
+    return TradeArrays(
+        date=columns["date"],
+        entry_minute=np.where(entry_time == MISSING_TIME, -1, entry_time // 60),
+        duration=columns["duration"],
+        entry_price=columns["entry_price"],
+        shares=columns["shares"],
+        pnl=columns["pnl"],
+        commissions=columns["commissions"],
+        mae=columns["mae"],
+        mfe=columns["mfe"],
+    )
+
+
+def _mean(values: np.ndarray) -> float:
+    return float(values.mean()) if len(values) else 0.0
+
+
+def _enriched_mean(values: np.ndarray) -> float | None:
+    """Mean over trades that have a value; None when none do."""
+    known = values[~np.isnan(values)]
+    return round(float(known.mean()), 2) if len(known) else None
+
+
+def _longest_run(mask: np.ndarray) -> int:
+    """Length of the longest run of True values."""
+    if not mask.any():
+        return 0
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return int((np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)).max())
+
+
+def _range_index(values: np.ndarray, ranges: list[tuple]) -> np.ndarray:
+    """Index of the [min, max) range each value falls in, -1 outside every range (NaN included)."""
+    lower = np.array([r[0] for r in ranges], dtype=np.float64)
+    upper = np.array([r[1] for r in ranges], dtype=np.float64)
+    index = np.digitize(values, lower) - 1
+    inside = (index >= 0) & (values < upper[np.clip(index, 0, None)])
+    return np.where(inside, index, -1)
+
+
+@dataclass
+class _GroupTotals:
+    pnl: np.ndarray
+    trades: np.ndarray
+    winners: np.ndarray
+    losers: np.ndarray
+
+    def win_rate(self, i: int) -> float:
+        return self.winners[i] / self.trades[i] * 100 if self.trades[i] else 0.0
+
+
+def _group_totals(index: np.ndarray, groups: int, pnl: np.ndarray) -> _GroupTotals:
+    """P&L, trade, winner and loser totals per group; rows with index -1 are ignored."""
+    keep = index >= 0
+    index, pnl = index[keep], pnl[keep]
+    return _GroupTotals(
+        pnl=np.bincount(index, weights=pnl, minlength=groups),
+        trades=np.bincount(index, minlength=groups),
+        winners=np.bincount(index[pnl > 0], minlength=groups),
+        losers=np.bincount(index[pnl < 0], minlength=groups),
+    )
+
+
+def detailed_stats(trades: TradeArrays, significance: SignificanceStats | None = None) -> DetailedStatsResponse:
+    """Aggregated stats for Reports > Detailed.
+
+    `significance` carries the Monte Carlo fields (computed here when not given).
+    MAE/MFE average the trades enriched from minute bars and are null until any are.
+    """
+    n = len(trades)
+    if not n:
+        return DetailedStatsResponse()
+
+    pnl = trades.pnl
+    if significance is None:
+        significance = significance_stats(pnl)
+    is_win, is_loss = pnl > 0, pnl < 0
+    is_scratch = ~(is_win | is_loss)
+    winners, losers = pnl[is_win], pnl[is_loss]
+
+    total_gain_loss = float(pnl.sum())
+
+    # daily
+    _, day_index = np.unique(trades.date, return_inverse=True)
+    daily_pnls = np.bincount(day_index, weights=pnl)
+
+    avg_winning_trade = _mean(winners)
+    avg_losing_trade = _mean(losers)
+
+    # per-share gain/loss (avg of pnl/shares)
+    has_shares = trades.shares != 0
+    avg_per_share_gain_loss = _mean(pnl[has_shares] / trades.shares[has_shares])
+
+    # hold times
+    has_duration = ~np.isnan(trades.duration)
+
+    def avg_hold(mask: np.ndarray) -> float:
+        return _mean(trades.duration[mask & has_duration])
+
+    gross_profit = float(winners.sum())
+    gross_loss = abs(float(losers.sum()))
+    profit_factor = gross_profit / gross_loss if gross_loss > 0 else gross_profit
+
+    trade_pnl_std_dev = float(pnl.std(ddof=1)) if n > 1 else 0.0
+
+    # SQN: mean(R) / std(R) * sqrt(n). Use pnl as a proxy for R until risk is modeled.
+    mean_r = total_gain_loss / n
+    sqn = (mean_r / trade_pnl_std_dev) * sqrt(n) if trade_pnl_std_dev > 0 else 0.0
+
+    # Kelly
+    p = len(winners) / n
+    b = avg_winning_trade / abs(avg_losing_trade) if avg_losing_trade else 0.0
+    kelly = (p - (1 - p) / b) if b > 0 else 0.0
+
+    total_commissions = float(trades.commissions.sum())
+
+    return DetailedStatsResponse(
+        total_gain_loss=round(total_gain_loss, 2),
+        largest_gain=round(float(pnl.max()), 2),
+        largest_loss=round(float(pnl.min()), 2),
+        average_daily_gain_loss=round(float(daily_pnls.mean()), 2),
+        average_daily_volume=round(n / len(daily_pnls), 2),
+        average_per_share_gain_loss=round(avg_per_share_gain_loss, 4),
+        average_trade_gain_loss=round(mean_r, 2),
+        average_winning_trade=round(avg_winning_trade, 2),
+        average_losing_trade=round(avg_losing_trade, 2),
+        total_number_of_trades=n,
+        number_of_winning_trades=len(winners),
+        number_of_losing_trades=len(losers),
+        average_hold_time_scratch_trades_seconds=round(avg_hold(is_scratch), 2),
+        average_hold_time_winning_trades_seconds=round(avg_hold(is_win), 2),
+        average_hold_time_losing_trades_seconds=round(avg_hold(is_loss), 2),
+        number_of_scratch_trades=int(is_scratch.sum()),
+        # Scratches end both kinds of streak
+        max_consecutive_wins=_longest_run(is_win),
+        max_consecutive_losses=_longest_run(is_loss),
+        trade_pnl_standard_deviation=round(trade_pnl_std_dev, 2),
+        system_quality_number_sqn=round(sqn, 2),
+        kelly_percentage=round(kelly * 100, 2),
+        profit_factor=round(profit_factor, 2),
+        total_commissions=round(total_commissions, 2),
+        total_fees=round(total_commissions, 2),
+        probability_of_random_chance=significance.probability_of_random_chance,
+        k_ratio=significance.k_ratio,
+        expectancy_ci_low=significance.expectancy_ci_low,
+        expectancy_ci_high=significance.expectancy_ci_high,
+        win_rate_ci_low=significance.win_rate_ci_low,
+        win_rate_ci_high=significance.win_rate_ci_high,
+        monte_carlo_samples=significance.monte_carlo_samples,
+        average_position_mae=_enriched_mean(trades.mae),
+        average_position_mfe=_enriched_mean(trades.mfe),
+    )
+
+
+def _duration_stats(totals: _GroupTotals, ranges: list[tuple]) -> list[DurationStats]:
+    return [
+        DurationStats(
+            range_label=label,
+            min_seconds=int(min_d),
+            max_seconds=int(max_d) if max_d != float("inf") else 999999999,
+            total_pnl=round(float(totals.pnl[i]), 2),
+            trades=int(totals.trades[i]),
+            winners=int(totals.winners[i]),
+            losers=int(totals.losers[i]),
+            win_rate=round(totals.win_rate(i), 1),
+        )
+        for i, (min_d, max_d, label) in enumerate(ranges)
+        if totals.trades[i] > 0
+    ]
+
+
+def days_times(trades: TradeArrays, timeframe: int = 60) -> DaysTimesResponse:
+    """Aggregated stats by day of week, time of day, month and duration for charts."""
+    if not len(trades):
+        return DaysTimesResponse(by_day=[], by_hour=[], by_month=[], by_duration=[], by_intraday_duration=[])
+    if timeframe not in TIMEFRAMES:
+        timeframe = 60
+
+    pnl = trades.pnl
+    days_since_epoch = trades.date.astype(np.int64)
+    by_weekday = _group_totals((days_since_epoch + _EPOCH_WEEKDAY) % 7, 7, pnl)
+    by_month = _group_totals(trades.date.astype("datetime64[M]").astype(np.int64) % 12, 12, pnl)
+
+    # Time slots of `timeframe` minutes, from entry time
+    slot_count = 24 * 60 // timeframe
+    slot_index = np.where(trades.entry_minute >= 0, trades.entry_minute // timeframe, -1)
+    by_slot = _group_totals(slot_index, slot_count, pnl)
+
+    by_duration = _group_totals(_range_index(trades.duration, DURATION_RANGES), len(DURATION_RANGES), pnl)
+    by_intraday = _group_totals(
+        _range_index(trades.duration, INTRADAY_DURATION_RANGES), len(INTRADAY_DURATION_RANGES), pnl
+    )
+
+    return DaysTimesResponse(
+        by_day=[
+            DayStats(
+                day_index=i,
+                day_name=DAY_NAMES[i],
+                total_pnl=round(float(by_weekday.pnl[i]), 2),
+                trades=int(by_weekday.trades[i]),
+                winners=int(by_weekday.winners[i]),
+                losers=int(by_weekday.losers[i]),
+                win_rate=round(by_weekday.win_rate(i), 1),
+            )
+            for i in range(7)
+        ],
+        by_hour=[
+            HourStats(
+                hour=slot * timeframe // 60,
+                hour_label=f"{slot * timeframe // 60}:{slot * timeframe % 60:02d}",
+                total_pnl=round(float(by_slot.pnl[slot]), 2),
+                trades=int(by_slot.trades[slot]),
+                winners=int(by_slot.winners[slot]),
+                losers=int(by_slot.losers[slot]),
+                win_rate=round(by_slot.win_rate(slot), 1),
+            )
+            for slot in np.flatnonzero(by_slot.trades)  # Only slots with trades
+        ],
+        by_month=[
+            MonthStats(
+                month=i + 1,
+                month_name=MONTH_NAMES[i],
+                total_pnl=round(float(by_month.pnl[i]), 2),
+                trades=int(by_month.trades[i]),
+                winners=int(by_month.winners[i]),
+                losers=int(by_month.losers[i]),
+                win_rate=round(by_month.win_rate(i), 1),
+            )
+            for i in range(12)
+        ],
+        by_duration=_duration_stats(by_duration, DURATION_RANGES),
+        by_intraday_duration=_duration_stats(by_intraday, INTRADAY_DURATION_RANGES),
+    )
+
+
+def price_volume(trades: TradeArrays) -> PriceVolumeResponse:
+    """Aggregated stats by entry price and volume/shares for charts."""
+    if not len(trades):
+        return PriceVolumeResponse(by_price=[], by_volume=[])
+
+    by_price = _group_totals(_range_index(trades.entry_price, PRICE_RANGES), len(PRICE_RANGES), trades.pnl)
+    by_volume = _group_totals(
+        _range_index(trades.shares.astype(np.float64), VOLUME_RANGES), len(VOLUME_RANGES), trades.pnl
+    )
+
+    # Only include ranges with trades
+    return PriceVolumeResponse(
+        by_price=[
+            PriceRangeStats(
+                range_label=label,
+                min_price=min_p,
+                max_price=max_p if max_p != float("inf") else 999999,
+                total_pnl=round(float(by_price.pnl[i]), 2),
+                trades=int(by_price.trades[i]),
+                winners=int(by_price.winners[i]),
+                losers=int(by_price.losers[i]),
+                win_rate=round(by_price.win_rate(i), 1),
+            )
+            for i, (min_p, max_p, label) in enumerate(PRICE_RANGES)
+            if by_price.trades[i] > 0
+        ],
+        by_volume=[
+            VolumeRangeStats(
+                range_label=label,
+                min_shares=min_v,
+                max_shares=int(max_v) if max_v != float("inf") else 999999,
+                total_pnl=round(float(by_volume.pnl[i]), 2),
+                trades=int(by_volume.trades[i]),
+                winners=int(by_volume.winners[i]),
+                losers=int(by_volume.losers[i]),
+                win_rate=round(by_volume.win_rate(i), 1),
+            )
+            for i, (min_v, max_v, label) in enumerate(VOLUME_RANGES)
+            if by_volume.trades[i] > 0
+        ],
+    )
@@ -0,0 +1,143 @@
+"""
+Statistical significance of a trade series.
+
+Probability of random chance is a Monte Carlo sign-flip test: under the null
+hypothesis of no edge every trade's P&L is equally likely to have had either
+sign, so the share of random sign assignments whose total is at least as far
+from zero as the actual total estimates the chance of the result being luck.
+Expectancy and win rate get percentile bootstrap confidence intervals.
+
+All resamples are drawn at once as a (samples x trades) matrix from a seeded
+generator, so results are reproducible. The number of samples is capped so
+that samples x trades stays under MONTE_CARLO_MAX_CELLS, which bounds time and
+memory. When that would leave fewer than MONTE_CARLO_MIN_SAMPLES (large
+accounts), the normal approximation is used instead: the sign-flipped total
+has mean 0 and variance sum(pnl^2), and the mean and win rate get the usual
+standard-error intervals. With that many trades both are accurate.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from math import erfc, sqrt
+
+import numpy as np
+
+from app.core.config import get_settings
+
+CONFIDENCE = 0.95
+Z_SCORE = 1.959964  # Two-sided 95% normal quantile
+MIN_TRADES = 3  # Fewer trades can't support any of these statistics
+
+
+@dataclass
+class SignificanceStats:
+    probability_of_random_chance: float | None = None  # Percent
+    k_ratio: float | None = None
+    expectancy_ci_low: float | None = None
+    expectancy_ci_high: float | None = None
+    win_rate_ci_low: float | None = None  # Percent
+    win_rate_ci_high: float | None = None
+    monte_carlo_samples: int = 0  # 0 when the normal approximation was used
+
+
+def sample_count(trades: int) -> int | None:
+    """
+    Resamples to draw for `trades` trades: MONTE_CARLO_SAMPLES capped by MONTE_CARLO_MAX_CELLS,
+    or None when the cap leaves fewer than MONTE_CARLO_MIN_SAMPLES.
+    """
+    settings = get_settings()
+    samples = min(settings.MONTE_CARLO_SAMPLES, settings.MONTE_CARLO_MAX_CELLS // max(trades, 1))
+    return samples if samples >= settings.MONTE_CARLO_MIN_SAMPLES else None
+
+
+def k_ratio(pnl: np.ndarray) -> float | None:
+    """
+    Kestner's original K-ratio (1996): slope of the cumulative P&L regressed on trade
+    number, divided by the slope's standard error and by sqrt(trades).
+    """
+    n = len(pnl)
+    if n < MIN_TRADES:
+        return None
+    equity = np.cumsum(pnl)
+    x = np.arange(1, n + 1, dtype=np.float64)
+    x_dev = x - x.mean()
+    sxx = float(x_dev @ x_dev)
+    slope = float(x_dev @ (equity - equity.mean())) / sxx
+    residuals = equity - (equity.mean() + slope * x_dev)
+    slope_error = sqrt(float(residuals @ residuals) / (n - 2) / sxx)
+    if slope_error == 0:
+        return None
+    return slope / (slope_error * sqrt(n))
+
+
+def _random_signs(rng: np.random.Generator, samples: int, n: int) -> np.ndarray:
+    """(samples x n) matrix of 0/1 as float32, from packed random bytes."""
+    packed = rng.integers(0, 256, size=(samples, (n + 7) // 8), dtype=np.uint8)
+    return np.unpackbits(packed, axis=1, count=n).astype(np.float32)
+
+
+def _normal_stats(pnl: np.ndarray) -> SignificanceStats:
+    """Random chance and confidence intervals from the normal approximation."""
+    n = len(pnl)
+    total = float(pnl.sum())
+    spread = sqrt(float(pnl @ pnl))
+    # Two-sided tail of N(0, sum(pnl^2)) beyond |total|
+    probability = erfc(abs(total) / (spread * sqrt(2))) * 100 if spread else 100.0
+
+    mean = total / n
+    mean_error = float(pnl.std(ddof=1)) / sqrt(n)
+    win_rate = float((pnl > 0).mean())
+    win_rate_error = sqrt(win_rate * (1 - win_rate) / n)
+    return SignificanceStats(
+        probability_of_random_chance=round(probability, 2),
+        expectancy_ci_low=round(mean - Z_SCORE * mean_error, 2),
+        expectancy_ci_high=round(mean + Z_SCORE * mean_error, 2),
+        win_rate_ci_low=round(max(win_rate - Z_SCORE * win_rate_error, 0.0) * 100, 2),
+        win_rate_ci_high=round(min(win_rate + Z_SCORE * win_rate_error, 1.0) * 100, 2),
+    )
+
+
+def _monte_carlo_stats(pnl: np.ndarray, samples: int, seed: int) -> SignificanceStats:
+    """Random chance from sign flips and percentile bootstrap confidence intervals."""
+    n = len(pnl)
+    rng = np.random.default_rng(seed)
+    tail = (1 - CONFIDENCE) / 2 * 100
+
+    # Sign flips: a flipped total is total - 2 * (sum of the flipped trades)
+    total = float(pnl.sum())
+    flipped = _random_signs(rng, samples, n) @ pnl.astype(np.float32)
+    random_totals = total - 2 * flipped.astype(np.float64)
+    # Counting the observed series as one of the samples keeps p > 0
+    as_extreme = int((np.abs(random_totals) >= abs(total)).sum())
+    probability = (as_extreme + 1) / (samples + 1) * 100
+
+    # Bootstrap: each row is n trades drawn with replacement
+    resampled = pnl[rng.integers(0, n, size=(samples, n), dtype=np.int32)]
+    expectancy_low, expectancy_high = np.percentile(resampled.mean(axis=1), [tail, 100 - tail])
+    win_rate_low, win_rate_high = np.percentile((resampled > 0).mean(axis=1) * 100, [tail, 100 - tail])
+
+    return SignificanceStats(
+        probability_of_random_chance=round(probability, 2),
+        expectancy_ci_low=round(float(expectancy_low), 2),
+        expectancy_ci_high=round(float(expectancy_high), 2),
+        win_rate_ci_low=round(float(win_rate_low), 2),
+        win_rate_ci_high=round(float(win_rate_high), 2),
+        monte_carlo_samples=samples,
+    )
+
+
+def significance_stats(pnl: np.ndarray, seed: int | None = None) -> SignificanceStats:
+    """Random-chance probability, K-ratio and confidence intervals for P&L in trade order."""
+    n = len(pnl)
+    if n < MIN_TRADES:
+        return SignificanceStats()
+
+    samples = sample_count(n)
+    if samples is None:
+        stats = _normal_stats(pnl)
+    else:
+        stats = _monte_carlo_stats(pnl, samples, get_settings().MONTE_CARLO_SEED if seed is None else seed)
+
+    ratio = k_ratio(pnl)
+    stats.k_ratio = round(ratio, 4) if ratio is not None else None
+    return stats
@@ -0,0 +1,167 @@
+"""
+User-defined trade buckets.
+
+Groups trades by entry price, share volume or hold time using an arbitrary
+list of bucket edges, or by time of day using slots of any width. Each
+request compiles to a single GROUP BY over width_bucket(...) or
+floor(extract(epoch ...) / width), so Postgres returns one row per
+non-empty bucket.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import time
+
+from sqlalchemy import Float, Integer, bindparam, cast, extract, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.trade import Trade
+from app.services.reports_engine import INTRADAY_DURATION_RANGES, PRICE_RANGES, VOLUME_RANGES
+
+MAX_EDGES = 50
+MINUTES_PER_DAY = 24 * 60
+
+EDGE_DIMENSIONS = {
+    "price": Trade.entry_price,
+    "volume": Trade.shares,
+    "duration": Trade.duration_seconds,
+}
+
+# Used when no edges are given: the fixed ranges of the detailed reports
+DEFAULT_EDGES = {
+    "price": [r[0] for r in PRICE_RANGES],
+    "volume": [r[0] for r in VOLUME_RANGES],
+    "duration": [r[0] for r in INTRADAY_DURATION_RANGES],
+}
+DEFAULT_SLOT_MINUTES = 60
+
+
+class InvalidBucketsError(ValueError):
+    """Bucket edges or slot width that can't be used."""
+
+
+@dataclass
+class Bucket:
+    label: str
+    lower: float | None  # None: open below
+    upper: float | None  # None: open above
+    total_pnl: float
+    trades: int
+    winners: int
+    losers: int
+
+
+def parse_edges(raw: str | None, dimension: str) -> list[float]:
+    """Comma-separated, strictly increasing bucket edges (the dimension's defaults when empty)."""
+    if not raw:
+        return [float(edge) for edge in DEFAULT_EDGES[dimension]]
+    try:
+        edges = [float(part) for part in raw.split(",") if part.strip()]
+    except ValueError:
+        raise InvalidBucketsError("Edges must be comma-separated numbers")
+    if not all(math.isfinite(edge) for edge in edges):
+        raise InvalidBucketsError("Edges must be finite numbers")
+    if not 1 <= len(edges) <= MAX_EDGES:
+        raise InvalidBucketsError(f"Between 1 and {MAX_EDGES} edges are allowed")
+    if any(b <= a for a, b in zip(edges, edges[1:])):
+        raise InvalidBucketsError("Edges must be strictly increasing")
+    return edges
+
+
+def _format_value(dimension: str, value: float) -> str:
+    if dimension == "duration":
+        seconds = int(value)
+        hours, rest = divmod(seconds, 3600)
+        return f"{hours}:{rest // 60:02d}:{rest % 60:02d}" if hours else f"{rest // 60}:{rest % 60:02d}"
+    return f"{value:g}"
+
+
+def _edge_label(dimension: str, lower: float | None, upper: float | None) -> str:
+    """Labels like the fixed report ranges: "$10-25", "$250+", "< $1", "100-500"."""
+    prefix = "$" if dimension == "price" else ""
+    if lower is None:
+        return f"< {prefix}{_format_value(dimension, upper)}"
+    if upper is None:
+        return f"{prefix}{_format_value(dimension, lower)}+"
+    return f"{prefix}{_format_value(dimension, lower)}-{_format_value(dimension, upper)}"
+
+
+def _totals_query(bucket, filters: list):
+    return (
+        select(
+            bucket.label("bucket"),
+            func.sum(Trade.pnl).label("pnl"),
+            func.count().label("trades"),
+            func.count().filter(Trade.pnl > 0).label("winners"),
+            func.count().filter(Trade.pnl < 0).label("losers"),
+        )
+        .where(*filters)
+        .group_by(bucket)
+        .order_by(bucket)
+    )
+
+
+async def edge_buckets(db: AsyncSession, filters: list, dimension: str, edges: list[float]) -> list[Bucket]:
+    """
+    Totals per [edges[i-1], edges[i]) bucket of `dimension`, plus the open-ended
+    buckets below the first and from the last edge. Empty buckets are omitted.
+    """
+    column = EDGE_DIMENSIONS[dimension]
+    # width_bucket: 0 below edges[0], i for edges[i-1] <= x < edges[i], len(edges) from the last edge
+    bucket = func.width_bucket(cast(column, Float), bindparam("edges", edges, type_=ARRAY(Float)))
+    result = await db.execute(_totals_query(bucket, [*filters, column.isnot(None)]))
+
+    buckets = []
+    for row in result:
+        lower = edges[row.bucket - 1] if row.bucket > 0 else None
+        upper = edges[row.bucket] if row.bucket < len(edges) else None
+        buckets.append(Bucket(
+            label=_edge_label(dimension, lower, upper),
+            lower=lower,
+            upper=upper,
+            total_pnl=row.pnl,
+            trades=row.trades,
+            winners=row.winners,
+            losers=row.losers,
+        ))
+    return buckets
+
+
+async def time_slot_buckets(
+    db: AsyncSession,
+    filters: list,
+    slot_minutes: int,
+    start_time: time | None = None,
+    end_time: time | None = None,
+) -> list[Bucket]:
+    """
+    Totals per entry-time slot of `slot_minutes`, optionally limited to entries in
+    [start_time, end_time). Bounds are minutes after midnight; empty slots are omitted.
+    """
+    if not 1 <= slot_minutes <= MINUTES_PER_DAY or MINUTES_PER_DAY % slot_minutes:
+        raise InvalidBucketsError("Slot width must be a whole number of minutes that divides 24 hours")
+
+    filters = [*filters, Trade.entry_time.isnot(None)]
+    if start_time:
+        filters.append(Trade.entry_time >= start_time)
+    if end_time:
+        filters.append(Trade.entry_time < end_time)
+
+    bucket = cast(func.floor(extract("epoch", Trade.entry_time) / (slot_minutes * 60)), Integer)
+    result = await db.execute(_totals_query(bucket, filters))
+
+    buckets = []
+    for row in result:
+        start = row.bucket * slot_minutes
+        buckets.append(Bucket(
+            label=f"{start // 60}:{start % 60:02d}",
+            lower=start,
+            upper=start + slot_minutes,
+            total_pnl=row.pnl,
+            trades=row.trades,
+            winners=row.winners,
+            losers=row.losers,
+        ))
+    return buckets
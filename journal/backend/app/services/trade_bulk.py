@@ -0,0 +1,109 @@
+"""
+Bulk trade mutations.
+
+Every operation is a handful of set-based statements against trades and
+trade_tags, scoped to one user. Callers commit, so a bulk request is applied
+in a single transaction or not at all.
+"""
+from sqlalchemy import delete, func, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.tag import Tag, trade_tags
+from app.models.trade import Trade
+
+
+class UnknownTagsError(ValueError):
+    """Raised when tag ids don't exist or belong to another user."""
+
+    def __init__(self, tag_ids: list[int]):
+        self.tag_ids = tag_ids
+        super().__init__(f"Unknown tag ids: {', '.join(map(str, tag_ids))}")
+
+
+async def validate_tag_ids(db: AsyncSession, user_id: int, tag_ids: list[int]) -> list[int]:
+    """Deduplicated tag ids, all owned by the user. Raises UnknownTagsError otherwise."""
+    tag_ids = sorted(set(tag_ids))
+    if not tag_ids:
+        return []
+
+    result = await db.execute(select(Tag.id).where(Tag.user_id == user_id, Tag.id.in_(tag_ids)))
+    found = set(result.scalars().all())
+    missing = [tag_id for tag_id in tag_ids if tag_id not in found]
+    if missing:
+        raise UnknownTagsError(missing)
+    return tag_ids
+
+
+def _selected_trade_ids(filters: list):
+    return select(Trade.id).where(*filters)
+
+
+async def update_trades(db: AsyncSession, filters: list, values: dict) -> int:
+    """Set the same column values on every selected trade. Keeps net_pnl in step with commissions."""
+    if not values:
+        return 0
+
+    values = dict(values)
+    if "ticker" in values and values["ticker"]:
+        values["ticker"] = values["ticker"].upper()
+    if "commissions" in values:
+        values["net_pnl"] = Trade.pnl - values["commissions"]
+
+    result = await db.execute(
+        update(Trade)
+        .where(*filters)
+        .values(**values, updated_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def add_tags(db: AsyncSession, filters: list, tag_ids: list[int]) -> int:
+    """Tag every selected trade with each tag (existing pairs are left alone). Returns pairs added."""
+    if not tag_ids:
+        return 0
+
+    pairs = (
+        select(Trade.id, Tag.id)
+        .join(Tag, Tag.id.in_(tag_ids))
+        .where(*filters)
+    )
+    result = await db.execute(
+        pg_insert(trade_tags)
+        .from_select(["trade_id", "tag_id"], pairs)
+        .on_conflict_do_nothing()
+        .returning(literal_column("1"))
+    )
+    return len(result.all())
+
+
+async def remove_tags(db: AsyncSession, filters: list, tag_ids: list[int]) -> int:
+    """Remove the tags from every selected trade. Returns pairs removed."""
+    if not tag_ids:
+        return 0
+
+    result = await db.execute(
+        delete(trade_tags).where(
+            trade_tags.c.tag_id.in_(tag_ids),
+            trade_tags.c.trade_id.in_(_selected_trade_ids(filters)),
+        )
+    )
+    return result.rowcount
+
+
+async def set_tags(db: AsyncSession, filters: list, tag_ids: list[int]):
+    """Replace the tags of every selected trade with exactly `tag_ids`."""
+    delete_stmt = delete(trade_tags).where(trade_tags.c.trade_id.in_(_selected_trade_ids(filters)))
+    if tag_ids:
+        delete_stmt = delete_stmt.where(trade_tags.c.tag_id.not_in(tag_ids))
+    await db.execute(delete_stmt)
+    await add_tags(db, filters, tag_ids)
+
+
+async def delete_trades(db: AsyncSession, filters: list) -> int:
+    """Delete the selected trades (their trade_tags rows cascade)."""
+    result = await db.execute(
+        delete(Trade).where(*filters).execution_options(synchronize_session=False)
+    )
+    return result.rowcount
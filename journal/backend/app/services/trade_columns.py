@@ -0,0 +1,113 @@
+"""
+Columnar trade loader.
+
+Read paths that need per-trade values load them as NumPy arrays rather than ORM
+objects or result rows. The Core SELECT of just the requested columns is run
+as COPY ... TO STDOUT (FORMAT binary) on the session's asyncpg connection, and
+the binary stream is viewed as a structured array with np.frombuffer, so no
+Python object is created per trade or per value.
+
+That works because every row has the same size: each column is a fixed-width
+type (int4, float8, bool) and NULLs are replaced in SQL. Dates are sent as day
+counts since the epoch and times as seconds after midnight. Rows are put in
+date / entry time / id order with np.lexsort instead of an ORDER BY, which
+spares Postgres a sort of the whole selection.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+from sqlalchemy import Float, Integer, cast, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.trade import Trade, TradeSide
+
+MISSING_TIME = -1  # Seconds-after-midnight value for a NULL entry/exit time
+SECONDS_PER_DAY = 24 * 60 * 60
+
+_NAN = literal_column("'NaN'::float8", Float)
+
+# COPY binary framing: 11-byte signature, int32 flags, int32 header extension length; int16 -1 trailer
+_HEADER_SIZE = 19
+_TRAILER_SIZE = 2
+
+
+def _seconds_of_day(column):
+    # floor: a cast alone rounds, moving 09:59:59.6 into the next minute
+    return func.coalesce(cast(func.floor(func.extract("epoch", column)), Integer), MISSING_TIME)
+
+
+@dataclass(frozen=True)
+class _Column:
+    expression: object  # Never NULL
+    wire: str  # Big-endian dtype of the binary COPY value
+    dtype: str  # dtype of the loaded array
+
+
+COLUMNS = {
+    "id": _Column(Trade.id, ">i4", "int64"),
+    "date": _Column(Trade.date - date(1970, 1, 1), ">i4", "datetime64[D]"),  # date - date is a day count
+    "entry_time": _Column(_seconds_of_day(Trade.entry_time), ">i4", "int64"),  # MISSING_TIME when NULL
+    "exit_time": _Column(_seconds_of_day(Trade.exit_time), ">i4", "int64"),
+    "duration": _Column(func.coalesce(cast(Trade.duration_seconds, Float), _NAN), ">f8", "float64"),  # NaN when NULL
+    "is_long": _Column(Trade.side == TradeSide.LONG, "?", "bool"),
+    "entry_price": _Column(Trade.entry_price, ">f8", "float64"),
+    "exit_price": _Column(Trade.exit_price, ">f8", "float64"),
+    "shares": _Column(Trade.shares, ">i4", "int64"),
+    "pnl": _Column(Trade.pnl, ">f8", "float64"),
+    "commissions": _Column(func.coalesce(Trade.commissions, 0.0), ">f8", "float64"),
+    "net_pnl": _Column(func.coalesce(Trade.net_pnl, _NAN), ">f8", "float64"),
+    "mae": _Column(func.coalesce(Trade.mae, _NAN), ">f8", "float64"),
+    "mfe": _Column(func.coalesce(Trade.mfe, _NAN), ">f8", "float64"),
+}
+
+# Always loaded: they define the row order
+_ORDER_COLUMNS = ("date", "entry_time", "id")
+
+
+def _row_dtype(names: list[str]) -> np.dtype:
+    """One binary COPY tuple: int16 field count, then an int32 length before each value."""
+    fields = [("fields", ">i2")]
+    for name in names:
+        fields += [(f"{name}_length", ">i4"), (name, COLUMNS[name].wire)]
+    return np.dtype(fields)
+
+
+async def _copy_binary(db: AsyncSession, query) -> bytes:
+    """Run `query` as a binary COPY on the session's connection (and transaction)."""
+    connection = await db.connection()
+    compiled = query.compile(dialect=connection.dialect)
+    params = compiled.construct_params()
+    args = []
+    for name in compiled.positiontup:
+        process = compiled.binds[name].type.bind_processor(connection.dialect)
+        args.append(process(params[name]) if process else params[name])
+
+    raw = (await connection.get_raw_connection()).driver_connection
+    data = bytearray()
+
+    async def write(chunk: bytes):
+        data.extend(chunk)
+
+    await raw.copy_from_query(str(compiled), *args, output=write, format="binary")
+    return data
+
+
+async def load_trade_columns(db: AsyncSession, filters: list, columns: list[str]) -> dict[str, np.ndarray]:
+    """
+    Arrays of the named COLUMNS for trades matching `filters`, ordered by date, entry
+    time (trades without one last) and id. The order keys are always included.
+    """
+    names = list(dict.fromkeys([*_ORDER_COLUMNS, *columns]))
+    query = select(*(COLUMNS[name].expression for name in names)).where(*filters)
+    data = await _copy_binary(db, query)
+
+    row = _row_dtype(names)
+    start = _HEADER_SIZE + int.from_bytes(data[15:19], "big")
+    rows = np.frombuffer(data, dtype=row, offset=start, count=(len(data) - start - _TRAILER_SIZE) // row.itemsize)
+
+    entry_key = np.where(rows["entry_time"] == MISSING_TIME, SECONDS_PER_DAY, rows["entry_time"])
+    order = np.lexsort((rows["id"], entry_key, rows["date"]))
+    return {name: rows[name][order].astype(COLUMNS[name].dtype) for name in names}
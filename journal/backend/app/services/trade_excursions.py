@@ -0,0 +1,234 @@
+"""
+MAE/MFE enrichment from 1-minute bars.
+
+A user's pending trades are grouped by (ticker, date) and each day's minute
+bars are fetched once from the analytics API, which serves the
+`ohlcv_intraday_1m` files it already stores. Every trade of the day is then
+sliced out of the same bar arrays by entry/exit time in one vectorized pass,
+and the in-trade high/low, MAE/MFE and the day's high/low are written back in
+a single executemany UPDATE.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+
+import httpx
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import bump_data_version
+from app.core.config import get_settings
+from app.models.trade import Trade, TradeSide
+
+FETCH_CONCURRENCY = 8
+DEFAULT_MAX_DAYS = 500
+
+# Changing any of these makes a trade's stored excursions stale
+PRICE_PATH_FIELDS = frozenset({"date", "ticker", "side", "entry_time", "exit_time", "entry_price", "shares"})
+
+
+class ExcursionsUnavailableError(RuntimeError):
+    """The analytics API isn't configured."""
+
+
+@dataclass
+class MinuteBars:
+    start: np.ndarray  # Seconds after midnight of each bar's open, ascending
+    high: np.ndarray
+    low: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+
+@dataclass
+class Excursions:
+    """Per-trade results, parallel to the trades passed in; NaN where no bar covers the trade."""
+    trade_high: np.ndarray
+    trade_low: np.ndarray
+    mae: np.ndarray
+    mfe: np.ndarray
+
+
+@dataclass
+class EnrichmentResult:
+    trades_enriched: int = 0
+    trades_without_bars: int = 0
+    days_loaded: int = 0
+    days_remaining: int = 0  # Pending days beyond max_days, left for the next run
+
+
+def _clock_seconds(value: str) -> int:
+    """Seconds after midnight of "HH:MM" or "HH:MM:SS"."""
+    parts = value.split(":")
+    return int(parts[0]) * 3600 + int(parts[1]) * 60 + (int(float(parts[2])) if len(parts) > 2 else 0)
+
+
+def parse_candles(candles: list[dict]) -> MinuteBars:
+    """Bars from the analytics intraday response, dropping candles without a high/low."""
+    rows = [(_clock_seconds(c["time"]), c["high"], c["low"]) for c in candles if c.get("high") is not None and c.get("low") is not None]
+    rows.sort(key=lambda row: row[0])
+    start, high, low = zip(*rows) if rows else ((), (), ())
+    return MinuteBars(
+        start=np.array(start, dtype=np.int64),
+        high=np.array(high, dtype=np.float64),
+        low=np.array(low, dtype=np.float64),
+    )
+
+
+async def fetch_minute_bars(client: httpx.AsyncClient, ticker: str, day: date) -> MinuteBars | None:
+    """A day's 1-minute bars, or None when the analytics API has no data for it."""
+    response = await client.get(f"/api/tickers/{ticker}/intraday/{day.isoformat()}", params={"timeframe": 1})
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return parse_candles(response.json().get("candles", []))
+
+
+def _range_reduce(ufunc: np.ufunc, values: np.ndarray, sentinel: float, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """ufunc.reduce over values[starts[i]:ends[i]] for every i (all slices non-empty)."""
+    # reduceat over interleaved (start, end) pairs: even outputs are the slices we want.
+    # The sentinel lets an end equal to len(values) be used as an index.
+    padded = np.append(values, sentinel)
+    return ufunc.reduceat(padded, np.column_stack((starts, ends)).ravel())[::2]
+
+
+def compute_excursions(
+    bars: MinuteBars,
+    entry_seconds: np.ndarray,
+    exit_seconds: np.ndarray,
+    is_long: np.ndarray,
+    entry_price: np.ndarray,
+    shares: np.ndarray,
+) -> Excursions:
+    """
+    In-trade high/low and dollar MAE/MFE for trades of one ticker and day. A trade
+    covers every bar from the one containing its entry up to the one containing its exit.
+    """
+    n = len(entry_seconds)
+    trade_high = np.full(n, np.nan)
+    trade_low = np.full(n, np.nan)
+
+    starts = np.searchsorted(bars.start, entry_seconds - entry_seconds % 60, side="left")
+    ends = np.searchsorted(bars.start, exit_seconds, side="right")
+    covered = ends > starts
+    if covered.any():
+        trade_high[covered] = _range_reduce(np.maximum, bars.high, -np.inf, starts[covered], ends[covered])
+        trade_low[covered] = _range_reduce(np.minimum, bars.low, np.inf, starts[covered], ends[covered])
+
+    # Long: up is favorable; short: down is favorable
+    favorable = np.where(is_long, trade_high - entry_price, entry_price - trade_low) * shares
+    adverse = np.where(is_long, trade_low - entry_price, entry_price - trade_high) * shares
+    return Excursions(
+        trade_high=trade_high,
+        trade_low=trade_low,
+        mae=np.minimum(adverse, 0.0),
+        mfe=np.maximum(favorable, 0.0),
+    )
+
+
+def _seconds(values) -> np.ndarray:
+    return np.array([t.hour * 3600 + t.minute * 60 + t.second for t in values], dtype=np.int64)
+
+
+def _round(value: float) -> float | None:
+    return None if np.isnan(value) else round(float(value), 4)
+
+
+def _group_updates(rows: list, bars: MinuteBars | None, enriched_at: datetime) -> list[dict]:
+    """UPDATE parameters for one (ticker, date) group."""
+    if bars is None or not len(bars):
+        return [{"id": row.id, "excursions_at": enriched_at} for row in rows]
+
+    result = compute_excursions(
+        bars,
+        entry_seconds=_seconds(row.entry_time for row in rows),
+        exit_seconds=_seconds(row.exit_time for row in rows),
+        is_long=np.array([row.side == TradeSide.LONG for row in rows]),
+        entry_price=np.array([row.entry_price for row in rows], dtype=np.float64),
+        shares=np.array([row.shares for row in rows], dtype=np.float64),
+    )
+    day_high, day_low = float(bars.high.max()), float(bars.low.min())
+    return [
+        {
+            "id": row.id,
+            "high_of_day": day_high,
+            "low_of_day": day_low,
+            "trade_high": _round(result.trade_high[i]),
+            "trade_low": _round(result.trade_low[i]),
+            "mae": None if np.isnan(result.mae[i]) else round(float(result.mae[i]), 2),
+            "mfe": None if np.isnan(result.mfe[i]) else round(float(result.mfe[i]), 2),
+            "excursions_at": enriched_at,
+        }
+        for i, row in enumerate(rows)
+    ]
+
+
+async def enrich_trades(db: AsyncSession, user_id: int, max_days: int = DEFAULT_MAX_DAYS) -> EnrichmentResult:
+    """
+    Fill MAE/MFE for trades with entry and exit times that haven't been enriched,
+    loading at most `max_days` (ticker, date) groups of minute bars. Days the
+    analytics API has no data for are marked done with the values left NULL;
+    fetch errors and unreadable responses leave their trades pending.
+    """
+    settings = get_settings()
+    if not settings.ANALYTICS_API_URL:
+        raise ExcursionsUnavailableError("ANALYTICS_API_URL is not configured")
+
+    query = (
+        select(Trade.id, Trade.date, Trade.ticker, Trade.side, Trade.entry_time, Trade.exit_time,
+               Trade.entry_price, Trade.shares)
+        .where(
+            Trade.user_id == user_id,
+            Trade.excursions_at.is_(None),
+            Trade.entry_time.is_not(None),
+            Trade.exit_time.is_not(None),
+            Trade.exit_time >= Trade.entry_time,
+        )
+        .order_by(Trade.date, Trade.ticker)
+    )
+    groups: dict[tuple[str, date], list] = {}
+    for row in (await db.execute(query)).all():
+        groups.setdefault((row.ticker, row.date), []).append(row)
+
+    keys = list(groups)[:max_days]
+    result = EnrichmentResult(days_remaining=len(groups) - len(keys))
+    if not keys:
+        return result
+
+    enriched_at = datetime.now(timezone.utc)
+    today = date.today()
+    semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+    async def load_group(client: httpx.AsyncClient, key: tuple[str, date]) -> list[dict]:
+        ticker, day = key
+        async with semaphore:
+            try:
+                bars = await fetch_minute_bars(client, ticker, day)
+            except (httpx.HTTPError, ValueError):
+                # Includes a response body that isn't JSON (e.g. a proxy error page)
+                return []
+        # Today's bars may still be coming in; try again on the next run
+        if bars is None and day >= today:
+            return []
+        # Reduce each day as soon as it arrives so only FETCH_CONCURRENCY days of bars are held
+        return _group_updates(groups[key], bars, enriched_at)
+
+    async with httpx.AsyncClient(
+        base_url=settings.ANALYTICS_API_URL, timeout=settings.ANALYTICS_TIMEOUT_SECONDS
+    ) as client:
+        batches = await asyncio.gather(*(load_group(client, key) for key in keys))
+
+    params = [row for batch in batches for row in batch]
+    result.days_loaded = sum(1 for batch in batches if batch and "mae" in batch[0])
+    result.trades_enriched = sum(1 for row in params if "mae" in row)
+    result.trades_without_bars = len(params) - result.trades_enriched
+
+    if params:
+        # ORM bulk UPDATE by primary key (executemany)
+        await db.execute(update(Trade), params)
+        await bump_data_version(db, user_id)
+    return result
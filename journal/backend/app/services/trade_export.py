@@ -0,0 +1,146 @@
+"""
+Trade export.
+
+Streams a user's trades as CSV, NDJSON or Parquet. Rows come from a server-side
+cursor in batches of plain column tuples (no ORM objects) and each batch is
+encoded and sent before the next is fetched, so memory stays flat regardless
+of how many trades are exported.
+"""
+import csv
+import io
+import json
+from typing import AsyncIterator
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.models.trade import Trade
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+EXPORT_BATCH_SIZE = 5000
+
+EXPORT_COLUMNS = [
+    Trade.id, Trade.date, Trade.ticker, Trade.side, Trade.entry_time, Trade.exit_time,
+    Trade.duration_seconds, Trade.entry_price, Trade.exit_price, Trade.shares, Trade.pnl,
+    Trade.pnl_percent, Trade.commissions, Trade.net_pnl, Trade.setup, Trade.notes,
+]
+COLUMN_NAMES = [column.key for column in EXPORT_COLUMNS]
+
+PARQUET_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("date", pa.date32()),
+    ("ticker", pa.string()),
+    ("side", pa.string()),
+    ("entry_time", pa.time64("us")),
+    ("exit_time", pa.time64("us")),
+    ("duration_seconds", pa.int64()),
+    ("entry_price", pa.float64()),
+    ("exit_price", pa.float64()),
+    ("shares", pa.int64()),
+    ("pnl", pa.float64()),
+    ("pnl_percent", pa.float64()),
+    ("commissions", pa.float64()),
+    ("net_pnl", pa.float64()),
+    ("setup", pa.string()),
+    ("notes", pa.string()),
+])
+
+_SIDE_INDEX = COLUMN_NAMES.index("side")
+
+
+class _DrainingSink:
+    """Write-only file for ParquetWriter that hands back what was written since the last drain."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+async def _batches(filters: list) -> AsyncIterator[list[tuple]]:
+    """Rows matching `filters` from a server-side cursor, EXPORT_BATCH_SIZE at a time."""
+    query = (
+        select(*EXPORT_COLUMNS)
+        .where(*filters)
+        .order_by(Trade.date, Trade.entry_time, Trade.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    # Own session: the request's session is closed before a streaming body is sent
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query)
+        async for partition in result.partitions():
+            yield [
+                row[:_SIDE_INDEX] + (row[_SIDE_INDEX].value,) + row[_SIDE_INDEX + 1:]
+                for row in partition
+            ]
+
+
+async def _csv_stream(filters: list) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMN_NAMES)
+    async for rows in _batches(filters):
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def _ndjson_stream(filters: list) -> AsyncIterator[bytes]:
+    async for rows in _batches(filters):
+        lines = [json.dumps(dict(zip(COLUMN_NAMES, row)), default=str) for row in rows]
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def _parquet_stream(filters: list) -> AsyncIterator[bytes]:
+    # Each batch becomes one row group; the footer is written on close
+    sink = _DrainingSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), PARQUET_SCHEMA)
+    try:
+        async for rows in _batches(filters):
+            columns = list(zip(*rows))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, PARQUET_SCHEMA)],
+                schema=PARQUET_SCHEMA,
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def stream_trades(filters: list, export_format: str) -> AsyncIterator[bytes]:
+    """Encoded export body for the trades matching `filters`."""
+    if export_format == "csv":
+        return _csv_stream(filters)
+    if export_format == "ndjson":
+        return _ndjson_stream(filters)
+    return _parquet_stream(filters)
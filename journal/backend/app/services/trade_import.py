@@ -0,0 +1,419 @@
+"""
+Trade import pipeline.
+
+Parses broker CSV/Excel exports into normalized trade columns with vectorized
+pandas operations and writes them with a single bulk statement instead of one
+ORM object per row. Every imported trade carries a fingerprint, so re-importing
+an overlapping export only adds the trades that are new.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import Counter
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.trade import Trade, TradeSide
+from app.services.execution_matcher import match_executions
+from app.services.trade_parsing import normalize_columns, read_header, read_trades_file, iter_trades_file  # noqa: F401
+
+# Map common column names (keeping original for mapping)
+COLUMN_MAPPING = {
+    "stock": "ticker",
+    "direction": "side",
+    "type": "side",
+    "entry": "entry_price",
+    "exit": "exit_price",
+    "qty": "shares",
+    "profit": "pnl",
+    "p&l": "pnl",
+    "profit/loss": "pnl",
+    "fees": "commissions",
+    "commission": "commissions",
+}
+
+# Dates in upload filenames: 2024-03-15 / 20240315, or 03-15-2024
+_FILENAME_YMD = re.compile(r"(20\d{2})[-_.]?(\d{2})[-_.]?(\d{2})")
+_FILENAME_MDY = re.compile(r"(\d{1,2})[-_.](\d{1,2})[-_.](20\d{2})")
+DAS_DATE_REQUIRED = "DAS Trader files have no date column; pass trade_date or put the date in the filename"
+
+# Columns written by the bulk insert, in COPY order
+INSERT_COLUMNS = [
+    "user_id", "date", "ticker", "side", "entry_time", "exit_time", "duration_seconds",
+    "entry_price", "exit_price", "shares", "pnl", "commissions", "net_pnl",
+]
+UPSERT_COLUMNS = INSERT_COLUMNS + ["fingerprint"]
+# Not part of the fingerprint, so a re-import may carry corrected values
+UPDATABLE_COLUMNS = ["duration_seconds", "pnl", "commissions", "net_pnl"]
+
+_STAGING_TABLE = "trades_import_staging"
+
+
+def is_tradervue_format(df: pd.DataFrame) -> bool:
+    """Check if the dataframe is in Tradervue execution format."""
+    cols = set(df.columns)
+    # Tradervue has: Date, Time, Symbol, Quantity, Price, Side
+    # But NOT entry_price/exit_price (those are complete trade formats)
+    has_tradervue_cols = {"symbol", "price", "quantity", "side"}.issubset(cols)
+    has_trade_cols = "entry_price" in cols or "exit_price" in cols
+    return has_tradervue_cols and not has_trade_cols
+
+
+def is_das_format(df: pd.DataFrame) -> bool:
+    """Check if the dataframe is a DAS Trader trades export (Time, Symb, Side, Price, Qty, ...)."""
+    cols = set(df.columns)
+    # DAS has no date column; the trade date comes from the upload or the filename
+    return {"time", "symb", "side", "price", "qty"}.issubset(cols) and "date" not in cols
+
+
+def is_execution_format(df: pd.DataFrame) -> bool:
+    """Check if a parsed upload holds executions (one row per fill) rather than complete trades."""
+    return is_das_format(df) or is_tradervue_format(df.rename(columns=COLUMN_MAPPING))
+
+
+def resolve_trade_date(trade_date: date | None, filename: str | None) -> date | None:
+    """Trade date for files without a date column: the explicit value, else a date in the filename."""
+    if trade_date:
+        return trade_date
+
+    name = filename or ""
+    match = _FILENAME_YMD.search(name)
+    if match:
+        year, month, day = (int(g) for g in match.groups())
+    else:
+        match = _FILENAME_MDY.search(name)
+        if not match:
+            return None
+        month, day, year = (int(g) for g in match.groups())
+
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+def prepare_das_executions(df: pd.DataFrame, trade_date: date) -> pd.DataFrame:
+    """Map a DAS Trader export onto the execution columns used by the matcher."""
+    executions = pd.DataFrame({
+        "date": trade_date,
+        "time": _parse_times(df["time"]),
+        "symbol": df["symb"].astype("string").str.strip(),
+        # "B Open" / "S Close" carry the open/close flag after the side
+        "side": df["side"].astype("string").str.strip().str.split(" ", n=1).str[0],
+        "quantity": df["qty"],
+        "price": df["price"],
+    }, index=df.index)
+    executions["account"] = df["account"].fillna("") if "account" in df.columns else ""
+    return executions
+
+
+def _parse_clock_strings(text: pd.Series) -> pd.Series:
+    """Decode "HH:MM:SS"/"H:MM:SS" strings straight from their bytes. Others come back NaT."""
+    parsed = pd.Series(pd.NaT, index=text.index, dtype="timedelta64[ns]")
+
+    lengths = text.str.len().fillna(0).to_numpy()
+    candidates = (lengths == 7) | (lengths == 8)
+    if not candidates.any():
+        return parsed
+
+    padded = text[candidates].str.zfill(8).tolist()
+    try:
+        digits = np.array(padded, dtype="S8").view(np.uint8).reshape(-1, 8).astype(np.int64) - ord("0")
+    except UnicodeEncodeError:
+        return parsed
+    numbers = digits[:, [0, 1, 3, 4, 6, 7]]
+    ok = (
+        (digits[:, 2] == ord(":") - ord("0"))
+        & (digits[:, 5] == ord(":") - ord("0"))
+        & ((numbers >= 0) & (numbers <= 9)).all(axis=1)
+        # Minutes and seconds above 59 would roll over; leave them to to_datetime, which rejects them
+        & (numbers[:, 2] <= 5)
+        & (numbers[:, 4] <= 5)
+    )
+
+    seconds = (
+        (numbers[:, 0] * 10 + numbers[:, 1]) * 3600
+        + (numbers[:, 2] * 10 + numbers[:, 3]) * 60
+        + numbers[:, 4] * 10 + numbers[:, 5]
+    )
+    index = text.index[candidates][ok]
+    parsed[index] = pd.to_timedelta(seconds[ok], unit="s")
+    return parsed
+
+
+def _parse_times(values: pd.Series) -> pd.Series:
+    """Parse a column of times ("09:32:15", "9:32 AM", datetimes) into timedeltas since midnight."""
+    if pd.api.types.is_timedelta64_dtype(values):
+        return values
+
+    text = values.astype("string").str.strip()
+    parsed = _parse_clock_strings(text)
+
+    # Anything that isn't a plain HH:MM:SS (AM/PM, full datetimes) goes through to_datetime
+    retry = parsed.isna() & text.notna() & (text != "")
+    if retry.any():
+        as_datetime = pd.to_datetime(text[retry], errors="coerce", format="mixed")
+        parsed[retry] = as_datetime - as_datetime.dt.normalize()
+
+    # Only same-day clock times are valid
+    parsed[(parsed < pd.Timedelta(0)) | (parsed >= pd.Timedelta(days=1))] = pd.NaT
+    return parsed
+
+
+def _present(values: pd.Series) -> pd.Series:
+    """Cells that hold a value (not NaN/None and not blank)."""
+    return values.notna() & (values.astype("string").str.strip() != "")
+
+
+def _report_invalid(errors: list[str], df: pd.DataFrame, column: str, invalid: pd.Series):
+    for idx in df.index[invalid][:10]:
+        errors.append(f"Row {idx + 1}: invalid {column} {df.at[idx, column]!r}")
+
+
+def _numeric(df: pd.DataFrame, column: str, errors: list[str], bad: pd.Series) -> pd.Series:
+    """Column as floats; missing cells are 0, unparseable ones are reported and marked in `bad`."""
+    if column not in df.columns:
+        return pd.Series(0.0, index=df.index)
+    values = pd.to_numeric(df[column], errors="coerce")
+    invalid = values.isna() & _present(df[column])
+    _report_invalid(errors, df, column, invalid)
+    bad |= invalid
+    return values.fillna(0.0)
+
+
+def _times(df: pd.DataFrame, column: str, errors: list[str], bad: pd.Series) -> pd.Series:
+    """Column as timedeltas since midnight; unparseable times are reported and marked in `bad`."""
+    if column not in df.columns:
+        return pd.Series(pd.NaT, index=df.index, dtype="timedelta64[ns]")
+    parsed = _parse_times(df[column])
+    invalid = parsed.isna() & _present(df[column])
+    _report_invalid(errors, df, column, invalid)
+    bad |= invalid
+    return parsed
+
+
+def normalize_trades(df: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
+    """
+    Normalize complete-trade rows into the Trade columns in one vectorized pass.
+    Returns (normalized frame, row errors). Rows without a ticker or shares are skipped;
+    rows with an unparseable date, time or number are reported and skipped. Missing
+    numbers default to 0.
+    """
+    errors: list[str] = []
+    if df.empty:
+        return pd.DataFrame(columns=INSERT_COLUMNS[1:]), errors
+
+    out = pd.DataFrame(index=df.index)
+
+    # Parse date
+    if "date" in df.columns:
+        parsed_dates = pd.to_datetime(df["date"], errors="coerce", format="mixed")
+        bad = parsed_dates.isna()
+        _report_invalid(errors, df, "date", bad)
+        out["date"] = parsed_dates.dt.date
+    else:
+        bad = pd.Series(False, index=df.index)
+        out["date"] = date.today()
+
+    # Parse side
+    side_text = df["side"].astype(str).str.lower() if "side" in df.columns else pd.Series("long", index=df.index)
+    out["side"] = side_text.str.contains("short", regex=False).map({True: TradeSide.SHORT.value, False: TradeSide.LONG.value})
+
+    ticker = df["ticker"] if "ticker" in df.columns else pd.Series(None, index=df.index, dtype=object)
+    out["ticker"] = ticker.astype("string").str.upper().str.strip()
+
+    # Parse times and calculate duration_seconds from entry and exit times
+    entry_td = _times(df, "entry_time", errors, bad)
+    exit_td = _times(df, "exit_time", errors, bad)
+    midnight = pd.Timestamp(0)
+    out["entry_time"] = (midnight + entry_td).dt.time
+    out["exit_time"] = (midnight + exit_td).dt.time
+    duration = (exit_td - entry_td).dt.total_seconds()
+    out["duration_seconds"] = duration.where(duration >= 0)  # Negative = overnight trade
+
+    # Get numeric values
+    out["entry_price"] = _numeric(df, "entry_price", errors, bad)
+    out["exit_price"] = _numeric(df, "exit_price", errors, bad)
+    out["shares"] = _numeric(df, "shares", errors, bad).astype(int)
+    out["pnl"] = _numeric(df, "pnl", errors, bad)
+    out["commissions"] = _numeric(df, "commissions", errors, bad)
+    out["net_pnl"] = out["pnl"] - out["commissions"]
+
+    # Skip invalid rows
+    valid = ticker.notna() & (out["ticker"].fillna("") != "") & (out["shares"] > 0) & ~bad
+    return out[valid].reset_index(drop=True), errors
+
+
+def prepare_trades(
+    df: pd.DataFrame,
+    trade_date: date | None = None,
+    filename: str | None = None,
+) -> tuple[pd.DataFrame, list[str]]:
+    """
+    Detect the file format and turn a parsed upload into normalized trade columns.
+    `trade_date`/`filename` supply the date for formats without a date column (DAS Trader).
+    """
+    # DAS is detected before the renames ("type" would otherwise become a second side column)
+    if is_das_format(df):
+        resolved_date = resolve_trade_date(trade_date, filename)
+        if resolved_date is None:
+            raise ValueError(DAS_DATE_REQUIRED)
+
+        # Positions are tracked per account, so the same symbol in two accounts never nets out
+        executions = prepare_das_executions(df, resolved_date)
+        df, match_errors = match_executions(executions, group_columns=("account", "symbol", "date"))
+        trades, errors = normalize_trades(df)
+        return trades, match_errors + errors
+
+    df = df.rename(columns=COLUMN_MAPPING)
+
+    # Check if this is Tradervue execution format
+    if is_tradervue_format(df):
+        # Parse dates and times first for grouping and ordering
+        if "date" in df.columns:
+            df["date"] = pd.to_datetime(df["date"]).dt.date
+        else:
+            df["date"] = resolve_trade_date(trade_date, filename) or date.today()
+        if "time" in df.columns:
+            df["time"] = _parse_times(df["time"])
+
+        # Match executions into round-trip trades
+        df, match_errors = match_executions(df)
+        trades, errors = normalize_trades(df)
+        return trades, match_errors + errors
+    else:
+        # Original complete trade format
+        # Map symbol to ticker if present
+        if "symbol" in df.columns and "ticker" not in df.columns:
+            df = df.rename(columns={"symbol": "ticker"})
+        if "quantity" in df.columns and "shares" not in df.columns:
+            df = df.rename(columns={"quantity": "shares"})
+
+    return normalize_trades(df)
+
+
+def _seconds_of_day(values: pd.Series) -> np.ndarray:
+    """datetime.time values as seconds since midnight (-1 for missing)."""
+    return np.array(
+        [-1 if t is None or t is pd.NaT or t != t else t.hour * 3600 + t.minute * 60 + t.second for t in values.tolist()],
+        dtype=np.int64,
+    )
+
+
+def trade_fingerprints(df: pd.DataFrame, user_id: int, seen: Counter | None = None) -> list[str]:
+    """
+    Deterministic identity of each normalized trade: sha1 over user, date, ticker,
+    side, entry/exit time, entry/exit price (to 1e-6) and shares. Identical trades
+    in the same file (e.g. two equal scalps) are told apart by their occurrence
+    number, so they are all kept while re-importing the file still yields the same
+    fingerprints. Pass the same `seen` counter for every chunk of one file.
+    """
+    if df.empty:
+        return []
+
+    fields = np.column_stack([
+        np.full(len(df), user_id, dtype=np.int64),
+        np.array(df["date"].tolist(), dtype="datetime64[D]").astype(np.int64),
+        (df["side"].to_numpy() == TradeSide.SHORT.value).astype(np.int64),
+        _seconds_of_day(df["entry_time"]),
+        _seconds_of_day(df["exit_time"]),
+        np.round(df["entry_price"].to_numpy(dtype=float) * 1e6).astype(np.int64),
+        np.round(df["exit_price"].to_numpy(dtype=float) * 1e6).astype(np.int64),
+        df["shares"].to_numpy(dtype=np.int64),
+    ]).astype("<i8")
+
+    # Fixed-width little-endian record per row, followed by the ticker
+    records = np.ascontiguousarray(fields).view(f"V{fields.shape[1] * 8}").ravel().tolist()
+    tickers = df["ticker"].astype(str).tolist()
+    seen = Counter() if seen is None else seen
+    fingerprints = []
+    for record, ticker in zip(records, tickers):
+        fingerprint = hashlib.sha1(record + b"|" + ticker.encode()).hexdigest()
+        occurrence = seen[fingerprint]
+        seen[fingerprint] += 1
+        # The first occurrence keeps the plain hash, matching trades imported before occurrences were counted
+        if occurrence:
+            fingerprint = hashlib.sha1(f"{fingerprint}#{occurrence}".encode()).hexdigest()
+        fingerprints.append(fingerprint)
+    return fingerprints
+
+
+def frame_to_rows(df: pd.DataFrame, user_id: int, seen: Counter | None = None) -> list[dict]:
+    """
+    Convert a normalized frame to plain-Python row dicts (no NumPy scalars, NaN -> None).
+    `seen` is passed on to trade_fingerprints when a file is converted in chunks.
+    """
+    columns = {}
+    for column in INSERT_COLUMNS[1:]:
+        series = df[column]
+        columns[column] = series.astype(object).where(series.notna(), None).tolist()
+
+    columns["duration_seconds"] = [None if v is None else int(v) for v in columns["duration_seconds"]]
+    columns["side"] = [TradeSide(v) for v in columns["side"]]
+
+    columns["fingerprint"] = trade_fingerprints(df, user_id, seen)
+
+    return [
+        {"user_id": user_id, **dict(zip(columns.keys(), values))}
+        for values in zip(*columns.values())
+    ]
+
+
+async def bulk_insert_trades(db: AsyncSession, rows: list[dict], update_existing: bool = False) -> int:
+    """
+    Insert trade rows in one bulk operation inside the session's transaction and
+    return how many were new. Rows whose fingerprint the user already has are
+    skipped, or with `update_existing` have their P&L, commissions and duration
+    refreshed. Uses asyncpg COPY into a temp table when available, otherwise a
+    multi-row INSERT.
+    """
+    if not rows:
+        return 0
+
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    driver = raw.driver_connection
+
+    if hasattr(driver, "copy_records_to_table"):
+        column_list = ", ".join(UPSERT_COLUMNS)
+        await db.execute(text(
+            f"CREATE TEMP TABLE IF NOT EXISTS {_STAGING_TABLE} ON COMMIT DROP AS "
+            f"SELECT {column_list} FROM {Trade.__tablename__} WITH NO DATA"
+        ))
+        await db.execute(text(f"TRUNCATE {_STAGING_TABLE}"))
+
+        # Enum columns store the member name (LONG/SHORT)
+        records = [
+            tuple(row[c].name if c == "side" else row[c] for c in UPSERT_COLUMNS)
+            for row in rows
+        ]
+        await driver.copy_records_to_table(_STAGING_TABLE, records=records, columns=UPSERT_COLUMNS)
+
+        if update_existing:
+            conflict = "DO UPDATE SET " + ", ".join(f"{c} = EXCLUDED.{c}" for c in UPDATABLE_COLUMNS)
+        else:
+            conflict = "DO NOTHING"
+        result = await db.execute(text(
+            f"INSERT INTO {Trade.__tablename__} ({column_list}) "
+            f"SELECT {column_list} FROM {_STAGING_TABLE} "
+            f"ON CONFLICT (user_id, fingerprint) {conflict} "
+            f"RETURNING (xmax = 0) AS inserted"
+        ))
+    else:
+        stmt = pg_insert(Trade).values(rows)
+        if update_existing:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["user_id", "fingerprint"],
+                set_={c: stmt.excluded[c] for c in UPDATABLE_COLUMNS},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=["user_id", "fingerprint"])
+        result = await db.execute(stmt.returning(text("(xmax = 0) AS inserted")))
+
+    return sum(1 for inserted, in result if inserted)
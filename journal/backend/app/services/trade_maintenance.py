@@ -0,0 +1,52 @@
+"""
+Trade maintenance.
+
+Each operation is a single set-based UPDATE scoped to one user and returns the
+number of rows it changed. Rows that are already correct are excluded in the
+WHERE clause so they aren't rewritten.
+"""
+from sqlalchemy import Integer, cast, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.trade import Trade
+
+
+async def recalculate_durations(db: AsyncSession, user_id: int) -> int:
+    """Fill duration_seconds from entry/exit time where it is missing (same-day trades only)."""
+    result = await db.execute(
+        update(Trade)
+        .where(
+            Trade.user_id == user_id,
+            Trade.duration_seconds.is_(None),
+            Trade.entry_time.is_not(None),
+            Trade.exit_time.is_not(None),
+            Trade.exit_time >= Trade.entry_time,
+        )
+        .values(duration_seconds=cast(func.extract("epoch", Trade.exit_time - Trade.entry_time), Integer))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def recalculate_net_pnl(db: AsyncSession, user_id: int) -> int:
+    """Set net_pnl = pnl - commissions wherever it differs."""
+    net_pnl = Trade.pnl - func.coalesce(Trade.commissions, 0)
+    result = await db.execute(
+        update(Trade)
+        .where(Trade.user_id == user_id, Trade.net_pnl.is_distinct_from(net_pnl))
+        .values(net_pnl=net_pnl)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def normalize_tickers(db: AsyncSession, user_id: int) -> int:
+    """Trim and uppercase tickers."""
+    normalized = func.upper(func.trim(Trade.ticker))
+    result = await db.execute(
+        update(Trade)
+        .where(Trade.user_id == user_id, Trade.ticker != normalized)
+        .values(ticker=normalized)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
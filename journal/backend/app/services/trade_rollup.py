@@ -0,0 +1,85 @@
+"""
+Daily P&L rollup.
+
+trade_daily_rollup holds one row per (user, date, ticker, side, entry hour).
+Writers call refresh_rollup with the dates they touched, inside their own
+transaction; those days are re-aggregated from trades, which keeps min/max
+exact after deletes and costs only the trades of the affected days. Read
+endpoints aggregate the rollup instead of raw trades.
+"""
+from datetime import date
+from typing import Iterable
+
+from sqlalchemy import Integer, cast, delete, distinct, exists, extract, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.core.cache import bump_data_version
+from app.models.trade import Trade
+from app.models.trade_rollup import TradeDailyRollup
+
+NO_ENTRY_HOUR = -1
+
+ROLLUP_COLUMNS = [
+    "user_id", "date", "ticker", "side", "entry_hour",
+    "trade_count", "win_count", "loss_count", "pnl", "gross_profit", "gross_loss",
+    "net_pnl", "max_pnl", "min_pnl", "duration_seconds", "shares",
+]
+
+
+def _aggregate_trades(filters: list):
+    entry_hour = func.coalesce(cast(extract("hour", Trade.entry_time), Integer), NO_ENTRY_HOUR)
+    return (
+        select(
+            Trade.user_id,
+            Trade.date,
+            Trade.ticker,
+            Trade.side,
+            entry_hour,
+            func.count(),
+            func.count().filter(Trade.pnl > 0),
+            func.count().filter(Trade.pnl < 0),
+            func.sum(Trade.pnl),
+            func.coalesce(func.sum(Trade.pnl).filter(Trade.pnl > 0), 0),
+            func.coalesce(func.sum(Trade.pnl).filter(Trade.pnl < 0), 0),
+            func.sum(func.coalesce(Trade.net_pnl, Trade.pnl - func.coalesce(Trade.commissions, 0))),
+            func.max(Trade.pnl),
+            func.min(Trade.pnl),
+            func.coalesce(func.sum(Trade.duration_seconds), 0),
+            func.coalesce(func.sum(Trade.shares), 0),
+        )
+        .where(*filters)
+        .group_by(Trade.user_id, Trade.date, Trade.ticker, Trade.side, entry_hour)
+    )
+
+
+async def refresh_rollup(db: AsyncSession, user_id: int, dates: Iterable[date] | None = None):
+    """
+    Re-aggregate the user's rollup rows for `dates` (all dates when None). Every trade
+    write calls this, so it also invalidates the user's cached results.
+    """
+    await bump_data_version(db, user_id)
+    trade_filters = [Trade.user_id == user_id]
+    rollup_filters = [TradeDailyRollup.user_id == user_id]
+    if dates is not None:
+        dates = sorted(set(dates))
+        if not dates:
+            return
+        trade_filters.append(Trade.date.in_(dates))
+        rollup_filters.append(TradeDailyRollup.date.in_(dates))
+
+    await db.execute(delete(TradeDailyRollup).where(*rollup_filters))
+    await db.execute(
+        insert(TradeDailyRollup).from_select(ROLLUP_COLUMNS, _aggregate_trades(trade_filters))
+    )
+
+
+async def trade_dates(db: AsyncSession, filters: list) -> list[date]:
+    """Distinct dates of the trades matching `filters` (call before a bulk update/delete)."""
+    result = await db.execute(select(distinct(Trade.date)).where(*filters))
+    return list(result.scalars().all())
+
+
+async def backfill_rollups(conn: AsyncConnection):
+    """Build the rollup for users who have trades but no rollup rows yet (run at startup)."""
+    missing = ~exists().where(TradeDailyRollup.user_id == Trade.user_id)
+    await conn.execute(insert(TradeDailyRollup).from_select(ROLLUP_COLUMNS, _aggregate_trades([missing])))
@@ -400,6 +400,8 @@ function StatsHelpModal({ onClose }: { onClose: () => void }) {
     { title: "System Quality Number (SQN)", description: "The SQN is a calculation developed by Van K Tharp. It can be interpreted as an overall \"grade\" for your trading system, and should generally not be deemed reliable with less than 30 trades." },
     { title: "Kelly Percentage", description: "The Kelly Criterion is a formula used to determine the optimal size of a series of bets. It represents the percentage of your capital you should risk on each trade." },
     { title: "K-Ratio", description: "A measure of the consistency of returns. Higher values indicate more consistent performance." },
+    { title: "Probability of Random Chance", description: "The chance that a trader with no edge would have produced a total P&L at least this far from zero, estimated by randomly flipping the sign of each trade's P&L. Lower values mean the results are less likely to be luck." },
+    { title: "Expectancy / Win Rate (95% CI)", description: "The range the average trade P&L and the win rate fall in for 95% of bootstrap resamples of your trades. Wide ranges mean there are too few trades to be confident." },
     { title: "Profit Factor", description: "The ratio of gross profits to gross losses. A profit factor greater than 1 indicates a profitable system." },
     { title: "Trade P&L Standard Deviation", description: "A measure of the variability of trade P&L. Lower values indicate more consistent trade results." },
     { title: "Average Hold Time", description: "The average duration of trades, calculated separately for winning, losing, and scratch trades." },
@@ -486,6 +488,17 @@ function StatsTable({ stats }: { stats: DetailedStats | null }) {
       "K-Ratio", formatValue(stats.k_ratio, (v) => v.toFixed(2)),
       "Profit factor", formatValue(stats.profit_factor, (v) => v.toFixed(2))
     ],
+    [
+      "Expectancy (95% CI)",
+      stats.expectancy_ci_low !== null && stats.expectancy_ci_high !== null
+        ? `${formatCurrency(stats.expectancy_ci_low)} to ${formatCurrency(stats.expectancy_ci_high)}`
+        : "n/a",
+      "Win Rate (95% CI)",
+      stats.win_rate_ci_low !== null && stats.win_rate_ci_high !== null
+        ? `${stats.win_rate_ci_low.toFixed(1)}% to ${stats.win_rate_ci_high.toFixed(1)}%`
+        : "n/a",
+      "", ""
+    ],
     [
       "Total Commissions", formatValue(stats.total_commissions, formatCurrency),
       "Total Fees", formatValue(stats.total_fees, formatCurrency),
@@ -505,6 +518,7 @@ function StatsTable({ stats }: { stats: DetailedStats | null }) {
     ["Number of Scratch Trades", "0", "Max Consecutive Wins", "n/a", "Max Consecutive Losses", "n/a"],
     ["Trade P&L Standard Deviation", "n/a", "System Quality Number (SQN)", "n/a", "Probability of Random Chance", "n/a"],
     ["Kelly Percentage", "n/a", "K-Ratio", "n/a", "Profit factor", "n/a"],
+    ["Expectancy (95% CI)", "n/a", "Win Rate (95% CI)", "n/a", "", ""],
     ["Total Commissions", "$0.00", "Total Fees", "$0.00", "", ""],
     ["Average position MAE", "n/a", "Average Position MFE", "n/a", "", ""],
   ];
@@ -600,14 +614,10 @@ export default function ReportsPage() {
         end_date: endDate.toISOString().split("T")[0],
       };
 
-      const [statsData, daysTimesData, priceVolumeData] = await Promise.all([
-        reportsApi.getDetailedStats(token, params),
-        reportsApi.getDaysTimes(token, { ...params, timeframe }),
-        reportsApi.getPriceVolume(token, params),
-      ]);
-      setStats(statsData);
-      setDaysTimes(daysTimesData);
-      setPriceVolume(priceVolumeData);
+      const reports = await reportsApi.getDetailedAll(token, { ...params, timeframe });
+      setStats(reports.stats);
+      setDaysTimes(reports.days_times);
+      setPriceVolume(reports.price_volume);
     } catch (error) {
       console.error("Failed to load reports data:", error);
     } finally {
@@ -98,6 +98,36 @@ export const tradesApi = {
     return fetchApi<Trade[]>(`/trades${query ? `?${query}` : ""}`, { token });
   },
 
+  // Cursor-paged listing; pass nextCursor back as `after` for the following page
+  getPage: async (
+    token: string,
+    params?: { ticker?: string; start_date?: string; end_date?: string; limit?: number; after?: string }
+  ) => {
+    const searchParams = new URLSearchParams();
+    if (params?.ticker) searchParams.append("ticker", params.ticker);
+    if (params?.start_date) searchParams.append("start_date", params.start_date);
+    if (params?.end_date) searchParams.append("end_date", params.end_date);
+    if (params?.limit) searchParams.append("limit", String(params.limit));
+    if (params?.after) searchParams.append("after", params.after);
+
+    const query = searchParams.toString();
+    const response = await fetch(`${API_URL}/trades${query ? `?${query}` : ""}`, {
+      headers: { Authorization: `Bearer ${token}` },
+    });
+
+    if (!response.ok) {
+      const data = await response.json().catch(() => null);
+      throw new ApiError(response.status, response.statusText, data);
+    }
+
+    const total = response.headers.get("X-Total-Count");
+    return {
+      trades: (await response.json()) as Trade[],
+      nextCursor: response.headers.get("X-Next-Cursor"),
+      total: total === null ? null : Number(total),
+    };
+  },
+
   create: (token: string, data: TradeCreate) =>
     fetchApi<Trade>("/trades", {
       method: "POST",
@@ -115,11 +145,13 @@ export const tradesApi = {
   delete: (token: string, id: number) =>
     fetchApi<void>(`/trades/${id}`, { method: "DELETE", token }),
 
-  import: async (token: string, file: File) => {
+  import: async (token: string, file: File, tradeDate?: string) => {
     const formData = new FormData();
     formData.append("file", file);
+    // DAS Trader exports have no date column
+    const query = tradeDate ? `?trade_date=${tradeDate}` : "";
 
-    const response = await fetch(`${API_URL}/trades/import`, {
+    const response = await fetch(`${API_URL}/trades/import${query}`, {
       method: "POST",
       headers: { Authorization: `Bearer ${token}` },
       body: formData,
@@ -133,15 +165,105 @@ export const tradesApi = {
     return response.json() as Promise<{
       message: string;
       trades_created: number;
+      duplicates: number;
       errors: string[];
     }>;
   },
 
+  startImportJob: async (token: string, file: File, tradeDate?: string) => {
+    const formData = new FormData();
+    formData.append("file", file);
+    // DAS Trader exports have no date column
+    const query = tradeDate ? `?trade_date=${tradeDate}` : "";
+
+    const response = await fetch(`${API_URL}/trades/import/jobs${query}`, {
+      method: "POST",
+      headers: { Authorization: `Bearer ${token}` },
+      body: formData,
+    });
+
+    if (!response.ok) {
+      const data = await response.json().catch(() => null);
+      throw new ApiError(response.status, response.statusText, data);
+    }
+
+    return response.json() as Promise<ImportJob>;
+  },
+
+  getImportJob: (token: string, id: number) =>
+    fetchApi<ImportJob>(`/trades/import/${id}`, { token }),
+
+  export: async (
+    token: string,
+    format: "csv" | "ndjson" | "parquet",
+    params?: { ticker?: string; start_date?: string; end_date?: string }
+  ) => {
+    const searchParams = new URLSearchParams({ format });
+    if (params?.ticker) searchParams.append("ticker", params.ticker);
+    if (params?.start_date) searchParams.append("start_date", params.start_date);
+    if (params?.end_date) searchParams.append("end_date", params.end_date);
+
+    const response = await fetch(`${API_URL}/trades/export?${searchParams.toString()}`, {
+      headers: { Authorization: `Bearer ${token}` },
+    });
+
+    if (!response.ok) {
+      const data = await response.json().catch(() => null);
+      throw new ApiError(response.status, response.statusText, data);
+    }
+
+    return response.blob();
+  },
+
+  bulkUpdate: (token: string, selection: TradeSelection, changes: TradeBulkChanges) =>
+    fetchApi<{ message: string; trades_updated: number }>("/trades/bulk/update", {
+      method: "POST",
+      body: JSON.stringify({ selection, changes }),
+      token,
+    }),
+
+  bulkTags: (token: string, selection: TradeSelection, addTagIds: number[] = [], removeTagIds: number[] = []) =>
+    fetchApi<{ message: string; tags_added: number; tags_removed: number }>("/trades/bulk/tags", {
+      method: "POST",
+      body: JSON.stringify({ selection, add_tag_ids: addTagIds, remove_tag_ids: removeTagIds }),
+      token,
+    }),
+
+  bulkDelete: (token: string, selection: TradeSelection) =>
+    fetchApi<{ message: string; trades_deleted: number }>("/trades/bulk/delete", {
+      method: "POST",
+      body: JSON.stringify({ selection }),
+      token,
+    }),
+
   recalculateDurations: (token: string) =>
     fetchApi<{ message: string; trades_updated: number }>("/trades/recalculate-durations", {
       method: "POST",
       token,
     }),
+
+  enrichExcursions: (token: string, maxDays?: number) =>
+    fetchApi<{
+      message: string;
+      trades_enriched: number;
+      trades_without_bars: number;
+      days_loaded: number;
+      days_remaining: number;
+    }>(`/trades/enrich-excursions${maxDays ? `?max_days=${maxDays}` : ""}`, {
+      method: "POST",
+      token,
+    }),
+
+  runMaintenance: (token: string) =>
+    fetchApi<{
+      message: string;
+      durations_updated: number;
+      net_pnl_updated: number;
+      tickers_normalized: number;
+    }>("/trades/maintenance", {
+      method: "POST",
+      token,
+    }),
 };
 
 // Dashboard API
@@ -237,6 +359,22 @@ export const riskApi = {
 
 // Reports API
 export const reportsApi = {
+  // Stats, days/times and price/volume in one request
+  getDetailedAll: (
+    token: string,
+    params?: { ticker?: string; side?: "long" | "short"; start_date?: string; end_date?: string; timeframe?: number }
+  ) => {
+    const searchParams = new URLSearchParams();
+    if (params?.ticker) searchParams.append("ticker", params.ticker);
+    if (params?.side) searchParams.append("side", params.side);
+    if (params?.start_date) searchParams.append("start_date", params.start_date);
+    if (params?.end_date) searchParams.append("end_date", params.end_date);
+    if (params?.timeframe) searchParams.append("timeframe", String(params.timeframe));
+
+    const query = searchParams.toString();
+    return fetchApi<DetailedReports>(`/reports/detailed/all${query ? `?${query}` : ""}`, { token });
+  },
+
   getDetailedStats: (
     token: string,
     params?: { ticker?: string; side?: "long" | "short"; start_date?: string; end_date?: string }
@@ -279,6 +417,58 @@ export const reportsApi = {
     const query = searchParams.toString();
     return fetchApi<PriceVolumeData>(`/reports/detailed/price-volume${query ? `?${query}` : ""}`, { token });
   },
+
+  // Custom buckets: edges like [0, 1, 2, 5] for price/volume/duration, or slot_minutes for time of day
+  getBuckets: (
+    token: string,
+    params: {
+      dimension: "price" | "volume" | "duration" | "time";
+      edges?: number[];
+      slot_minutes?: number;
+      start_time?: string;
+      end_time?: string;
+      ticker?: string;
+      side?: "long" | "short";
+      start_date?: string;
+      end_date?: string;
+    }
+  ) => {
+    const searchParams = new URLSearchParams({ dimension: params.dimension });
+    if (params.edges?.length) searchParams.append("edges", params.edges.join(","));
+    if (params.slot_minutes) searchParams.append("slot_minutes", String(params.slot_minutes));
+    if (params.start_time) searchParams.append("start_time", params.start_time);
+    if (params.end_time) searchParams.append("end_time", params.end_time);
+    if (params.ticker) searchParams.append("ticker", params.ticker);
+    if (params.side) searchParams.append("side", params.side);
+    if (params.start_date) searchParams.append("start_date", params.start_date);
+    if (params.end_date) searchParams.append("end_date", params.end_date);
+
+    return fetchApi<BucketsData>(`/reports/buckets?${searchParams.toString()}`, { token });
+  },
+
+  // Cumulative P&L and drawdown; points downsamples the series (LTTB)
+  getEquityCurve: (
+    token: string,
+    params?: {
+      granularity?: "trade" | "day";
+      points?: number;
+      ticker?: string;
+      side?: "long" | "short";
+      start_date?: string;
+      end_date?: string;
+    }
+  ) => {
+    const searchParams = new URLSearchParams();
+    if (params?.granularity) searchParams.append("granularity", params.granularity);
+    if (params?.points) searchParams.append("points", String(params.points));
+    if (params?.ticker) searchParams.append("ticker", params.ticker);
+    if (params?.side) searchParams.append("side", params.side);
+    if (params?.start_date) searchParams.append("start_date", params.start_date);
+    if (params?.end_date) searchParams.append("end_date", params.end_date);
+
+    const query = searchParams.toString();
+    return fetchApi<EquityCurve>(`/reports/equity-curve${query ? `?${query}` : ""}`, { token });
+  },
 };
 
 // Types
@@ -302,6 +492,12 @@ export interface Trade {
   setup: string | null;
   created_at: string;
   is_winner: boolean;
+  high_of_day: number | null;
+  low_of_day: number | null;
+  trade_high: number | null;
+  trade_low: number | null;
+  mae: number | null;
+  mfe: number | null;
 }
 
 export interface TradeCreate {
@@ -319,6 +515,40 @@ export interface TradeCreate {
   setup?: string;
 }
 
+export interface TradeSelection {
+  ids?: number[];
+  ticker?: string;
+  side?: "long" | "short";
+  start_date?: string;
+  end_date?: string;
+}
+
+export interface TradeBulkChanges {
+  ticker?: string;
+  side?: "long" | "short";
+  commissions?: number;
+  notes?: string | null;
+  setup?: string | null;
+}
+
+export interface ImportJob {
+  id: number;
+  filename: string;
+  status: "pending" | "running" | "completed" | "failed";
+  chunk_size: number;
+  trade_date: string | null;
+  rows_processed: number;
+  trades_created: number;
+  duplicates: number;
+  chunks_committed: number;
+  error_count: number;
+  errors: string[];
+  rows_per_second: number | null;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
 export interface DashboardMetrics {
   total_pnl: number;
   total_trades: number;
@@ -517,6 +747,52 @@ export interface PriceVolumeData {
   by_volume: VolumeRangeStats[];
 }
 
+export interface BucketStats {
+  range_label: string;
+  lower: number | null;
+  upper: number | null;
+  total_pnl: number;
+  trades: number;
+  winners: number;
+  losers: number;
+  win_rate: number;
+}
+
+export interface BucketsData {
+  dimension: string;
+  buckets: BucketStats[];
+}
+
+export interface EquityPoint {
+  date: string;
+  entry_time: string | null;
+  trade_id: number | null;
+  pnl: number;
+  equity: number;
+  drawdown: number;
+}
+
+export interface EquityCurve {
+  granularity: "trade" | "day";
+  total_points: number;
+  points: EquityPoint[];
+  final_equity: number;
+  peak_equity: number;
+  max_drawdown: number;
+  max_drawdown_pct: number | null;
+  max_drawdown_peak_date: string | null;
+  max_drawdown_trough_date: string | null;
+  max_drawdown_recovery_date: string | null;
+  longest_drawdown_days: number;
+  current_drawdown: number;
+}
+
+export interface DetailedReports {
+  stats: DetailedStats;
+  days_times: DaysTimesData;
+  price_volume: PriceVolumeData;
+}
+
 export interface DetailedStats {
   total_gain_loss: number;
   largest_gain: number | null;
@@ -542,6 +818,11 @@ export interface DetailedStats {
   kelly_percentage: number | null;
   k_ratio: number | null;
   profit_factor: number | null;
+  expectancy_ci_low: number | null;
+  expectancy_ci_high: number | null;
+  win_rate_ci_low: number | null;
+  win_rate_ci_high: number | null;
+  monte_carlo_samples: number;
   total_commissions: number | null;
   total_fees: number | null;
   average_position_mae: number | null;